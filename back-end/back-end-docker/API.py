@@ -1,129 +1,540 @@
-from flask import Flask, request, json, render_template
+from flask import Flask, Response, request, render_template
 from flask_cors import CORS, cross_origin
-import os
-import glob
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import io
+import json
 import logging
-import csv
-from src.main.python.simulation.Main import Main
+import os
+import queue
+import threading
+import time
+import uuid
+import zlib
+from src.main.python.simulation.ElevatorLog import ElevatorLog
+import src.main.python.simulation.Logger as Logger
+from src.main.python.simulation.Main import MP_CONTEXT, Main
+from src.main.python.simulation.OutputWriter import pack_tables, unpack_tables
+from src.main.python.simulation.ResultCache import ResultCache, cache_key
+from src.main.python.simulation.SimulationRunner import SimulationResult
+
+try:
+  import brotli
+except ImportError:  # brotli is optional, responses are then compressed with gzip at best
+  brotli = None
 
 app = Flask(__name__)
 CORS(app)
 
-# Define Folder Path
-INPUT_FOLDER = '/app/src/main/in'
-OUTPUT_FOLDER = '/app/src/main/out'
-app.config['INPUT_FOLDER'] = INPUT_FOLDER
-app.config['OUTPUT_FOLDER'] = OUTPUT_FOLDER
-Test = Main(num_up=2, num_down=1, num_floors=9)
-
-@app.route("/random", methods=['GET'])
-@cross_origin()
-def random_simulation():
-
-  logging.warning('Started')
+DURATION = 64800  # from 6 am to 12 am
+MAX_RUNNING_JOBS = 2  # simulations running at the same time, each one uses a process per algorithm
+MAX_QUEUED_JOBS = 8  # jobs waiting for a free slot, further submissions are rejected
+MAX_FINISHED_JOBS = 32  # finished jobs kept for their results, the oldest ones are forgotten first
+MANUAL_SEED = 0  # dwell and travel times of 'manual' jobs without a seed, so that the same riders give the same result
+# private to the user running the API, see ResultCache
+SIMULATION_LOG_LEVEL = os.environ.get('SIMULATION_LOG_LEVEL', 'silent')  # see Logger.configure()
+CACHE_FOLDER = os.environ.get('RESULT_CACHE_FOLDER', os.path.join(
+  os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'lift-sim', 'results'))
+CACHE_MEMORY_SIZE = 256 * 2 ** 20  # bytes of serialised results kept in memory
+CACHE_DISK_SIZE = 2 * 2 ** 30  # bytes of serialised results kept in CACHE_FOLDER
+STREAM_CHUNK_INTERVAL = 300  # simulated seconds per streamed chunk
+STREAM_BUFFERED_CHUNKS = 16  # chunks produced ahead of the client, the simulation waits while the buffer is full
+STREAM_POLL_INTERVAL = 1  # seconds between checks of a stream for cancellation or the exit of its worker process
+# see build_tables(), decoded by OutputWriter.unpack_tables() and by decodeTables() of the front-end's tables.js
+TABLES_MIMETYPE = 'application/vnd.liftsim.tables'
+
+# media types of a result, in order of preference when the client accepts several -> name in cache keys
+REPRESENTATIONS = {'application/json': 'json', TABLES_MIMETYPE: 'tables'}
+# content encodings, in order of preference when the client accepts several -> compression function
+ENCODINGS = {'gzip': lambda data: gzip.compress(data, compresslevel=6), 'identity': lambda data: data}
+if brotli is not None:
+  ENCODINGS = dict({'br': lambda data: brotli.compress(data, quality=5)}, **ENCODINGS)
+
+executor = ThreadPoolExecutor(max_workers=MAX_RUNNING_JOBS)
+jobs = {}  # job id -> job, in order of submission
+streams = {}  # stream id -> stream, until its simulation is over
+jobs_lock = threading.Lock()
+cache = ResultCache(CACHE_MEMORY_SIZE, CACHE_FOLDER, CACHE_DISK_SIZE)
+# once for the process, the simulations of all jobs share the liftsim logger
+Logger.configure(SIMULATION_LOG_LEVEL)
+
+
+class Job(object):
+  """
+  A simulation submitted through the API. Every job owns its Main instance and keeps its results in memory, so
+  concurrent jobs never share state. Seeded jobs are deterministic, so their results are cached under the hash of
+  everything they depend on.
+
+  Attributes:
+    id (str): Identifier of the job.
+    mode (str): 'default' or 'manual'.
+    riders (list): Riders of the 'manual' mode, in the format of input.json.
+    seed (int): Seed of the simulation, fresh entropy if None.
+    key (str): Cache key of the result, None if the job is not seeded.
+    cached (bool): True if the result was found in the cache.
+    status (str): 'queued', 'running', 'done' or 'failed'.
+    progress (dict): Simulation time reached by every algorithm.
+    results (dict): SimulationResult of every algorithm once done, the compact source of every representation.
+    representations (dict): (media type, content encoding) -> output of the simulation, built from results when first
+      requested. An uncompressed one is dropped once the gzip one of the same media type is built.
+    error (str): Reason of the failure if failed.
+  """
+  def __init__(self, mode, riders=None, seed=None):
+    self.id = uuid.uuid4().hex
+    self.mode = mode
+    self.riders = riders
+    self.seed = MANUAL_SEED if seed is None and mode == 'manual' else seed
+    self.main = Main(num_up=2, num_down=1, num_floors=9)
+    self.key = None
+    if self.seed is not None:
+      self.key = cache_key(mode=mode, riders=riders, seed=self.seed, num_up=self.main.num_up,
+                           num_down=self.main.num_down, num_floors=self.main.num_floors,
+                           lift_algos=self.main.lift_algos, weights=self.main.weights, duration=DURATION)
+    self.cached = False
+    self.status = 'queued'
+    self.progress = {}
+    self.results = None
+    self.representations = {}
+    self.representations_lock = threading.Lock()
+    self.error = None
+    self.submitted = time.time()
+    self.future = None
+
+  def run(self):
+    """Runs the simulation of the job, called by the executor."""
+    self.status = 'running'
+    try:
+      path_to_data = io.StringIO(json.dumps(self.riders)) if self.mode == 'manual' else None
+      self.results = self.main.run(DURATION, mode=self.mode, seed=self.seed, path_to_data=path_to_data,
+                                   progress=self.set_progress)
+      if self.key is not None:
+        # the packed tables are small and hold everything the other representations are built from
+        tables = build_tables(self.results)
+        self.representations[TABLES_MIMETYPE, 'identity'] = tables
+        cache.put(self.cache_name(TABLES_MIMETYPE, 'identity'), tables)
+      self.status = 'done'
+    except Exception as e:
+      logging.exception('Job %s failed', self.id)
+      self.error = str(e)
+      self.status = 'failed'
+    finally:
+      self.main = None
+
+  def cache_name(self, mimetype, encoding) -> str:
+    """Returns the cache key of one representation of the result."""
+    return f'{self.key}-{REPRESENTATIONS[mimetype]}-{encoding}'
+
+  def load_cached(self) -> bool:
+    """Loads the results from their cached packed tables, returns False if they are not cached or unreadable."""
+    tables = cache.get(self.cache_name(TABLES_MIMETYPE, 'identity'))
+    if tables is None:
+      return False
+    try:
+      self.results = results_from_tables(tables)
+    except (ValueError, KeyError, TypeError) as e:
+      logging.warning('Ignoring the unreadable cached result %s: %s', self.key, e)
+      return False
+    self.representations[TABLES_MIMETYPE, 'identity'] = tables
+    return True
+
+  def get_representation(self, mimetype, encoding) -> bytes:
+    """
+    Returns the result of the finished job in a media type and content encoding, each one built once. Compressed
+    ones are cached, uncompressed ones are not since they are the largest and quickly built again, except for the
+    packed tables cached by run(). Once the gzip one exists the uncompressed one is only kept while it is sent,
+    being decompressed from it.
+    """
+    with self.representations_lock:
+      if (mimetype, encoding) in self.representations:
+        return self.representations[mimetype, encoding]
+      if encoding == 'identity' and (mimetype, 'gzip') in self.representations:
+        return gzip.decompress(self.representations[mimetype, 'gzip'])
+      data = cache.get(self.cache_name(mimetype, encoding)) if self.key is not None else None
+      if data is None:
+        data = self.representations.get((mimetype, 'identity'))
+        if data is None:
+          data = build_representation(mimetype, self.results)
+        data = ENCODINGS[encoding](data)
+        if self.key is not None and encoding != 'identity':
+          cache.put(self.cache_name(mimetype, encoding), data)
+      self.representations[mimetype, encoding] = data
+      if encoding == 'gzip':
+        self.representations.pop((mimetype, 'identity'), None)
+      return data
+
+  def set_progress(self, lift_algo, now):
+    self.progress[lift_algo] = now
+
+  def to_dict(self) -> dict:
+    return {
+      'id': self.id,
+      'mode': self.mode,
+      'seed': self.seed,
+      'cached': self.cached,
+      'status': self.status,
+      'duration': DURATION,
+      'progress': dict(self.progress),
+      'error': self.error,
+    }
 
-  input_files = glob.glob(os.path.join(app.config['INPUT_FOLDER'], '*'))
-  for f in input_files:
-      os.remove(f)
 
-  logging.warning('Removed input files')
+def build_representation(mimetype, results) -> bytes:
+  """Returns the output of Main.run() in a media type of REPRESENTATIONS, uncompressed."""
+  if mimetype == TABLES_MIMETYPE:
+    return build_tables(results)
+  return json.dumps(build_result(results), separators=(',', ':')).encode()
 
-  output_files = glob.glob(os.path.join(app.config['OUTPUT_FOLDER'], '*'))
-  for f in output_files:
-      os.remove(f)
 
-  logging.warning('Removed output files')
+def build_result(results) -> dict:
+  """Returns the expanded elevator log and the completed trips of every algorithm, from the output of Main.run()."""
+  return {
+    lift_algo: {'Elevators': result.elevator_log.expand(), 'Persons': result.trip_rows()}
+    for lift_algo, result in results.items()
+  }
 
-  # execute the simulation process
-  Test.run(64800, mode='default')
 
-  # prepare the output
+def build_tables(results) -> bytes:
+  """
+  Returns the change-only elevator log and the completed trips of every algorithm, from the output of Main.run(),
+  as typed columns packed with OutputWriter.pack_tables(). The tables are named <algo>/elevators (see
+  ElevatorLog.COLUMNS) and <algo>/persons (see PersonStore.TRIP_COLUMNS), and meta holds the lift_algos, num_floors,
+  num_elevators and the num_spawned of every algorithm. Much smaller than the JSON of build_result(), which repeats
+  every elevator every second.
+  """
+  tables = {}
+  for lift_algo, result in results.items():
+    tables[lift_algo + '/elevators'] = result.elevator_log.to_arrays()
+    tables[lift_algo + '/persons'] = result.trips
+  elevator_log = next(iter(results.values())).elevator_log
+  meta = {'lift_algos': list(results), 'num_floors': elevator_log.num_floors,
+          'num_elevators': elevator_log.num_elevators,
+          'num_spawned': {lift_algo: result.num_spawned for lift_algo, result in results.items()}}
+  return pack_tables(tables, meta)
+
+
+def results_from_tables(data) -> dict:
+  """
+  Rebuilds the output of Main.run() from the output of build_tables(), used to load cached results. Unlike pickles,
+  the packed tables cannot run code when loaded, so a tampered cache file can at worst give a wrong result.
+  """
+  tables, meta = unpack_tables(data)
+  results = {}
+  for lift_algo in meta['lift_algos']:
+    log = {name: values.tolist() for name, values in tables[lift_algo + '/elevators'].items()}
+    elevator_log = ElevatorLog.from_dict(dict(log, num_floors=meta['num_floors'],
+                                              num_elevators=meta['num_elevators']))
+    results[lift_algo] = SimulationResult(lift_algo, tables[lift_algo + '/persons'], elevator_log,
+                                          meta['num_spawned'][lift_algo])
+  return results
+
+
+def negotiate():
+  """Returns the media type of REPRESENTATIONS and the content encoding of ENCODINGS preferred by the request."""
+  mimetype = request.accept_mimetypes.best_match(list(REPRESENTATIONS), default='application/json')
+  encoding = request.accept_encodings.best_match(list(ENCODINGS), default='identity')
+  return mimetype, encoding
+
+
+def result_response(job):
+  """Returns the output of a finished job in the media type and content encoding negotiated with the client."""
+  mimetype, encoding = negotiate()
+  response = Response(job.get_representation(mimetype, encoding), mimetype=mimetype)
+  if encoding != 'identity':
+    response.headers['Content-Encoding'] = encoding
+  response.vary.update(['Accept', 'Accept-Encoding'])
+  return response
+
+
+def count_queued() -> int:
+  """Returns the number of jobs and streams waiting for a free slot of the executor, call it holding jobs_lock."""
+  return sum(other.status == 'queued' for other in list(jobs.values()) + list(streams.values()))
+
+
+def submit_job(mode, riders=None, seed=None):
+  """
+  Returns a job for the simulation: a finished one if its result is cached, the unfinished job of an identical
+  request if there is one, otherwise a new queued job. Returns None if too many jobs are already waiting.
+  """
+  job = Job(mode, riders, seed)
+  if job.key is not None and job.load_cached():
+    job.cached = True
+    job.status = 'done'
+    job.progress = {lift_algo: DURATION for lift_algo in job.main.lift_algos}
+    job.main = None
+  with jobs_lock:
+    if not job.cached:
+      for other in jobs.values():
+        if job.key is not None and other.key == job.key and other.status in ('queued', 'running'):
+          return other
+      if count_queued() >= MAX_QUEUED_JOBS:
+        return None
+    finished = [job_id for job_id, other in jobs.items() if other.status in ('done', 'failed')]
+    for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS + 1)]:
+      del jobs[job_id]
+    jobs[job.id] = job
+    if not job.cached:
+      job.future = executor.submit(job.run)
+  return job
+
+
+def get_job(job_id):
+  with jobs_lock:
+    return jobs.get(job_id)
+
+
+def parse_seed(value):
+  """
+  Returns the seed given to a route as an int, None if not given. Raises ValueError if it is not a non-negative
+  integer, or a string of one, so that e.g. 1.5 or true are rejected rather than truncated.
+  """
+  if value is None:
+    return None
+  seed = None
+  if isinstance(value, str) or (isinstance(value, int) and not isinstance(value, bool)):
+    try:
+      seed = int(value)
+    except ValueError:
+      pass
+  if seed is None or seed < 0:
+    raise ValueError(f"The seed must be a non-negative integer, got {value}")
+  return seed
+
+
+@app.route("/jobs", methods=['POST'])
+@cross_origin()
+def create_job():
+  """
+  Queues a simulation. The body is {"mode": "default"} or {"mode": "manual", "riders": [...]} with the riders in
+  the format of input.json, and an optional "seed". Seeded and manual simulations are cached, so the job may
+  already be done. Returns the job with status 202, or 429 if the queue is full.
+  """
+  body = request.get_json(silent=True) or {}
+  mode = body.get('mode', 'default')
+  if mode not in ('default', 'manual'):
+    return {'error': f"Unknown mode {mode}"}, 400
+  if mode == 'manual' and not isinstance(body.get('riders'), list):
+    return {'error': 'The manual mode needs a list of riders'}, 400
+  try:
+    seed = parse_seed(body.get('seed'))
+  except ValueError as e:
+    return {'error': str(e)}, 400
+  job = submit_job(mode, body.get('riders'), seed)
+  if job is None:
+    return {'error': 'Too many simulations are waiting, try again later'}, 429
+  return job.to_dict(), 202, {'Location': f'/jobs/{job.id}'}
+
+
+@app.route("/jobs/<job_id>", methods=['GET'])
+@cross_origin()
+def job_status(job_id):
+  """Returns the status and progress of a job."""
+  job = get_job(job_id)
+  if job is None:
+    return {'error': 'Unknown job'}, 404
+  return job.to_dict()
 
-  elevators_filepath_otis = os.path.join(app.config['OUTPUT_FOLDER'], 'output_elevator_Otis.json')
-  persons_filepath_otis = os.path.join(app.config['OUTPUT_FOLDER'], 'output_persons_Otis.json')
 
-  elevators_filepath_egcs = os.path.join(app.config['OUTPUT_FOLDER'], 'output_elevator_ModernEGCS.json')
-  persons_filepath_egcs = os.path.join(app.config['OUTPUT_FOLDER'], 'output_persons_ModernEGCS.json')
+@app.route("/jobs/<job_id>/result", methods=['GET'])
+@cross_origin()
+def job_result(job_id):
+  """Returns the output of a finished job, 409 while it is still queued or running."""
+  job = get_job(job_id)
+  if job is None:
+    return {'error': 'Unknown job'}, 404
+  if job.status == 'failed':
+    return job.to_dict(), 500
+  if job.status != 'done':
+    return job.to_dict(), 409
+  return result_response(job)
+
+
+def run_job(mode, riders=None):
+  """Runs a job and waits for its output, for the synchronous routes. The seed is read from the query string."""
+  try:
+    seed = parse_seed(request.args.get('seed'))
+  except ValueError as e:
+    return {'error': str(e)}, 400
+  job = submit_job(mode, riders, seed)
+  if job is None:
+    return {'error': 'Too many simulations are waiting, try again later'}, 429
+  if job.future is not None:
+    job.future.result()
+  if job.status == 'failed':
+    return job.to_dict(), 500
+  return result_response(job)
 
-  elevators_data_otis = json.load(open(elevators_filepath_otis))
-  persons_data_otis = json.load(open(persons_filepath_otis))
 
-  elevators_data_egcs = json.load(open(elevators_filepath_egcs))
-  persons_data_egcs = json.load(open(persons_filepath_egcs))
-  
-  data = {
-    'Otis':{
-      'Elevators': elevators_data_otis, 
-      'Persons': persons_data_otis
-    }, 
-          
-    'ModernEGCS':{
-      'Elevators': elevators_data_egcs, 
-      'Persons': persons_data_egcs
-    }
-  }
+@app.route("/random", methods=['GET'])
+@cross_origin()
+def random_simulation():
+  logging.warning('Started')
+  return run_job('default')
 
-  return data
 
 @app.route("/manual", methods=['GET', 'POST'])
 @cross_origin()
 def manual_simulation():
-
   logging.warning('Started')
+  riders = request.get_json()
+  logging.warning(json.dumps(riders, indent=4))
+  return run_job('manual', riders)
+
+
+def produce_chunks(mode, riders, seed, duration, chunk_interval, chunks):
+  """
+  Entry point of the worker process of a stream, runs the simulation and puts one NDJSON line per chunk into the
+  chunks queue, followed by None. Waits while the queue is full, the process is terminated if the stream is cancelled.
+  The duration and chunk interval are arguments, as the spawned process imports this module afresh.
+  """
+  try:
+    main = Main(num_up=2, num_down=1, num_floors=9)
+    path_to_data = io.StringIO(json.dumps(riders)) if mode == 'manual' else None
+    start = {'type': 'start', 'duration': duration, 'num_floors': main.num_floors,
+             'num_elevators': main.num_up + main.num_down, 'lift_algos': main.lift_algos}
+    chunks.put(json.dumps(start) + '\n')
+    for chunk in main.stream(duration, mode, seed=seed, path_to_data=path_to_data, chunk_interval=chunk_interval):
+      chunks.put(json.dumps(dict(chunk, type='chunk'), separators=(',', ':')) + '\n')
+    summary = {lift_algo: {'served': result.num_served, 'average_waiting_time': result.average_waiting_time}
+               for lift_algo, result in main.results.items()}
+    chunks.put(json.dumps({'type': 'end', 'summary': summary}) + '\n')
+  except Exception as e:
+    logging.exception('Streamed simulation failed')
+    chunks.put(json.dumps({'type': 'error', 'error': str(e)}) + '\n')
+  finally:
+    chunks.put(None)
+
+
+class Stream(object):
+  """
+  A simulation streamed by /stream. It waits for a slot of the executor like a Job, then runs in a worker process, so
+  that it does not hold the GIL of the web process, which puts its lines into a bounded queue read by the response.
+
+  Attributes:
+    id (str): Identifier of the stream.
+    mode (str): 'default' or 'manual'.
+    riders (list): Riders of the 'manual' mode, in the format of input.json.
+    seed (int): Seed of the simulation, fresh entropy if None.
+    status (str): 'queued', 'running' or 'done'.
+    chunks (multiprocessing.Queue): NDJSON lines produced ahead of the client, see produce_chunks().
+    cancelled (threading.Event): Set once the client disconnected or read the whole stream.
+    finished (threading.Event): Set once the worker process exited, or was never started.
+  """
+  def __init__(self, mode, riders=None, seed=None):
+    self.id = uuid.uuid4().hex
+    self.mode = mode
+    self.riders = riders
+    self.seed = seed
+    self.status = 'queued'
+    self.chunks = MP_CONTEXT.Queue(maxsize=STREAM_BUFFERED_CHUNKS)
+    self.cancelled = threading.Event()
+    self.finished = threading.Event()
+
+  def run(self):
+    """Runs the worker process of the stream until it exits or the stream is cancelled, called by the executor."""
+    self.status = 'running'
+    # spawned like the workers of Main.run(), a process forked from this thread could inherit a lock held by another
+    process = MP_CONTEXT.Process(target=produce_chunks, daemon=True,
+                                 args=(self.mode, self.riders, self.seed, DURATION, STREAM_CHUNK_INTERVAL, self.chunks))
+    try:
+      if not self.cancelled.is_set():
+        process.start()
+        while process.is_alive() and not self.cancelled.is_set():
+          process.join(STREAM_POLL_INTERVAL)
+    finally:
+      if process.is_alive():
+        process.terminate()
+        process.join()
+      self.status = 'done'
+      self.finished.set()
+      with jobs_lock:
+        streams.pop(self.id, None)
+
+  def lines(self):
+    """Yields the lines of the worker process, ending with an error line if it exited before its last one."""
+    while True:
+      try:
+        line = self.chunks.get(timeout=STREAM_POLL_INTERVAL)
+      except queue.Empty:
+        if not self.finished.is_set():
+          continue
+        # the worker may have put its last lines and exited since the timeout, it flushed them before exiting
+        try:
+          line = self.chunks.get_nowait()
+        except queue.Empty:
+          yield json.dumps({'type': 'error', 'error': 'The simulation stopped unexpectedly'}) + '\n'
+          return
+      if line is None:
+        return
+      yield line
+
+
+def submit_stream(mode, riders=None, seed=None):
+  """Returns a new queued stream of the simulation, None if too many jobs and streams are already waiting."""
+  stream = Stream(mode, riders, seed)
+  with jobs_lock:
+    if count_queued() >= MAX_QUEUED_JOBS:
+      return None
+    streams[stream.id] = stream
+    executor.submit(stream.run)
+  return stream
+
+
+@app.route("/stream", methods=['GET', 'POST'])
+@cross_origin()
+def stream_simulation():
+  """
+  Streams a simulation as newline-delimited JSON while it runs, instead of returning it once it is over. The first
+  line describes the building, every following line is a chunk of one algorithm holding its new elevator log entries
+  (see ElevatorLog.COLUMNS) and completed trips, and the last line is the summary of every algorithm, or an error.
+  GET simulates random riders, POST the riders of the body in the format of input.json. Takes an optional seed in
+  the query string. The stream waits for a slot of the job executor, returns 429 if the queue is full, and the
+  simulation waits while the client is behind. Lines are compressed with gzip as they are sent if the client accepts
+  it.
+  """
+  riders = None
+  if request.method == 'POST':
+    riders = request.get_json(silent=True)
+    if not isinstance(riders, list):
+      return {'error': 'The manual mode needs a list of riders'}, 400
+  try:
+    seed = parse_seed(request.args.get('seed'))
+  except ValueError as e:
+    return {'error': str(e)}, 400
+  mode = 'default' if riders is None else 'manual'
+  if seed is None and mode == 'manual':
+    seed = MANUAL_SEED
+  stream = submit_stream(mode, riders, seed)
+  if stream is None:
+    return {'error': 'Too many simulations are waiting, try again later'}, 429
+  encoding = request.accept_encodings.best_match(['gzip', 'identity'], default='identity')
+
+  def generate():
+    # every line is flushed on its own, so the client can decompress it before the stream ends
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16) if encoding == 'gzip' else None
+    try:
+      for line in stream.lines():
+        if compressor is None:
+          yield line
+        else:
+          yield compressor.compress(line.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+      if compressor is not None:
+        yield compressor.flush()
+    finally:
+      stream.cancelled.set()  # the client disconnected or the stream is over
+
+  response = Response(generate(), mimetype='application/x-ndjson')
+  if encoding != 'identity':
+    response.headers['Content-Encoding'] = encoding
+  response.vary.add('Accept-Encoding')
+  return response
+
+
+@app.route("/cache/stats", methods=['GET'])
+@cross_origin()
+def cache_stats():
+  """Returns the hit and miss counters and the size of the result cache."""
+  return cache.stats()
 
-  input_files = glob.glob(os.path.join(app.config['INPUT_FOLDER'], '*'))
-  for f in input_files:
-      os.remove(f)
-
-  logging.warning('Removed input files')
-
-  output_files = glob.glob(os.path.join(app.config['OUTPUT_FOLDER'], '*'))
-  for f in output_files:
-      os.remove(f)
-
-  logging.warning('Removed output files')
-
-  # get the uploaded file
-  json_input = json.dumps(request.get_json(), indent=4)
-
-  logging.warning(json_input)
-
-  file_path = os.path.join(app.config['INPUT_FOLDER'], 'input.json')
-
-  # set the file path
-  with open(file_path, 'w') as f:
-    f.write(json_input)
-
-  # execute the simulation process
-  Test.run(64800, mode='manual')
-
-  # prepare the output
-
-  elevators_filepath_otis = os.path.join(app.config['OUTPUT_FOLDER'], 'output_elevator_Otis.json')
-  persons_filepath_otis = os.path.join(app.config['OUTPUT_FOLDER'], 'output_persons_Otis.json')
-
-  elevators_filepath_egcs = os.path.join(app.config['OUTPUT_FOLDER'], 'output_elevator_ModernEGCS.json')
-  persons_filepath_egcs = os.path.join(app.config['OUTPUT_FOLDER'], 'output_persons_ModernEGCS.json')
-
-  elevators_data_otis = json.load(open(elevators_filepath_otis))
-  persons_data_otis = json.load(open(persons_filepath_otis))
-
-  elevators_data_egcs = json.load(open(elevators_filepath_egcs))
-  persons_data_egcs = json.load(open(persons_filepath_egcs))
-  
-  data = {
-    'Otis':{
-      'Elevators': elevators_data_otis, 
-      'Persons': persons_data_otis
-    }, 
-          
-    'ModernEGCS':{
-      'Elevators': elevators_data_egcs, 
-      'Persons': persons_data_egcs
-    }
-  }
-
-  return data
 
 if __name__ == '__main__':
     app.run(debug = True)
@@ -1,7 +1,12 @@
 import simpy
 from src.main.python.simulation.Floor import TopFloor, GroundFloor, SandwichFloor
+from src.main.python.simulation.CallRegistry import CallRegistry
 from src.main.python.simulation.ElevatorSystem import ElevatorSystem
+from src.main.python.simulation.ElevatorLog import ElevatorLog
 import src.main.python.simulation.ModernEGCS as ModernEGCS
+from src.main.python.simulation.Logger import log
+from src.main.python.simulation.RandomStreams import RandomStreams
+import logging
 import numpy as np
 
 
@@ -17,24 +22,33 @@ class Building(object):
         elevator_group (ElevatorSystem.ElevatorSystem): An instance of the ElevatorSystem class that manages the
             elevators in the building.
         all_persons_spawned (PersonList): A PersonList object containing all Person instances
-        log: Log of every elevator state change
+        log (ElevatorLog): Log of every elevator state change
         arrival_rates_floors: This is for ModernECGS algo.
         elevator_algo: Elevator algorithm is either OTIS or ModernECGS.
+        streams (RandomStreams): Source of the dwell and travel times of the elevators.
     Methods:
         get_elevator_system(): Returns the object of the elevator system being implemented, which is either from the class ElevatorSystem (representing Otis) or ModernEGCS
         get_elevator_algo_type(): Returns in string the elevator system being implemented, which is either Otis or ModernEGCS
         get_num_floors(): Returns the number of floors in the building.
         get_all_persons(): Returns the PersonList object in the building.
         place_person_on_floor(): Distribute Person from PersonList into the floors.
+        place_arrived_persons(): Places every Person who arrived since the last call on their floor.
         initialise(): Initialises the building by adding the floors and the elevator system.
         to_dict(): Returns a dictionary of logged information
+        get_log(): Returns the ElevatorLog of the building.
         simulate(): Simulates the building operation by creating Person instances, placing them in their
             respective floors, and managing the elevators in the building.
+        simulate_events(): Event-driven alternative to simulate() that only wakes up when something happens.
+        schedule_arrivals(): Wakes the event-driven simulation at every Person's arrival time.
+        schedule_redistribution(): Periodically redistributes ModernEGCS hall calls and idle elevators.
+        notify(): Wakes the event-driven simulation if it is waiting for an event.
+        start_elevators(): Starts one simulation process per elevator.
+        record_state(): Logs the state of the elevators that changed since they were last logged.
         update_floor_arrival_rate(): Updates the value of arrival rate for a specified floor.
         get_sum_arrival_rates_floors(): Returns the sum of arrival rates across all floors.
         get_busiest_floor(): Returns floor level with the highest arrival rate.
     """
-    def __init__(self, env, num_up, num_down, num_floors, persons_list):
+    def __init__(self, env, num_up, num_down, num_floors, persons_list, streams=None):
         """
         Args:
             env (simpy.Environment): The simulation environment.
@@ -42,17 +56,22 @@ class Building(object):
             num_down (int): The number of elevators going down.
             num_floors (int): The number of floors in the building.
             persons_list (PersonList): The generated Persons used for simulation.
+            streams (RandomStreams): Source of the dwell and travel times, unseeded streams if not given.
         """
         self.env = env
         self.num_up = num_up
         self.num_down = num_down
         self.num_floors = num_floors
         self.floors = []
+        self.calls = None  # CallRegistry holding the call flags of every floor
         self.elevator_group = None
         self.all_persons_spawned = persons_list
-        self.log = {}  # logs every step
+        self.log = ElevatorLog(num_floors)  # logs every elevator state change
         self.arrival_rates_floors = np.zeros(num_floors)
         self.elevator_algo = None
+        self.wakeup = None  # pending event the event-driven simulation is waiting on
+        self.num_persons_placed = 0  # persons are placed on their floor in order of arrival
+        self.streams = RandomStreams() if streams is None else streams
     
     def get_elevator_system(self):
         """Returns either ElevatorSystem or ModernEGCS object which is implemented as the building's elevator system"""
@@ -77,36 +96,52 @@ class Building(object):
             person (Person): The person who wants to use the elevator system.
         """
         # Put the person in the floor and call the lift
-        call_direction = person.get_direction()
-        curr_floor = self.floors[person.get_curr_floor() - 1]
-        if call_direction == "DOWN":
-            curr_floor.add_person_going_down(person)
-        else:
-            curr_floor.add_person_going_up(person)
+        self.floors[person.get_curr_floor() - 1].add_person(person)
+
+    def place_arrived_persons(self) -> None:
+        """Places every Person who arrived since the last call on their floor, so floors only queue arrived persons."""
+        persons = self.all_persons_spawned.get_person_list()
+        while self.num_persons_placed < len(persons) \
+                and persons[self.num_persons_placed].get_arrival_time() <= self.env.now:
+            self.place_person_on_floor(persons[self.num_persons_placed])
+            self.num_persons_placed += 1
     
-    def initialise(self,elevator_algo) -> None:
-        """Initialises all components that make up the building."""
+    def initialise(self, elevator_algo, weights=(1, 1, 1)) -> None:
+        """
+        Initialises all components that make up the building.
+
+        Args:
+            elevator_algo (str): 'Otis' or 'ModernEGCS'.
+            weights (tuple): w1, w2 and w3 of the ModernEGCS cost calculation.
+        """
         # Place floors into building
-        self.floors.append(GroundFloor(self.env, 1))
+        self.calls = CallRegistry(self.num_floors)
+        self.floors.append(GroundFloor(self.env, 1, self.calls))
 
-        self.floors.extend([SandwichFloor(self.env, i) for i in range(2, self.num_floors)])
+        self.floors.extend([SandwichFloor(self.env, i, self.calls) for i in range(2, self.num_floors)])
     
-        self.floors.append(TopFloor(self.env, self.num_floors))
+        self.floors.append(TopFloor(self.env, self.num_floors, self.calls))
     
         # Place elevators into building
         if elevator_algo=="Otis":
             self.elevator_algo = "Otis"
-            self.elevator_group = ElevatorSystem(self.env, self.floors, self.num_up, self.num_down)
+            self.elevator_group = ElevatorSystem(self.env, self.floors, self.num_up, self.num_down, self.calls,
+                                                 self.streams)
         elif elevator_algo=="ModernEGCS":
             self.elevator_algo = "ModernEGCS"
-            self.elevator_group = ModernEGCS.ModernEGCS(self.env, self, self.floors, num_elevators=self.num_up+self.num_down,w1=1,w2=1,w3=1)
-            
-        # Place persons into building
-        for person in self.all_persons_spawned.get_person_list():
-            self.place_person_on_floor(person)
+            self.elevator_group = ModernEGCS.ModernEGCS(self.env, self, self.floors, num_elevators=self.num_up+self.num_down,
+                                                        w1=weights[0], w2=weights[1], w3=weights[2],
+                                                        streams=self.streams)
+
+        # Persons are placed into the building as they arrive, see place_arrived_persons()
+        self.num_persons_placed = 0
 
     def to_dict(self) -> dict:
-        """Returns a dictionary of the logged info."""
+        """Returns a dictionary of the logged info, see ElevatorLog.to_dict()."""
+        return self.log.to_dict()
+
+    def get_log(self) -> ElevatorLog:
+        """Returns the ElevatorLog of the building, use ElevatorLog.expand() to get per-second snapshots."""
         return self.log
 
     def simulate(self):
@@ -114,49 +149,102 @@ class Building(object):
         Simulates the building operation by creating Person instances, placing them in their respective floors,
         and managing the elevators in the building.
         """
-
+        self.start_elevators()
         while True:
-            self.log.update(self.elevator_group.to_dict())
-            print(f'Current simulation time: {self.env.now}')
+            self.record_state()
+            log.debug('Current simulation time: %s', self.env.now)
             if self.env.now == 0 or self.elevator_group.is_all_idle():
                 next_arrival_time = self.all_persons_spawned.get_earliest_arrival_time()
                 if next_arrival_time >= self.env.now:
-                    print(f"Fast-forwarding simulation time by {round(next_arrival_time - self.env.now)} unit(s)...")
+                    log.debug('Fast-forwarding simulation time by %s unit(s)...',
+                              round(next_arrival_time - self.env.now))
                     yield self.env.timeout(round(next_arrival_time - self.env.now))
             # activate floor buttons if person 'arrived'
+            self.place_arrived_persons()
             for floor in self.floors:
                 floor.update(self, self.elevator_group)
 
             if self.get_elevator_algo_type() == "Otis":
                 self.elevator_group.allocate_rising_call()
                 self.elevator_group.allocate_landing_call()
-
-                for elevator in self.elevator_group.elevators_up:
-                    yield self.env.process(elevator.activate())
-                    yield self.env.process(elevator.move())
-
-                for elevator in self.elevator_group.elevators_down:
-                    yield self.env.process(elevator.activate())
-                    yield self.env.process(elevator.move())
-
                 self.elevator_group.update_status()
                 yield self.env.timeout(1)
-                print(self.elevator_group.print_system_status())
-                print(f'\n')
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug('%s\n', self.elevator_group.print_system_status())
 
             # ModernEGCS handling of persons
             elif self.get_elevator_algo_type() == "ModernEGCS":
                 self.elevator_group.assign_calls()
-                for elevator in self.elevator_group.elevators:
-                    yield self.env.process(elevator.activate())
-                    yield self.env.process(elevator.move())
                 self.elevator_group.update_status()
                 yield self.env.timeout(1)
-                print(self.elevator_group.print_system_status())
-                print(f'\n')
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug('%s\n', self.elevator_group.print_system_status())
+
+            else:
+                log.warning("Lift algorithm has not been configured yet")
+
+    def simulate_events(self):
+        """
+        Event-driven alternative to simulate(). Instead of advancing the clock by 1 second per step, the group
+        controller sleeps until a person arrives or an elevator becomes free, while every elevator runs as its own
+        process, so the number of steps scales with the number of events rather than the simulated duration.
+        """
+        self.env.process(self.schedule_arrivals())
+        if self.get_elevator_algo_type() == "ModernEGCS":
+            self.env.process(self.schedule_redistribution())
+        self.start_elevators()
+
+        while True:
+            self.place_arrived_persons()
+            for floor in self.floors:
+                floor.update(self, self.elevator_group)
+
+            if self.get_elevator_algo_type() == "Otis":
+                self.elevator_group.allocate_rising_call()
+                self.elevator_group.allocate_landing_call()
+                self.elevator_group.update_status()
+            elif self.get_elevator_algo_type() == "ModernEGCS":
+                self.elevator_group.assign_calls()
+                self.elevator_group.update_status(redistribute=False)
+            else:
+                log.warning("Lift algorithm has not been configured yet")
+            self.record_state()
 
+            self.wakeup = self.env.event()
+            if self.elevator_group.has_pending_calls():
+                # calls are waiting on an elevator to become available, retry on the next second at the latest
+                yield self.wakeup | self.env.timeout(1)
             else:
-                print("Lift algorithm has not been configured yet")
+                yield self.wakeup
+
+    def schedule_arrivals(self):
+        """Wakes the event-driven simulation at the arrival time of every Person in the PersonList."""
+        for person in self.all_persons_spawned.get_person_list():
+            delay = person.get_arrival_time() - self.env.now
+            if delay > 0:
+                yield self.env.timeout(delay)
+            self.notify()
+
+    def schedule_redistribution(self, interval=300):
+        """Calls ModernEGCS redistribute() every interval seconds, replacing the clock check in update_status()."""
+        while True:
+            yield self.env.timeout(interval)
+            self.elevator_group.redistribute()
+            self.notify()
+
+    def notify(self) -> None:
+        """Wakes the event-driven simulation if it is waiting for an event."""
+        if self.wakeup is not None and not self.wakeup.triggered:
+            self.wakeup.succeed()
+
+    def start_elevators(self) -> None:
+        """Starts one simulation process per elevator, see Elevator.run()."""
+        for elevator in self.elevator_group.get_elevators():
+            self.env.process(elevator.run(self))
+
+    def record_state(self) -> None:
+        """Logs the state of the elevators that changed since they were last logged."""
+        self.log.record(self.env.now, self.elevator_group.get_elevators())
 
     def update_floor_arrival_rate(self, floor_index, updated_rate):
         """Updates the value of arrival rate for a specified floor. Used in ModernEGCS calculations."""
@@ -0,0 +1,48 @@
+import numpy as np
+
+
+class CallRegistry(object):
+    """
+    Hall call state of every floor of a building, kept in NumPy boolean arrays indexed by floor level - 1. Floors
+    read and write their call flags here, so the elevator system can find the floors that need service with a single
+    vector operation instead of asking every floor.
+
+    Attributes:
+        call_up (np.ndarray): True if the up button of the floor is pressed.
+        call_down (np.ndarray): True if the down button of the floor is pressed.
+        call_up_accepted (np.ndarray): True if an elevator has accepted the up call of the floor.
+        call_down_accepted (np.ndarray): True if an elevator has accepted the down call of the floor.
+    """
+    def __init__(self, num_floors):
+        """
+        Args:
+            num_floors (int): The number of floors in the building.
+        """
+        self.call_up = np.zeros(num_floors, dtype=bool)
+        self.call_down = np.zeros(num_floors, dtype=bool)
+        self.call_up_accepted = np.zeros(num_floors, dtype=bool)
+        self.call_down_accepted = np.zeros(num_floors, dtype=bool)
+
+    def unaccepted_up_calls(self) -> np.ndarray:
+        """Returns a boolean mask of the floors with an up call that no elevator has accepted yet."""
+        return self.call_up & ~self.call_up_accepted
+
+    def unaccepted_down_calls(self) -> np.ndarray:
+        """Returns a boolean mask of the floors with a down call that no elevator has accepted yet."""
+        return self.call_down & ~self.call_down_accepted
+
+    def get_unaccepted_up_floors(self) -> list:
+        """Returns the levels of the floors with an unaccepted up call, in ascending order."""
+        return (np.flatnonzero(self.unaccepted_up_calls()) + 1).tolist()
+
+    def get_unaccepted_down_floors(self) -> list:
+        """Returns the levels of the floors with an unaccepted down call, in ascending order."""
+        return (np.flatnonzero(self.unaccepted_down_calls()) + 1).tolist()
+
+    def has_unaccepted_up_calls(self) -> bool:
+        """Returns True if any floor has an up call that no elevator has accepted yet."""
+        return bool(self.unaccepted_up_calls().any())
+
+    def has_unaccepted_down_calls(self) -> bool:
+        """Returns True if any floor has a down call that no elevator has accepted yet."""
+        return bool(self.unaccepted_down_calls().any())
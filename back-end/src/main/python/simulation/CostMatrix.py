@@ -0,0 +1,137 @@
+import numpy as np
+
+DIRECTION_CODES = {"UP": 1, "DOWN": -1, "NIL": 0}
+
+
+class CostMatrix(object):
+    """
+    Batched version of ModernEGCS.calculate_cost2_minus_cost1_efficient(). The state of every elevator is copied into
+    arrays once, and cost2-cost1 of every pending hall call for every elevator is computed with NumPy broadcasting.
+    Every term is evaluated in the same order as the scalar calculation, so both give identical values.
+
+    Attributes:
+        indices (np.ndarray): Index of every elevator.
+        curr_floor (np.ndarray): Current floor of every elevator.
+        direction (np.ndarray): 1 for UP, -1 for DOWN and 0 for NIL.
+        path (np.ndarray): Path of every elevator padded with zeros, shape (elevators, longest path).
+        path_length (np.ndarray): Length of the path of every elevator.
+        car_calls (np.ndarray): Car calls of every elevator padded with zeros, shape (elevators, most car calls).
+        num_car_calls (np.ndarray): Number of car calls of every elevator.
+        num_floors (int): The number of floors in the building.
+    """
+    def __init__(self, elevators, num_floors):
+        """
+        Args:
+            elevators (list of Elevator): The elevators of the group, in the order of the cost matrix columns.
+            num_floors (int): The number of floors in the building.
+        """
+        self.num_floors = num_floors
+        self.indices = np.array([elevator.get_index() for elevator in elevators])
+        self.curr_floor = np.array([elevator.get_current_floor() for elevator in elevators])
+        self.direction = np.array([DIRECTION_CODES[elevator.get_direction()] for elevator in elevators])
+        self.path, self.path_length = self.pad([elevator.get_path() for elevator in elevators])
+        self.car_calls, self.num_car_calls = self.pad([elevator.get_car_calls() for elevator in elevators])
+
+    @staticmethod
+    def pad(lists) -> tuple:
+        """Returns the lists as a zero padded 2D array and the length of every list."""
+        lengths = np.array([len(values) for values in lists])
+        padded = np.zeros((len(lists), max(1, lengths.max(initial=0))), dtype=int)
+        for row, values in enumerate(lists):
+            padded[row, :len(values)] = values
+        return padded, lengths
+
+    def calculate(self, hall_calls, floors, now, w1, w2, w3) -> np.ndarray:
+        """
+        Calculates cost2-cost1 of every hall call for every elevator.
+
+        Args:
+            hall_calls (list of HallCall): The hall calls, in the order of the cost matrix rows.
+            floors (list of Floor): The floors of the building, to look up the persons waiting for every hall call.
+            now (float): Current simulation time.
+            w1, w2, w3: Weights of the waiting, riding and moving distance costs.
+        Returns:
+            np.ndarray: Cost matrix of shape (hall calls, elevators), NaN where the elevator is moving in the
+            opposite direction to the hall call.
+        """
+        hall_floor = np.array([hall_call.get_source_floor() for hall_call in hall_calls])
+        hall_direction = np.array([DIRECTION_CODES[hall_call.get_direction()] for hall_call in hall_calls])
+        queues = [floors[hall_call.get_source_floor() - 1].get_queue(hall_call.get_direction())
+                  for hall_call in hall_calls]
+
+        has_path = (self.path_length > 0)[None, :]
+        same_direction = hall_direction[:, None] == self.direction[None, :]
+        moving_elsewhere = has_path & ~same_direction & (self.direction != 0)[None, :]
+
+        # floors_til_arrival: number of leading floors in the path before the hall call floor
+        path_valid = np.arange(self.path.shape[1])[None, :] < self.path_length[:, None]
+        floor_3d = hall_floor[:, None, None]
+        before_hall_call = np.where(hall_direction[:, None, None] == 1,
+                                    self.path[None, :, :] < floor_3d, self.path[None, :, :] > floor_3d)
+        leading = np.cumprod(before_hall_call & path_valid[None, :, :], axis=2).sum(axis=2)
+        floors_til_arrival = np.where(same_direction & has_path, leading, 0)
+
+        # elevator_moving_distance_cost
+        first = self.path[:, 0]
+        last = self.path[np.arange(len(self.path_length)), np.maximum(self.path_length - 1, 0)]
+        path_min = np.where(path_valid, self.path, np.iinfo(int).max).min(axis=1)
+        path_max = np.where(path_valid, self.path, np.iinfo(int).min).max(axis=1)
+        initial_distance = np.abs(last - first)
+        within_path = (first[None, :] <= hall_floor[:, None]) & (hall_floor[:, None] <= last[None, :])
+        extended_distance = np.where(within_path, (path_max - path_min)[None, :],
+                                     np.maximum(path_max[None, :], hall_floor[:, None])
+                                     - np.minimum(path_min[None, :], hall_floor[:, None]))
+        current_distance = np.where(same_direction, extended_distance,
+                                    np.abs(self.curr_floor[None, :] - hall_floor[:, None]))
+        moving_distance_cost = np.where(has_path, current_distance - initial_distance[None, :], 0)
+
+        # waiting_passengers_cost from the aggregates of the waiting queues
+        count = np.array([len(queue) for queue in queues], dtype=float)[:, None]
+        reference_time = np.array([queue.reference_time for queue in queues], dtype=float)[:, None]
+        sum_arrival = np.array([queue.sum_arrival for queue in queues])[:, None]
+        sum_arrival_squared = np.array([queue.sum_arrival_squared for queue in queues])[:, None]
+        offset = (now + floors_til_arrival * 6) - reference_time
+        waiting_cost = count * offset * offset - 2 * offset * sum_arrival + sum_arrival_squared
+
+        # riding_passengers_cost, see Elevator.estimate_remaining_riding_time()
+        destinations = np.zeros((len(hall_calls), self.num_floors))
+        for row, queue in enumerate(queues):
+            for destination_floor, num_persons in queue.destinations.items():
+                destinations[row, destination_floor - 1] = num_persons
+        target = np.arange(1, self.num_floors + 1)
+        car_calls_valid = np.arange(self.car_calls.shape[1])[None, :] < self.num_car_calls[:, None]
+        # car calls counted before the first car call at or beyond the destination, shape (elevators, dest, k)
+        counted = np.cumprod(car_calls_valid[:, None, :] & (self.car_calls[:, None, :] < target[None, :, None]),
+                             axis=2)
+        # car calls above the source floor, shape (elevators, k, hall calls)
+        above_source = (car_calls_valid[:, :, None] & (self.car_calls[:, :, None] > hall_floor[None, None, :]))
+        stops = np.matmul(counted, above_source).transpose(2, 0, 1)
+        stops = np.where((self.direction == -1)[None, :, None], self.num_car_calls[None, :, None] - stops - 1, stops)
+        riding_time = np.abs(target[None, :] - self.curr_floor[:, None])[None, :, :] * 3.5 + 3.5 * stops
+        riding_cost = np.einsum('ct,cet->ce', destinations, riding_time ** 2)
+
+        costs = w1 * waiting_cost + w2 * riding_cost + w3 * moving_distance_cost
+        return np.where(moving_elsewhere, np.nan, costs)
+
+    def priority_arrays(self, costs) -> list:
+        """
+        Converts a cost matrix to the HCPM priority array of every hall call, as in
+        ModernEGCS.create_call_priority_array().
+
+        Args:
+            costs (np.ndarray): Output of calculate().
+        Returns:
+            list: One priority array of (elevator index, value) pairs per hall call.
+        """
+        excluded = np.isnan(costs) | (costs == -1)
+        order = np.argsort(np.where(excluded, np.inf, costs), axis=1, kind='stable')
+        arrays = []
+        for row, num_included in enumerate((~excluded).sum(axis=1).tolist()):
+            columns = order[row, :num_included]
+            indices = self.indices[columns].tolist()
+            values = costs[row, columns]
+            converted = list(zip(indices[:-1], (values[1:] - values[:-1]).tolist()))
+            if num_included > 0:
+                converted.append((indices[-1], -1))
+            arrays.append(converted)
+        return arrays
@@ -1,6 +1,9 @@
-import random
+import logging
 import simpy
+import src.main.python.simulation.Logger as Logger
 from src.main.python.simulation.Floor import Floor
+from src.main.python.simulation.Logger import log
+from src.main.python.simulation.RandomStreams import RandomStreams
 
 MAX_CAPACITY = 13
 MAX_WEIGHT = 1600  # kilograms
@@ -24,6 +27,7 @@ class Elevator(object):
         is_working_status (bool): The status of the elevator, busy or idle.
         passengers (list): The list of passengers in the elevator.
         path (list): The path the elevator will take to its next destination.
+        streams (RandomStreams): Source of the dwell and travel times.
 
     Methods:
         __str__(): Returns a string representation of the elevator.
@@ -39,9 +43,10 @@ class Elevator(object):
         add_path(floor_level): Adds a floor to the path the elevator will take.
         get_path(): Returns the path the elevator will take.
         has_path(): Returns whether the elevator has a path to follow.
+        run(building): Long-lived process that drives the elevator independently of the other elevators.
 
     """
-    def __init__(self, env, index, collection_floors, curr_floor, total_num_elevators, direction="NIL"):
+    def __init__(self, env, index, collection_floors, curr_floor, total_num_elevators, direction="NIL", streams=None):
         """
         Initializes an Elevator object with the specified parameters.
 
@@ -53,6 +58,7 @@ class Elevator(object):
             total_num_elevators (int): The number of elevators present in the system.
             direction (str): The direction of travel for the elevator. If not specified, as in for ModernEGCS,
             it is initially set as "NIL".
+            streams (RandomStreams): Source of the dwell and travel times, unseeded streams if not given.
 
         """
         self.env = env
@@ -74,6 +80,10 @@ class Elevator(object):
         self.is_moving = False
         self.total_num_elevators = total_num_elevators
         self.num_active_calls = 0  # actual number of active calls that the elevator is serving
+        self.streams = RandomStreams() if streams is None else streams
+        self.work_available = None  # event the elevator process waits on while it has no path
+        self.building = None  # set by run(), notified of state changes
+        self.left_persons_waiting = False  # True if persons still queue at the floor the elevator last served
         if direction == "NIL":
             self.lift_algo = "ModernEGCS"
         else:
@@ -88,8 +98,18 @@ class Elevator(object):
         """Converts elevator information into a dictionary."""
         floor = {floor + 1: 0 for floor in range(self.num_floors)}
         floor[self.get_current_floor()] = 1
-        return {'elevator_type': -1 if self.direction == "DOWN" else 1 if self.direction == "UP" else 0,
-                'floor': floor, 'num_passengers': self.get_num_passengers()}
+        return {'elevator_type': self.get_direction_code(), 'floor': floor, 'num_passengers': self.get_num_passengers()}
+
+    def get_state(self) -> tuple:
+        """Returns the (floor, direction code, number of passengers) tuple recorded in the ElevatorLog."""
+        return self.curr_floor, self.get_direction_code(), len(self.passengers)
+
+    def get_dispatch_state(self) -> tuple:
+        """
+        Returns everything ModernEGCS cost calculation depends on, i.e. the floor, direction, path and car calls.
+        The tuple changes whenever any of them changes, so it is used as the version of cached costs.
+        """
+        return self.curr_floor, self.direction, tuple(self.path), tuple(self.car_calls)
     
     def get_index(self) -> int:
         """Returns the index of the elevator"""
@@ -99,6 +119,10 @@ class Elevator(object):
         """Returns the direction of travel for the Elevator object."""
         return self.direction
 
+    def get_direction_code(self) -> int:
+        """Returns the direction of travel as -1 for DOWN, 1 for UP and 0 for NIL."""
+        return -1 if self.direction == "DOWN" else 1 if self.direction == "UP" else 0
+
     def get_capacity(self) -> int:
         """Returns the capacity of the Elevator object, i.e. maximum number of people inside the elevator"""
         return self.capacity
@@ -113,7 +137,7 @@ class Elevator(object):
   
     def add_passengers(self, person) -> None:
         """Adds a passenger to the Elevator object."""
-        print(f'{person} has entered elevator {self.direction} {self.index}')
+        log.debug('%s has entered elevator %s %s', person, self.direction, self.index)
         self.passengers.append(person)
     
 
@@ -132,6 +156,7 @@ class Elevator(object):
         Yields:
             simpy.events.Timeout: a timeout event representing the time it takes for the passengers to enter
         """
+        left_behind = []
         for person in list_of_person:
             if len(self.passengers) < MAX_CAPACITY:
                 self.add_passengers(person)
@@ -140,21 +165,21 @@ class Elevator(object):
                 floor_level = person.get_dest_floor()
                 if floor_level not in self.car_calls:
                     self.add_car_call(floor_level)
-                print(f"{person} has entered elevator at simulation time: {self.env.now}")
+                log.debug('%s has entered elevator at simulation time: %s', person, self.env.now)
+                if Logger.events.enabled:
+                    Logger.events.emit('board', self.env.now, person=person.id, elevator=self.index,
+                                       floor=self.curr_floor)
             else:
-                # Put them back into the floor if the elevator is full
-                if self.get_direction() == "DOWN":
-                    self.floors[self.get_current_floor() - 1].add_person_going_down(person)
-                elif self.get_direction() == "UP":
-                    self.floors[self.get_current_floor() - 1].add_person_going_up(person)
+                left_behind.append(person)
         # re-arrange our path back to ordering
         self.path.sort()
-        # if we have people being put back into the floor
-        self.floors[self.get_current_floor() - 1].sort()
-        self.floors[self.get_current_floor() - 1].sort()
+        # Put them back at the front of the floor queue if the elevator is full
+        if len(left_behind) > 0 and self.get_direction() in ("UP", "DOWN"):
+            self.floors[self.get_current_floor() - 1].return_persons(left_behind, self.get_direction())
+        self.record_state()
         if len(list_of_person) > 0:
             yield self.env.process(self.elevator_door_open())
-            yield self.env.timeout(random.randint(2, 5))
+            yield self.env.timeout(self.streams.next_dwell_time())
             yield self.env.process(self.elevator_door_close())
         else:
             yield self.env.timeout(0)
@@ -168,10 +193,13 @@ class Elevator(object):
         to_remove = []
         for person in self.passengers:
             if person.has_reached_destination(self):
-                print(f'{person} has reached destination floor')
+                log.debug('%s has reached destination floor', person)
                 person.complete_trip(self.env.now)
                 to_remove.append(person)
-                print(f"{person} has left elevator at simulation time: {self.env.now}")
+                log.debug('%s has left elevator at simulation time: %s', person, self.env.now)
+                if Logger.events.enabled:
+                    Logger.events.emit('alight', self.env.now, person=person.id, elevator=self.index,
+                                       floor=self.curr_floor)
         for person in to_remove:
             self.passengers.remove(person)
         if self.curr_floor in self.car_calls:
@@ -179,9 +207,10 @@ class Elevator(object):
         if self.curr_floor in self.hall_calls:
             self.hall_calls.remove(self.curr_floor)
         self.num_active_calls-=1
+        self.record_state()
         if len(to_remove) > 0:
             yield self.env.process(self.elevator_door_open())
-            yield self.env.timeout(random.randint(2, 5))
+            yield self.env.timeout(self.streams.next_dwell_time())
             yield self.env.process(self.elevator_door_close())
         else:
             yield self.env.timeout(0)
@@ -204,14 +233,14 @@ class Elevator(object):
     def set_busy(self) -> None:
         """Set the elevator to be busy."""
         self.is_working_status = True
-        print(f'{self.direction} Elevator {self.index} has been set busy')
+        log.debug('%s Elevator %s has been set busy', self.direction, self.index)
 
     def set_idle(self, lift_algo="Otis") -> None:
         """Set the elevator to be idle."""
         self.is_working_status = False
         if lift_algo == "ModernEGCS":
             self.direction = "NIL"
-        print(f'{self.direction} Elevator {self.index} has been set idle')
+        log.debug('%s Elevator %s has been set idle', self.direction, self.index)
 
     def travel(self, end) -> None:
         """
@@ -219,8 +248,11 @@ class Elevator(object):
         Args:
             end (int): the destination floor of the elevator
         """
-        print(f'{self} moved from {self.curr_floor} to {end}')
+        log.debug('%s moved from %s to %s', self, self.curr_floor, end)
+        if Logger.events.enabled:
+            Logger.events.emit('move', self.env.now, elevator=self.index, start=self.curr_floor, end=end)
         self.curr_floor = end
+        self.record_state()
     
     def add_car_call(self, floor_level) -> None:
         """Adds a car call to the list of unserved car calls.
@@ -267,7 +299,9 @@ class Elevator(object):
             self.path = [] #change course immediately if a call is assigned to elevator
         if floor_level not in self.path:
             self.path.append(floor_level)
-        
+        if self.work_available is not None and not self.work_available.triggered:
+            self.work_available.succeed()
+
     def get_path(self) -> list:
         """
         Get the elevator's path.
@@ -298,11 +332,41 @@ class Elevator(object):
                 self.travel(self.get_current_floor() + 1)
             elif move_direction == "DOWN" and self.get_current_floor() != 1:
                 self.travel(self.get_current_floor() - 1)
-            yield self.env.timeout(random.randint(3, 4))
+            if self.left_persons_waiting and self.building is not None:
+                self.left_persons_waiting = False
+                self.building.notify()
+            yield self.env.timeout(self.streams.next_travel_time())
         else:
             yield self.env.timeout(0)
-        displayed_path = self.path if self.get_direction() == "UP" else self.path[::-1]
-        print(f"Elevator {self.index} set {self.direction} has path logged: {displayed_path}")
+        if log.isEnabledFor(logging.DEBUG):
+            displayed_path = self.path if self.get_direction() == "UP" else self.path[::-1]
+            log.debug('Elevator %s set %s has path logged: %s', self.index, self.direction, displayed_path)
+
+    def run(self, building):
+        """
+        Drives the elevator as its own simulation process, so that door dwell and travel times of one elevator
+        do not hold up the others. The process sleeps while the elevator has no path and is woken by add_path().
+
+        Args:
+            building (Building): The building to notify when the elevator changes state or becomes free.
+        """
+        self.building = building
+        while True:
+            if not self.has_path():
+                if self.is_busy():
+                    self.set_idle(self.lift_algo)
+                building.record_state()
+                building.notify()
+                self.work_available = self.env.event()
+                yield self.work_available
+                self.work_available = None
+            yield self.env.process(self.activate())
+            yield self.env.process(self.move())
+
+    def record_state(self) -> None:
+        """Lets the building log the elevator's state after its floor or passengers changed."""
+        if self.building is not None:
+            self.building.record_state()
 
     def activate(self) -> None:
         """
@@ -325,34 +389,38 @@ class Elevator(object):
             if (self.get_path()[0] != self.get_current_floor() and self.direction == "UP") or \
                 (self.get_path()[-1] != self.get_current_floor() and self.direction == "DOWN") or \
                 (self.get_path()[0] != self.get_current_floor() and self.direction == "NIL"):
-                print(f"Elevator {self.index} set {self.direction} "
-                      f"knows that current floor {self.curr_floor} NOT IN path")
+                log.debug('Elevator %s set %s knows that current floor %s NOT IN path',
+                          self.index, self.direction, self.curr_floor)
                 yield self.env.timeout(0)
             else:
-                print(f"Elevator {self.index} set {self.direction} "
-                      f"knows that current floor {self.curr_floor} IN path")
+                log.debug('Elevator %s set %s knows that current floor %s IN path',
+                          self.index, self.direction, self.curr_floor)
                 
                 # Assuming we people are gracious
                 # i.e. we let people leave the elevator before boarding
                 yield self.env.process(self.leave_elevator())
                 floor = self.floors[self.get_current_floor()-1]
 
+                # floors may have been added to the path while the doors were open, so the served floor is
+                # removed by value rather than by position
+                if self.get_current_floor() in self.path:
+                    self.path.remove(self.get_current_floor())
                 if self.get_direction() == "UP":
-                    self.path.pop(0)
                     if self.get_current_floor() < self.num_floors:  
                         yield self.env.process(self.enter_elevator(floor.remove_all_persons_going_up()))
                         # reset status
                         floor.uncall_up()
                         floor.unaccept_up_call()
                 elif self.get_direction() == "DOWN":
-                    self.path.pop(-1)
                     if self.get_current_floor() > 1:
                         yield self.env.process(self.enter_elevator(floor.remove_all_persons_going_down()))
                         # reset status
                         floor.uncall_down()
                         floor.unaccept_down_call()
-                else:
-                    self.path.pop(0)
+                # persons who arrived while boarding or did not fit need a new call, raised by Floor.update() once
+                # the elevator left the floor, see move()
+                self.left_persons_waiting = self.get_direction() in ("UP", "DOWN") \
+                    and len(floor.get_queue(self.get_direction())) != 0
     
     def get_current_floor_object(self) -> Floor:
         """
@@ -400,6 +468,27 @@ class Elevator(object):
         """
         return self.car_calls
     
+    def estimate_remaining_riding_time(self, source_floor, destination_floor) -> float:
+        """
+        Estimates the time from now until a person travelling from source_floor reaches destination_floor in this
+        elevator, assuming 3.5 seconds per floor travelled and per intermediate car call stop.
+
+        Args:
+            source_floor (int): The floor where the person boards.
+            destination_floor (int): The floor where the person alights.
+        Returns:
+            float: The estimated remaining travel time
+        """
+        to_wait_for_reaching_dest = 0
+        for floor in self.car_calls:
+            if (floor > source_floor) and (floor < destination_floor):
+                to_wait_for_reaching_dest += 1
+            if floor >= destination_floor:
+                break
+        if self.direction == "DOWN":
+            to_wait_for_reaching_dest = len(self.car_calls) - to_wait_for_reaching_dest - 1
+        return abs(destination_floor - self.curr_floor) * 3.5 + 3.5 * to_wait_for_reaching_dest
+
     def unset_direction(self) -> None:
         """Changes direction to NIL once a ModernEGCS elevator has no more calls"""
         self.direction = "NIL"
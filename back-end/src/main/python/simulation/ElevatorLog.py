@@ -0,0 +1,132 @@
+from array import array
+import math
+import numpy as np
+
+# columns of an entry, see ElevatorLog.record() and OutputWriter
+COLUMNS = [('time', 'f8'), ('elevator', 'i2'), ('floor', 'i2'), ('direction', 'i1'), ('passengers', 'i2')]
+
+
+class ElevatorLog(object):
+    """
+    A change-only log of elevator states. An entry is recorded only when an elevator's floor, direction or number
+    of passengers changes, and entries are stored column-wise in typed arrays instead of one dictionary per second.
+
+    Attributes:
+        num_floors (int): The number of floors in the building, used to expand the one-hot floor dictionaries.
+        num_elevators (int): The number of elevators seen so far.
+        time (array): Simulation time of each entry.
+        elevator (array): Position of the elevator in the elevator group, starting from 1.
+        floor (array): Floor the elevator is on.
+        direction (array): -1 for DOWN, 1 for UP and 0 for NIL, as in Elevator.to_dict().
+        passengers (array): Number of passengers inside the elevator.
+        writers (list of OutputWriter): Receive every entry as it is recorded, see COLUMNS.
+    """
+    def __init__(self, num_floors):
+        """
+        Args:
+            num_floors (int): The number of floors in the building.
+        """
+        self.num_floors = num_floors
+        self.num_elevators = 0
+        self.time = array('d')
+        self.elevator = array('i')
+        self.floor = array('i')
+        self.direction = array('b')
+        self.passengers = array('i')
+        self.last_states = {}  # elevator position -> last recorded (floor, direction, passengers)
+        self.writers = []
+
+    def __len__(self):
+        """Returns the number of entries recorded."""
+        return len(self.time)
+
+    def record(self, time, elevators) -> None:
+        """
+        Records the state of the elevators that changed since their last entry.
+
+        Args:
+            time (float): Current simulation time.
+            elevators (list of Elevator): Elevators in the order they are reported to the front-end.
+        """
+        self.num_elevators = max(self.num_elevators, len(elevators))
+        for position, elevator in enumerate(elevators, start=1):
+            state = elevator.get_state()
+            if self.last_states.get(position) == state:
+                continue
+            self.last_states[position] = state
+            self.time.append(time)
+            self.elevator.append(position)
+            self.floor.append(state[0])
+            self.direction.append(state[1])
+            self.passengers.append(state[2])
+            for writer in self.writers:
+                writer.write((time, position, state[0], state[1], state[2]))
+
+    def to_dict(self) -> dict:
+        """Returns the log as a dictionary of columns."""
+        return {
+            'num_floors': self.num_floors,
+            'num_elevators': self.num_elevators,
+            'time': self.time.tolist(),
+            'elevator': self.elevator.tolist(),
+            'floor': self.floor.tolist(),
+            'direction': self.direction.tolist(),
+            'passengers': self.passengers.tolist(),
+        }
+
+    def to_arrays(self) -> dict:
+        """Returns the entries as NumPy columns with the dtypes of COLUMNS."""
+        return {name: np.asarray(getattr(self, name)).astype(dtype) for name, dtype in COLUMNS}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds a log from the output of to_dict().
+
+        Args:
+            data (dict): Dictionary of columns.
+        Returns:
+            ElevatorLog: The rebuilt log.
+        """
+        log = cls(data['num_floors'])
+        log.num_elevators = data['num_elevators']
+        log.time.extend(data['time'])
+        log.elevator.extend(data['elevator'])
+        log.floor.extend(data['floor'])
+        log.direction.extend(data['direction'])
+        log.passengers.extend(data['passengers'])
+        return log
+
+    def expand(self, end_time=None, step=1) -> dict:
+        """
+        Expands the log to the per-second shape of Elevator.to_dict() snapshots used by the front-end, i.e.
+        {time: [{1: {'elevator_type', 'floor', 'num_passengers'}}, {2: {...}}, ...]}.
+
+        Args:
+            end_time (float): Last timestamp to expand to, defaults to the time of the last entry.
+            step (int): Number of seconds between two snapshots.
+        Returns:
+            dict: One snapshot of every elevator per timestamp, starting from the first entry.
+        """
+        if len(self) == 0:
+            return {}
+        if end_time is None:
+            end_time = self.time[-1]
+        states = {}
+        expanded = {}
+        entry = 0
+        now = math.floor(self.time[0])
+        while now <= end_time:
+            while entry < len(self) and self.time[entry] <= now:
+                states[self.elevator[entry]] = self.snapshot(entry)
+                entry += 1
+            if len(states) == self.num_elevators:
+                expanded[now] = [{position: states[position]} for position in range(1, self.num_elevators + 1)]
+            now += step
+        return expanded
+
+    def snapshot(self, entry) -> dict:
+        """Returns the entry at the given index in the format of Elevator.to_dict()."""
+        floor = {floor + 1: 0 for floor in range(self.num_floors)}
+        floor[self.floor[entry]] = 1
+        return {'elevator_type': self.direction[entry], 'floor': floor, 'num_passengers': self.passengers[entry]}
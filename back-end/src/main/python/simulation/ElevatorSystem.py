@@ -9,10 +9,11 @@ class ElevatorSystem(object):
     Attributes:
         env (simpy.Environment): The simulation environment.
         floors (list of Floor): The collection of floors in the building.
+        calls (CallRegistry): The call flags of every floor in the building.
         elevators_up (list of Elevator): The collection of elevators that move up.
         elevators_down (list of Elevator): The collection of elevators that move down.
     """
-    def __init__(self, env, collection_floors, num_up, num_down):
+    def __init__(self, env, collection_floors, num_up, num_down, calls, streams=None):
         """
         Initializes an ElevatorSystem.
         Args:
@@ -20,16 +21,21 @@ class ElevatorSystem(object):
             collection_floors (list of Floor): The collection of floors in the building.
             num_up (int): The number of elevators that move up.
             num_down (int): The number of elevators that move down.
+            calls (CallRegistry): The registry holding the call flags of collection_floors.
+            streams (RandomStreams): Source of the dwell and travel times of the elevators.
         """
         self.env = env
         self.floors = collection_floors
+        self.calls = calls
         self.num_floors = len(collection_floors)
         self.elevators_up = \
             [Elevator
-             .Elevator(env, i, self.floors, 1, num_up+num_down, direction="UP") for i in range(1, num_up + 1)]
+             .Elevator(env, i, self.floors, 1, num_up+num_down, direction="UP", streams=streams)
+             for i in range(1, num_up + 1)]
         self.elevators_down = \
             [Elevator
-             .Elevator(env, i, self.floors, 1, num_up+num_down, direction="DOWN") for i in range(1, num_down + 1)]
+             .Elevator(env, i, self.floors, 1, num_up+num_down, direction="DOWN", streams=streams)
+             for i in range(1, num_down + 1)]
     
     def __str__(self):
         """
@@ -48,10 +54,18 @@ class ElevatorSystem(object):
         """Returns type of elevator algorithm implemented"""
         return "Otis"
 
+    def get_elevators(self) -> list:
+        """Returns all elevators in the system, UP elevators first."""
+        return self.elevators_up + self.elevators_down
+
+    def has_pending_calls(self) -> bool:
+        """Returns True if any floor has a call that no elevator has accepted yet."""
+        return self.calls.has_unaccepted_up_calls() or self.calls.has_unaccepted_down_calls()
+
     def print_system_status(self) -> str:
         """Returns a string representation number of active elevators."""
-        num_active_up = len(list(filter(lambda x: x.is_busy(), self.elevators_up)))
-        num_active_down = len(list(filter(lambda x: x.is_busy(), self.elevators_down)))
+        num_active_up = sum(1 for elevator in self.elevators_up if elevator.is_busy())
+        num_active_down = sum(1 for elevator in self.elevators_down if elevator.is_busy())
         return f"Elevator system has {num_active_up} UP and {num_active_down} DOWN elevator(s) ACTIVE"
 
     def is_all_idle(self) -> bool:
@@ -61,40 +75,28 @@ class ElevatorSystem(object):
 
     def allocate_landing_call(self) -> None:
         """Handles a landing call from a person who wants to go down."""
-        if all(map(lambda x: x.is_call_down_accepted(), filter(lambda x: x.has_call_down(), self.floors))):
+        if not self.calls.has_unaccepted_down_calls():
             return None
-        if not all(map(lambda x: x.is_busy(), self.elevators_down)):
-            list_of_elevators = sorted(self.elevators_down, key=lambda x: x.get_current_floor(), reverse=True)
-            chosen_index = 0
-            elevator = list_of_elevators[chosen_index]
-            while elevator.is_busy():
-                chosen_index += 1
-                elevator = list_of_elevators[chosen_index]
-            for floor in self.floors:
-                if floor.is_call_down_accepted():
-                    continue
-                elif floor.has_call_down():
-                    elevator.add_path(floor.get_floor_level())
-                    floor.accept_down_call()
+        idle_elevators = [elevator for elevator in self.elevators_down if not elevator.is_busy()]
+        if len(idle_elevators) > 0:
+            # the idle elevator on the highest floor, the first one listed if several are on that floor
+            elevator = max(idle_elevators, key=lambda x: x.get_current_floor())
+            for floor_level in self.calls.get_unaccepted_down_floors():
+                elevator.add_path(floor_level)
+                self.floors[floor_level - 1].accept_down_call()
 
     def allocate_rising_call(self) -> None:
         """Handles a rising call from a person who wants to go up."""
-        if all(map(lambda x: x.is_call_up_accepted(), filter(lambda x: x.has_call_up(), self.floors))):
+        if not self.calls.has_unaccepted_up_calls():
             return None
-        if not all(map(lambda x: x.is_busy(), self.elevators_up)):
-            list_of_elevators = sorted(self.elevators_up, key=lambda x: x.get_current_floor(), reverse=False)
-            chosen_index = 0
-            elevator = list_of_elevators[chosen_index]
-            while elevator.is_busy():
-                chosen_index += 1
-                elevator = list_of_elevators[chosen_index]
+        idle_elevators = [elevator for elevator in self.elevators_up if not elevator.is_busy()]
+        if len(idle_elevators) > 0:
+            # the idle elevator on the lowest floor, the first one listed if several are on that floor
+            elevator = min(idle_elevators, key=lambda x: x.get_current_floor())
             elevator.set_busy()
-            for floor in self.floors:
-                if floor.is_call_up_accepted():
-                    continue
-                elif floor.has_call_up():
-                    elevator.add_path(floor.get_floor_level())
-                    floor.accept_up_call()
+            for floor_level in self.calls.get_unaccepted_up_floors():
+                elevator.add_path(floor_level)
+                self.floors[floor_level - 1].accept_up_call()
 
     def update_status(self) -> None:
         """Updates the elevators to be idle when they have no path."""
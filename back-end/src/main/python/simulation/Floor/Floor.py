@@ -1,25 +1,31 @@
 import simpy
+from src.main.python.simulation.CallRegistry import CallRegistry
+from src.main.python.simulation.Floor.WaitingQueue import WaitingQueue
 
 class Floor(object):
-    """A class representing a floor in a building."""
-    def __init__(self, env: simpy.Environment, index: int):
+    """
+    A class representing a floor in a building. Persons waiting on the floor are kept in one queue per direction,
+    in ascending arrival time, since persons are placed on the floor as they arrive.
+    """
+    def __init__(self, env: simpy.Environment, index: int, calls: CallRegistry = None):
         """
         Initialize the floor with the given index.
 
         Args:
             env (simpy.Environment): The simulation environment.
             index (int): The index of the floor.
+            calls (CallRegistry): The registry holding the call flags of every floor of the building, a registry of
+                its own if not given.
         """
         self.env = env
         self.floor_index = index
-        self.call_up = False
-        self.call_down = False
-        self.call_up_accepted = False
-        self.call_down_accepted = False
+        self.calls = calls if calls is not None else CallRegistry(index)
         self.total_people_arrived = 0
         self.people_arrival_rate = 0
         self.idling_elevators_deserved = 0
         self.idling_elevators_sent = 0
+        self.going_up_persons = WaitingQueue()
+        self.going_down_persons = WaitingQueue()
        
     def __str__(self):
         """
@@ -30,6 +36,43 @@ class Floor(object):
         """
         return f"Floor {self.floor_index}"
 
+    # call flags are stored in the building's CallRegistry
+    @property
+    def call_up(self) -> bool:
+        return bool(self.calls.call_up[self.floor_index - 1])
+
+    @call_up.setter
+    def call_up(self, value):
+        self.calls.call_up[self.floor_index - 1] = value
+
+    @property
+    def call_down(self) -> bool:
+        return bool(self.calls.call_down[self.floor_index - 1])
+
+    @call_down.setter
+    def call_down(self, value):
+        self.calls.call_down[self.floor_index - 1] = value
+
+    @property
+    def call_up_accepted(self) -> bool:
+        return bool(self.calls.call_up_accepted[self.floor_index - 1])
+
+    @call_up_accepted.setter
+    def call_up_accepted(self, value):
+        self.calls.call_up_accepted[self.floor_index - 1] = value
+
+    @property
+    def call_down_accepted(self) -> bool:
+        return bool(self.calls.call_down_accepted[self.floor_index - 1])
+
+    @call_down_accepted.setter
+    def call_down_accepted(self, value):
+        self.calls.call_down_accepted[self.floor_index - 1] = value
+
+    def get_call_registry(self) -> CallRegistry:
+        """Returns the CallRegistry holding the call flags of the floor."""
+        return self.calls
+
     def has_call_down(self) -> bool:
         """Returns the call_down flag."""
         return self.call_down
@@ -54,6 +97,46 @@ class Floor(object):
         """Set the call_down flag to False."""
         self.call_down = False
 
+    def get_queue(self, direction) -> WaitingQueue:
+        """Returns the queue of persons waiting to go in the given direction, "UP" or "DOWN"."""
+        return self.going_up_persons if direction == "UP" else self.going_down_persons
+
+    def add_person(self, person) -> None:
+        """
+        Adds a person who just arrived to the back of the queue for their direction.
+
+        Args:
+            person (Person): The person who wants to use the elevator system.
+        """
+        self.get_queue(person.get_direction()).append(person)
+
+    def remove_arrived_persons(self, direction) -> list:
+        """
+        Pops the persons at the front of the queue who have arrived by the current simulation time.
+
+        Args:
+            direction (str): "UP" or "DOWN".
+        Returns:
+            List[Person]: The persons removed, in ascending arrival time.
+        """
+        queue = self.get_queue(direction)
+        now = self.env.now
+        arrived = []
+        while len(queue) != 0 and queue[0].get_arrival_time() <= now:
+            arrived.append(queue.popleft())
+        return arrived
+
+    def return_persons(self, persons, direction) -> None:
+        """
+        Puts persons who could not board a full elevator back at the front of the queue. They were removed from
+        the front in ascending arrival time, so the queue stays ordered without sorting.
+
+        Args:
+            persons (list of Person): The persons to put back, in ascending arrival time.
+            direction (str): "UP" or "DOWN".
+        """
+        self.get_queue(direction).extendleft(reversed(persons))
+
     def get_floor_level(self) -> int:
         """
         Return the index of the floor.
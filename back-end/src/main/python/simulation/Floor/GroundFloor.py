@@ -1,4 +1,3 @@
-from typing import List
 from src.main.python.simulation.Floor import Floor
 from src.main.python.simulation.HallCall import HallCall
 import simpy
@@ -6,17 +5,17 @@ import simpy
 
 class GroundFloor(Floor):
     """A class representing the ground floor of a building, which is a subclass of the Floor class."""
-    def __init__(self, env: simpy.Environment, index: int):
+    def __init__(self, env: simpy.Environment, index: int, calls=None):
         """
         Initialize the ground floor with the given index.
 
         Args:
             env (simpy.Environment): The simulation environment.
             index (int): The index of the ground floor.
+            calls (CallRegistry): The registry holding the call flags of every floor of the building.
 
         """
-        super().__init__(env, index)
-        self.going_up_persons = []
+        super().__init__(env, index, calls)
 
     def __str__(self):
         """
@@ -44,19 +43,9 @@ class GroundFloor(Floor):
         Returns:
             List[Person]: A list of all persons who want to go up from the ground floor.
         """
-        pointer = []
-        if not self.has_call_up() or self.going_up_persons[0].get_arrival_time() > self.env.now:
-            return pointer
-        else:
-            n = len(self.going_up_persons)
-            count = 0
-            for i in range(n):
-                if self.going_up_persons[i].get_arrival_time() > self.env.now:
-                    break
-                count += 1
-            pointer = self.going_up_persons[:count]
-            self.going_up_persons = self.going_up_persons[count+1:]
-            return pointer
+        if not self.has_call_up():
+            return []
+        return self.remove_arrived_persons("UP")
 
     def get_all_persons_going_up(self) -> list:
         """
@@ -66,10 +55,6 @@ class GroundFloor(Floor):
         """
         return self.going_up_persons
             
-    def sort(self) -> None:
-        """Sorts the list of Persons in ascending arrival time."""
-        self.going_up_persons.sort(key=lambda person: person.get_arrival_time())
-
     def update(self, building, elevator_system) -> None:
         """Important to call this method every step of the simulation to update call status of every floor."""
         # Floor will "check" if people have arrived by peeking at the simulation time
@@ -6,16 +6,15 @@ from src.main.python.simulation.HallCall import HallCall
 class SandwichFloor(Floor):
     """A class representing a floor of a building with people going up and down,
     which is a subclass of the Floor class."""
-    def __init__(self, env: simpy.Environment, index: int):
+    def __init__(self, env: simpy.Environment, index: int, calls=None):
         """
         Initialize the sandwich floor with the given index.
         Args:
             env (simpy.Environment): The simulation environment.
             index (int): The index of the sandwich floor.
+            calls (CallRegistry): The registry holding the call flags of every floor of the building.
         """
-        super().__init__(env, index)
-        self.going_up_persons = []
-        self.going_down_persons = []
+        super().__init__(env, index, calls)
 
     def __str__(self):
         """
@@ -52,19 +51,9 @@ class SandwichFloor(Floor):
         Returns:
             List[Person]: A list of all persons who want to go up from the ground floor.
         """
-        pointer = []
-        if not self.has_call_up() or self.going_up_persons[0].get_arrival_time() > self.env.now:
-            return pointer
-        else:
-            n = len(self.going_up_persons)
-            count = 0
-            for i in range(n):
-                if self.going_up_persons[i].get_arrival_time() > self.env.now:
-                    break
-                count += 1
-            pointer = self.going_up_persons[:count]
-            self.going_up_persons = self.going_up_persons[count + 1:]
-            return pointer
+        if not self.has_call_up():
+            return []
+        return self.remove_arrived_persons("UP")
 
     def remove_all_persons_going_down(self) -> list:
         """
@@ -72,20 +61,10 @@ class SandwichFloor(Floor):
         Returns:
             List[Person]: A list of all persons who want to go down from the sandwich floor.
         """
-        pointer = []
-        if not self.has_call_down() or self.going_down_persons[0].get_arrival_time() > self.env.now:
-            return pointer
-        else:
-            n = len(self.going_down_persons)
-            count = 0
-            for i in range(n):
-                if self.going_down_persons[i].get_arrival_time() > self.env.now:
-                    break
-                count += 1
-            pointer = self.going_down_persons[:count]
-            self.going_down_persons = self.going_down_persons[count + 1:]
-            return pointer
-            
+        if not self.has_call_down():
+            return []
+        return self.remove_arrived_persons("DOWN")
+
     def get_all_persons_going_up(self) -> list:
         """
         Returns the list of all persons who want to go up from the sandwich floor
@@ -102,11 +81,6 @@ class SandwichFloor(Floor):
         """
         return self.going_down_persons
     
-    def sort(self) -> None:
-        """Sorts the list of Persons in ascending arrival time."""
-        self.going_up_persons.sort(key=lambda person: person.get_arrival_time())
-        self.going_down_persons.sort(key=lambda person: person.get_arrival_time())
-
     def update(self, building, elevator_system) -> None:
         """Important to call this method every step of the simulation to update call status of every floor."""
         # Floor will "check" if people have arrived by peeking at the simulation time
@@ -5,15 +5,15 @@ import simpy
 
 class TopFloor(Floor):
     """ A class representing the top floor of a building."""
-    def __init__(self, env: simpy.Environment, index: int):
+    def __init__(self, env: simpy.Environment, index: int, calls=None):
         """
         Initialize the top floor with the given index.
         Args:
             env (simpy.Environment): The simulation environment.
             index (int): The index of the Top floor.
+            calls (CallRegistry): The registry holding the call flags of every floor of the building.
         """
-        super().__init__(env, index)
-        self.going_down_persons = []
+        super().__init__(env, index, calls)
 
     def __str__(self):
         """
@@ -39,19 +39,9 @@ class TopFloor(Floor):
         Returns:
             List[Person]: A list of all persons who want to go down from the sandwich floor.
         """
-        pointer = []
-        if not self.has_call_down() or self.going_down_persons[0].get_arrival_time() > self.env.now:
-            return pointer
-        else:
-            n = len(self.going_down_persons)
-            count = 0
-            for i in range(n):
-                if self.going_down_persons[i].get_arrival_time() > self.env.now:
-                    break
-                count += 1
-            pointer = self.going_down_persons[:count]
-            self.going_down_persons = self.going_down_persons[count + 1:]
-            return pointer
+        if not self.has_call_down():
+            return []
+        return self.remove_arrived_persons("DOWN")
 
     def get_all_persons_going_down(self) -> list:
         """
@@ -61,10 +51,6 @@ class TopFloor(Floor):
         """
         return self.going_down_persons
 
-    def sort(self) -> None:
-        """Sorts the list of Persons in ascending arrival time."""
-        self.going_down_persons.sort(key=lambda person: person.get_arrival_time())
-
     def update(self, building, elevator_system) -> None:
         """Important to call this method every step of the simulation to update call status of every floor."""
         # Floor will "check" if people have arrived by peeking at the simulation time
@@ -0,0 +1,108 @@
+from collections import deque
+
+
+class WaitingQueue(object):
+    """
+    A queue of persons waiting on a floor to go in one direction, in ascending arrival time. Aggregates over the
+    waiting persons are kept up to date on every change, so ModernEGCS can compute its cost over every waiting
+    person without iterating the queue.
+
+    Attributes:
+        persons (deque): The persons waiting, in ascending arrival time.
+        version (int): Incremented on every change to the queue.
+        reference_time (float): Arrival time of the first person added since the queue was last empty. Arrival
+            times are summed relative to it to keep the sums small.
+        sum_arrival (float): Sum of the arrival times minus reference_time.
+        sum_arrival_squared (float): Sum of the squared arrival times minus reference_time.
+        destinations (dict): Destination floor -> number of waiting persons going there.
+    """
+    def __init__(self):
+        self.persons = deque()
+        self.version = 0
+        self.reference_time = 0
+        self.sum_arrival = 0.0
+        self.sum_arrival_squared = 0.0
+        self.destinations = {}
+
+    def __len__(self):
+        """Returns the number of persons waiting."""
+        return len(self.persons)
+
+    def __iter__(self):
+        """Iterates over the persons waiting, in ascending arrival time."""
+        return iter(self.persons)
+
+    def __getitem__(self, index):
+        """Returns the person at the given position in the queue."""
+        return self.persons[index]
+
+    def append(self, person) -> None:
+        """Adds a person to the back of the queue."""
+        self.persons.append(person)
+        self.person_added(person)
+
+    def appendleft(self, person) -> None:
+        """Adds a person to the front of the queue."""
+        self.persons.appendleft(person)
+        self.person_added(person)
+
+    def extendleft(self, persons) -> None:
+        """Adds persons to the front of the queue, one at a time, so the last one given ends up first."""
+        for person in persons:
+            self.appendleft(person)
+
+    def popleft(self):
+        """Removes and returns the person at the front of the queue."""
+        person = self.persons.popleft()
+        self.person_removed(person)
+        return person
+
+    def clear(self) -> None:
+        """Removes every person from the queue."""
+        self.persons.clear()
+        self.reset_aggregates()
+        self.version += 1
+
+    def person_added(self, person) -> None:
+        """Adds the person to the aggregates."""
+        if len(self.persons) == 1:
+            self.reset_aggregates()
+            self.reference_time = person.get_arrival_time()
+        offset = person.get_arrival_time() - self.reference_time
+        self.sum_arrival += offset
+        self.sum_arrival_squared += offset * offset
+        destination = person.get_dest_floor()
+        self.destinations[destination] = self.destinations.get(destination, 0) + 1
+        self.version += 1
+
+    def person_removed(self, person) -> None:
+        """Removes the person from the aggregates."""
+        if len(self.persons) == 0:
+            # start again from exact zeros instead of accumulating rounding errors
+            self.reset_aggregates()
+        else:
+            offset = person.get_arrival_time() - self.reference_time
+            self.sum_arrival -= offset
+            self.sum_arrival_squared -= offset * offset
+            destination = person.get_dest_floor()
+            self.destinations[destination] -= 1
+            if self.destinations[destination] == 0:
+                del self.destinations[destination]
+        self.version += 1
+
+    def reset_aggregates(self) -> None:
+        """Resets the aggregates of an empty queue."""
+        self.reference_time = 0
+        self.sum_arrival = 0.0
+        self.sum_arrival_squared = 0.0
+        self.destinations = {}
+
+    def sum_squared_waiting_time(self, time) -> float:
+        """
+        Returns the sum over every waiting person of (time - arrival time) ** 2 in O(1).
+
+        Args:
+            time (float): The time at which the waiting time is evaluated.
+        """
+        offset = time - self.reference_time
+        return len(self.persons) * offset * offset - 2 * offset * self.sum_arrival + self.sum_arrival_squared
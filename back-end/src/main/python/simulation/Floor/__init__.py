@@ -1,3 +1,4 @@
+from src.main.python.simulation.Floor.WaitingQueue import WaitingQueue
 from src.main.python.simulation.Floor.Floor import Floor
 from src.main.python.simulation.Floor.TopFloor import TopFloor
 from src.main.python.simulation.Floor.SandwichFloor import SandwichFloor
@@ -10,6 +10,7 @@ class HallCall(object):
         direction (str): Direction of elevator call,  UP or DOWN.
         registered_time (float): Time when call is registered.
         priority_array (list): Used in calculation of HallCall costs.
+        priority_index (int): Position of the front-most pair in priority_array, pairs before it have been removed.
     """
 
     def __init__(self, env, source_floor, direction):
@@ -28,11 +29,12 @@ class HallCall(object):
             self.direction = "DOWN"
         self.registered_time = self.env.now
         self.priority_array = None
+        self.priority_index = 0
     
     def __str__(self):
         """Returns a string representation of the HallCall object."""
         return f"Hall call from {self.source_floor} with {self.direction} direction. " \
-               f"Priority array: {self.priority_array}"
+               f"Priority array: {self.get_priority_array()}"
     
     def get_source_floor(self) -> int:
         """Returns source floor level."""
@@ -49,35 +51,39 @@ class HallCall(object):
     def set_priority_array(self, array) -> None:
         """Sets the priority array attribute for the HallCall."""
         self.priority_array = array
+        self.priority_index = 0
 
     def get_first_priority_value(self) -> None:
         """Returns the first priority array value for the HallCall,
         which is the additional cost incurred if this hall call is assigned
         to the next best elevator."""
-        return self.priority_array[0][1] if len(self.priority_array) > 0 else -2
+        return self.priority_array[self.priority_index][1] \
+            if self.priority_index < len(self.priority_array) else -2
     
     def get_second_priority_value(self) -> None:
         """Returns the second priority array value for the HallCall,
         which is the additional cost incurred if this hall call is assigned
         to the next best elevator."""
-        return self.priority_array[1][1]
+        return self.priority_array[self.priority_index + 1][1]
     
     def get_current_best_elevator(self) -> None:
         """Returns the index of the current best elevator based on HCPM."""
-        return self.priority_array[0][0]
+        return self.priority_array[self.priority_index][0]
     
     def get_current_second_best_elevator(self) -> None:
         """Returns the index of the current best elevator based on HCPM."""
-        return self.priority_array[1][0]
+        return self.priority_array[self.priority_index + 1][0]
     
     def get_priority_array_length(self) -> None:
         """Returns the current length of the priority array."""
-        return len(self.priority_array)
+        return len(self.priority_array) - self.priority_index
     
     def remove_frontmost_array_pair(self) -> None:
-        """Removes the front-most priority array pair."""
-        self.priority_array = self.priority_array[1:]
+        """Removes the front-most priority array pair by moving the cursor past it."""
+        self.priority_index += 1
     
     def get_priority_array(self) -> None:
-        """Returns the priority array of the hall call"""
-        return self.priority_array
\ No newline at end of file
+        """Returns the remaining pairs of the priority array of the hall call"""
+        if self.priority_array is None:
+            return None
+        return self.priority_array[self.priority_index:]
\ No newline at end of file
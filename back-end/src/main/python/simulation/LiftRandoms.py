@@ -1,18 +1,15 @@
 from enum import Enum
-import pandas as pd
+import bisect
+import csv
+import numpy as np
 import random as rd
 import pathlib
 import os
 
-# changing working directory to file location
-cur_dir = pathlib.Path(__file__).parent.resolve()
-os.chdir(cur_dir)
-
-# initializing proportion csv as Pandas dataframes
-prop1 = pd.read_csv('../../../data/prop1.csv').iloc[:, 1:].sort_values('p', ascending=False)
-prop2 = pd.read_csv('../../../data/prop2.csv').iloc[:, 1:].sort_values('p', ascending=False)
-prop3 = pd.read_csv('../../../data/prop3.csv').iloc[:, 1:].sort_values('p', ascending=False)
-prop4 = pd.read_csv('../../../data/prop4.csv').iloc[:, 1:].sort_values('p', ascending=False)
+# proportion tables are resolved relative to the package, not the working directory
+DATA_DIR = pathlib.Path(__file__).resolve().parents[3] / 'data'
+CACHE_DIR = DATA_DIR / '.cache'
+PROPORTION_FILES = ['prop1.csv', 'prop2.csv', 'prop3.csv', 'prop4.csv']  # off-peak, morning, afternoon, evening
 
 
 class DayPhase(Enum):
@@ -29,15 +26,324 @@ class HourPhase(Enum):
     OFF_PEAK = 4
 
 
+# arrival rate (persons per second) of every day phase and hour phase combination
+RATES = {
+    (DayPhase.MORNING, HourPhase.PEAK): 13/400,
+    (DayPhase.MORNING, HourPhase.POST_PEAK_I): 1/12,
+    (DayPhase.MORNING, HourPhase.POST_PEAK_II): 17/1200,
+    (DayPhase.AFTERNOON, HourPhase.PEAK): 1/24,
+    (DayPhase.AFTERNOON, HourPhase.POST_PEAK_I): 4/75,
+    (DayPhase.AFTERNOON, HourPhase.POST_PEAK_II): 23/900,
+    (DayPhase.EVENING, HourPhase.PEAK): 2/75,
+    (DayPhase.EVENING, HourPhase.POST_PEAK_I): 2/15,
+    (DayPhase.EVENING, HourPhase.POST_PEAK_II): 7/600,
+}
+for day in DayPhase:
+    RATES[(day, HourPhase.OFF_PEAK)] = 13/300
+    RATES[(day, HourPhase.PRE_PEAK)] = 7/600
+
+
+class DayProfile(object):
+    """
+    Breakpoint table describing the phases of the simulated day. Segment i covers the times from boundaries[i]
+    up to boundaries[i+1], the first segment also covers earlier times and the last one all later times.
+    Lookups bisect the boundaries and accept either a scalar or a NumPy array of times.
+
+    Attributes:
+        boundaries (np.ndarray): Start time of every segment in seconds, in ascending order.
+        day_phases (np.ndarray): DayPhase value of every segment.
+        hour_phases (np.ndarray): HourPhase value of every segment.
+        rates (np.ndarray): Arrival rate of every segment, in persons per second.
+        tables (np.ndarray): Index of the proportion table used in every segment, see LiftRandoms.proportion_table.
+    """
+    def __init__(self, boundaries, day_phases, hour_phases, rates=None):
+        """
+        Args:
+            boundaries (array-like): Start time of every segment in seconds, in ascending order.
+            day_phases (array-like): DayPhase (or its value) of every segment.
+            hour_phases (array-like): HourPhase (or its value) of every segment.
+            rates (array-like): Arrival rate of every segment, looked up in RATES if not given.
+        """
+        day_phases = [DayPhase(day) for day in day_phases]
+        hour_phases = [HourPhase(hour) for hour in hour_phases]
+        if rates is None:
+            rates = [RATES[(day, hour)] for day, hour in zip(day_phases, hour_phases)]
+        self.boundaries = np.asarray(boundaries, dtype=float)
+        self.day_phases = np.array([day.value for day in day_phases], dtype=int)
+        self.hour_phases = np.array([hour.value for hour in hour_phases], dtype=int)
+        self.rates = np.asarray(rates, dtype=float)
+        self.tables = np.array([0 if hour == HourPhase.OFF_PEAK else day.value + 1
+                                for day, hour in zip(day_phases, hour_phases)], dtype=int)
+        # python copies for fast scalar lookups
+        self.boundary_list = self.boundaries.tolist()
+        self.phase_list = list(zip(day_phases, hour_phases))
+        self.rate_list = self.rates.tolist()
+        self.table_list = self.tables.tolist()
+        self.schedules = {}  # duration -> ArrivalSchedule
+
+    @classmethod
+    def from_csv(cls, path):
+        """
+        Loads a day profile from a CSV file with columns start (seconds from the start of the simulation),
+        day_phase and hour_phase (names such as MORNING and PEAK) and an optional rate column.
+
+        Args:
+            path (str): Path to the CSV file.
+        """
+        with open(path, newline='') as f:
+            rows = sorted(csv.DictReader(f), key=lambda row: float(row['start']))
+        rates = [float(row['rate']) for row in rows] if len(rows) > 0 and 'rate' in rows[0] else None
+        return cls([float(row['start']) for row in rows], [DayPhase[row['day_phase']] for row in rows],
+                   [HourPhase[row['hour_phase']] for row in rows], rates)
+
+    def segment(self, times):
+        """Returns the index of the segment containing the given time, or an array of indices for an array."""
+        if np.ndim(times) == 0:
+            return max(bisect.bisect_right(self.boundary_list, times) - 1, 0)
+        return np.maximum(np.searchsorted(self.boundaries, times, side='right') - 1, 0)
+
+    def phase(self, times) -> tuple:
+        """Returns (DayPhase, HourPhase) for a scalar time, or arrays of their values for an array of times."""
+        segment = self.segment(times)
+        if np.ndim(times) == 0:
+            return self.phase_list[segment]
+        return self.day_phases[segment], self.hour_phases[segment]
+
+    def rate(self, times):
+        """Returns the arrival rate at the given time(s)."""
+        segment = self.segment(times)
+        return self.rate_list[segment] if np.ndim(times) == 0 else self.rates[segment]
+
+    def table(self, times):
+        """Returns the proportion table index at the given time(s)."""
+        segment = self.segment(times)
+        return self.table_list[segment] if np.ndim(times) == 0 else self.tables[segment]
+
+    def arrival_schedule(self, duration):
+        """
+        Returns the ArrivalSchedule of the profile restricted to [0, duration).
+
+        Args:
+            duration (int): Length of the simulation in seconds.
+        """
+        if duration not in self.schedules:
+            first = self.segment(0)
+            last = self.segment(duration) if duration > self.boundaries[first] else first
+            breakpoints = np.append(self.boundaries[first:last + 1], duration)
+            breakpoints[0] = 0
+            self.schedules[duration] = ArrivalSchedule(breakpoints, self.rates[first:last + 1],
+                                                       self.tables[first:last + 1])
+        return self.schedules[duration]
+
+
+def build_default_profile():
+    """
+    Builds the default day profile starting at 06:00. Every day phase (morning from 06:00, afternoon from 11:45 and
+    evening from 17:45) goes through 10 minutes of peak, 5 minutes of post-peak I, 30 minutes of post-peak II,
+    75 minutes of off-peak and pre-peak until the next day phase.
+    """
+    boundaries, day_phases, hour_phases = [], [], []
+    day_phase_starts = [(0, DayPhase.MORNING), (LiftRandoms.hours_to_seconds(5.75), DayPhase.AFTERNOON),
+                        (LiftRandoms.hours_to_seconds(11.75), DayPhase.EVENING)]
+    hour_phase_offsets = [(0, HourPhase.PEAK), (600, HourPhase.POST_PEAK_I), (900, HourPhase.POST_PEAK_II),
+                          (2700, HourPhase.OFF_PEAK), (LiftRandoms.hours_to_seconds(2), HourPhase.PRE_PEAK)]
+    for day_start, day_phase in day_phase_starts:
+        for offset, hour_phase in hour_phase_offsets:
+            boundaries.append(day_start + offset)
+            day_phases.append(day_phase)
+            hour_phases.append(hour_phase)
+    return DayProfile(boundaries, day_phases, hour_phases)
+
+
+class SourceDestinationSampler(object):
+    """
+    Samples (source, destination) pairs from the proportion tables by inversion on a precomputed cumulative
+    distribution. Same-floor pairs are removed and the remaining proportions renormalised when the sampler is
+    built, which is equivalent to redrawing until source and destination differ.
+    Use get_sampler() for the sampler built from the proportion tables in DATA_DIR.
+
+    Attributes:
+        sources (list of np.ndarray): Source floor of every pair, one array per proportion table.
+        destinations (list of np.ndarray): Destination floor of every pair, one array per proportion table.
+        cumulative (list of np.ndarray): Cumulative probability of every pair, one array per proportion table.
+        num_floors (int): Highest floor of the tables, i.e. the number of floors of the building they describe.
+    """
+    def __init__(self, tables):
+        """
+        Args:
+            tables (list): Proportion tables as (n, 3) arrays or DataFrames with columns Source, Dest and p.
+        """
+        self.sources = []
+        self.destinations = []
+        self.cumulative = []
+        self.pairs = []  # python copies of the above for fast scalar draws
+        self.cumulative_lists = []
+        for table in tables:
+            table = np.asarray(table, dtype=float)
+            table = table[table[:, 0] != table[:, 1]]
+            cumulative = np.cumsum(table[:, 2])
+            cumulative /= cumulative[-1]
+            self.sources.append(table[:, 0].astype(int))
+            self.destinations.append(table[:, 1].astype(int))
+            self.cumulative.append(cumulative)
+            self.pairs.append(list(zip(self.sources[-1].tolist(), self.destinations[-1].tolist())))
+            self.cumulative_lists.append(cumulative.tolist())
+        self.num_floors = int(max(max(sources.max(), destinations.max())
+                                  for sources, destinations in zip(self.sources, self.destinations)))
+
+    def sample(self, table_index, uniform_rv) -> tuple:
+        """
+        Returns the (source, destination) pair for one uniform random variable.
+
+        Args:
+            table_index (int): Index of the proportion table to sample from.
+            uniform_rv (float): Uniform random variable in [0, 1).
+        """
+        pairs = self.pairs[table_index]
+        index = bisect.bisect_right(self.cumulative_lists[table_index], uniform_rv)
+        return pairs[min(index, len(pairs) - 1)]
+
+    def sample_many(self, table_indices, rng) -> tuple:
+        """
+        Draws one (source, destination) pair per entry of table_indices in a single vectorised pass.
+
+        Args:
+            table_indices (np.ndarray): Index of the proportion table to sample from, per draw.
+            rng (np.random.Generator): Source of the uniform random variables.
+        Returns:
+            sources (np.ndarray): Generated source floors.
+            destinations (np.ndarray): Generated destination floors.
+        """
+        table_indices = np.asarray(table_indices)
+        uniform_rvs = rng.random(len(table_indices))
+        sources = np.empty(len(table_indices), dtype=int)
+        destinations = np.empty(len(table_indices), dtype=int)
+        for table_index in range(len(self.cumulative)):
+            mask = table_indices == table_index
+            index = np.searchsorted(self.cumulative[table_index], uniform_rvs[mask], side='right')
+            index = np.minimum(index, len(self.cumulative[table_index]) - 1)
+            sources[mask] = self.sources[table_index][index]
+            destinations[mask] = self.destinations[table_index][index]
+        return sources, destinations
+
+
+def load_proportion_table(path) -> np.ndarray:
+    """
+    Loads the Source, Dest and p columns of a proportion CSV as an (n, 3) array. The parsed table is cached as
+    a .npy file in CACHE_DIR keyed by the CSV's modification time, so editing the CSV invalidates the cache.
+
+    Args:
+        path (str or pathlib.Path): Path to the CSV file.
+    """
+    path = pathlib.Path(path)
+    cache_path = CACHE_DIR / f'{path.stem}-{path.stat().st_mtime_ns}.npy'
+    if cache_path.exists():
+        return np.load(cache_path)
+    table = np.loadtxt(path, delimiter=',', skiprows=1, usecols=(1, 2, 3), ndmin=2)
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        for stale_path in CACHE_DIR.glob(f'{path.stem}-*.npy'):
+            stale_path.unlink()
+        temporary_path = CACHE_DIR / f'{path.stem}.{os.getpid()}.tmp'
+        with open(temporary_path, 'wb') as f:
+            np.save(f, table)
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        pass  # e.g. read-only installation, the CSV is parsed again next time
+    return table
+
+
+sampler = None  # built from the proportion tables on first use, see get_sampler()
+
+
+def get_sampler() -> SourceDestinationSampler:
+    """Returns the shared SourceDestinationSampler, loading the proportion tables in DATA_DIR on first use."""
+    global sampler
+    if sampler is None:
+        sampler = SourceDestinationSampler([load_proportion_table(DATA_DIR / name) for name in PROPORTION_FILES])
+    return sampler
+
+
+def set_proportion_tables(tables) -> None:
+    """
+    Replaces the shared sampler with one built from the given tables without touching disk, e.g. in tests.
+
+    Args:
+        tables (list): Off-peak, morning, afternoon and evening tables, see SourceDestinationSampler.
+    """
+    global sampler
+    sampler = SourceDestinationSampler(tables)
+
+
+class ArrivalSchedule(object):
+    """
+    Piecewise-constant arrival rate schedule of the non-homogeneous Poisson process, stored as breakpoint arrays so
+    that a whole day of arrivals can be generated at once.
+
+    Attributes:
+        breakpoints (np.ndarray): Start time of every segment followed by the end time of the last segment.
+        rates (np.ndarray): Arrival rate of every segment, in persons per second.
+        tables (np.ndarray): Index of the proportion table used in every segment, see LiftRandoms.proportion_table.
+    """
+    def __init__(self, breakpoints, rates, tables):
+        """
+        Args:
+            breakpoints (array-like): Segment start times followed by the end time, in ascending order.
+            rates (array-like): Arrival rate of every segment.
+            tables (array-like): Proportion table index of every segment.
+        """
+        self.breakpoints = np.asarray(breakpoints, dtype=float)
+        self.rates = np.asarray(rates, dtype=float)
+        self.tables = np.asarray(tables, dtype=int)
+
+    def segment(self, times) -> np.ndarray:
+        """Returns the index of the segment containing each of the given times."""
+        return np.clip(np.searchsorted(self.breakpoints, times, side='right') - 1, 0, len(self.rates) - 1)
+
+    def generate(self, rng, limit=None) -> np.ndarray:
+        """
+        Generates sorted arrival times over the whole schedule, by drawing a Poisson number of arrivals per
+        segment and placing them uniformly within the segment.
+
+        Args:
+            rng (np.random.Generator): Source of randomness.
+            limit (int): Maximum number of arrivals, the earliest ones are kept.
+        Returns:
+            np.ndarray: Arrival times in ascending order.
+        """
+        starts = self.breakpoints[:-1]
+        lengths = np.diff(self.breakpoints)
+        counts = rng.poisson(self.rates * lengths)
+        times = np.repeat(starts, counts) + rng.random(counts.sum()) * np.repeat(lengths, counts)
+        times.sort()
+        return times if limit is None else times[:limit]
+
+
 class LiftRandoms:
     """Wrapper class for functions to generate the random variables as required in LiftSim.
-    No attributes.
+
+    Attributes:
+        profile (DayProfile): Day profile used for the arrival rates and proportion tables.
+        sampler (SourceDestinationSampler): Sampler of source and destination floors, None to use get_sampler().
     """
+    def __init__(self, profile=None, sampler=None):
+        """
+        Args:
+            profile (DayProfile): Day profile to use, the module's default_profile if not given.
+            sampler (SourceDestinationSampler): Sampler to use instead of the shared one loaded from DATA_DIR.
+        """
+        self.profile = default_profile if profile is None else profile
+        self.sampler = sampler
+
+    def get_sampler(self) -> SourceDestinationSampler:
+        """Returns the sampler of source and destination floors, loading the shared one if none was given."""
+        return get_sampler() if self.sampler is None else self.sampler
+
     @staticmethod
     def hours_to_seconds(hour):
         return hour * 3600
 
-    def next_arrival_time(self, curr_time, max_lambda=167/900) -> float:
+    def next_arrival_time(self, curr_time, max_lambda=167/900, rng=None) -> float:
         """
         Generates the next arrival time of a rider according to a non-homogeneous Poisson process,
         using the thinning method.
@@ -45,165 +351,120 @@ class LiftRandoms:
         Args: 
             curr_time (float): Current timestamp of the environment in seconds
             max_lambda (float): Default value set to 167/900
+            rng (np.random.Generator): Source of randomness, the global random module if not given.
         
         Returns:
             float: The next arrival time.
         """
-        uniform_rv = rd.uniform(0, 1)
-        arrival_time = curr_time + rd.expovariate(max_lambda)
+        if rng is None:
+            uniform, exponential = rd.random, lambda: rd.expovariate(max_lambda)
+        else:
+            uniform, exponential = rng.random, lambda: rng.exponential(1 / max_lambda)
+        uniform_rv = uniform()
+        arrival_time = curr_time + exponential()
         
         while uniform_rv > (self.thinning_fn(arrival_time)/max_lambda):
-            arrival_time += rd.expovariate(max_lambda)
-            uniform_rv = rd.uniform(0, 1)
+            arrival_time += exponential()
+            uniform_rv = uniform()
             
         return arrival_time
 
-    def thinning_fn(self, x) -> float:
+    def thinning_fn(self, x):
         """
         Helper function for nextArrivalTime to augment the rate parameter of the Exp random variable.
 
         Args:
-            x (float): Proposed arrival time from next_arrival_time.
+            x (float or np.ndarray): Proposed arrival time(s) from next_arrival_time.
         Returns:
-            float: The corresponding rate parameter at the proposed arrival time.
-        """
-        day_phase, hr_phase = self.phase(x)
-
-        # off-peak
-        if hr_phase == HourPhase.OFF_PEAK:
-            return 13/300
-        if hr_phase == HourPhase.PRE_PEAK:
-            return 7/600
-
-        # morning: pre-peak, peak, post-peak1, post-peak2
-        if day_phase == DayPhase.MORNING and hr_phase == HourPhase.PEAK:
-            return 13/400
-        if day_phase == DayPhase.MORNING and hr_phase == HourPhase.POST_PEAK_I:
-            return 1/12
-        if day_phase == DayPhase.MORNING and hr_phase == HourPhase.POST_PEAK_II:
-            return 17/1200
-        
-        # afternoon: pre-peak, peak, post-peak1, post-peak2
-        if day_phase == DayPhase.AFTERNOON and hr_phase == HourPhase.PEAK:
-            return 1/24
-        if day_phase == DayPhase.AFTERNOON and hr_phase == HourPhase.POST_PEAK_I:
-            return 4/75
-        if day_phase == DayPhase.AFTERNOON and hr_phase == HourPhase.POST_PEAK_II:
-            return 23/900
-
-        # evening: pre-peak, peak, post-peak1, post-peak2
-        if day_phase == DayPhase.EVENING and hr_phase == HourPhase.PEAK:
-            return 2/75
-        if day_phase == DayPhase.EVENING and hr_phase == HourPhase.POST_PEAK_I:
-            return 2/15
-        if day_phase == DayPhase.EVENING and hr_phase == HourPhase.POST_PEAK_II:
-            return 7/600
-
-    def generate_source_dest(self, x) -> tuple:
+            float or np.ndarray: The corresponding rate parameter at the proposed arrival time(s).
+        """
+        return self.profile.rate(x)
+
+    def generate_source_dest(self, x, rng=None) -> tuple:
         """
         Generates a random source and destination floor for use in instantiating a Person class,
-        according to data collected (see prop1.csv).
-        Performed by ordered inversion method for discrete random variable simulation.
+        according to data collected (see prop1.csv). Source and destination are always different floors.
+        Performed by inversion on the precomputed SourceDestinationSampler.
 
         Args:
             x (float): Simulation clock timestamp.
+            rng (np.random.Generator): Source of randomness, the global random module if not given.
         
         Returns:
             source (int): Generated source floor for Person instantiation.
             destination (int): Generated destination floor for Person instantiation.
         """
+        uniform_rv = rd.uniform(0, 1) if rng is None else rng.random()
+        return self.get_sampler().sample(self.profile.table(x), uniform_rv)
 
-        day_phase, hr_phase = self.phase(x)
-        uniform_rv = rd.uniform(0, 1)
-        probability = 0
-        index = -1
+    def generate_arrivals(self, duration, limit=None, rng=None, od_rng=None) -> tuple:
+        """
+        Generates a whole day of arrivals at once, vectorised alternative to calling next_arrival_time and
+        generate_source_dest for every person.
 
-        # initialize the correct proportions dataframe (off-peak, morning, evening, etc.)
-        if hr_phase == HourPhase.OFF_PEAK:
-            prop_data = prop1
-        elif day_phase == DayPhase.MORNING:
-            prop_data = prop2
-        elif day_phase == DayPhase.AFTERNOON:
-            prop_data = prop3
-        else:
-            prop_data = prop4
+        Args:
+            duration (int): Length of the simulation in seconds, arrivals fall within [0, duration).
+            limit (int): Maximum number of arrivals, the earliest ones are kept.
+            rng (np.random.Generator): Source of randomness, a new unseeded generator if not given.
+            od_rng (np.random.Generator): Separate source of the source and destination floors, rng if not given.
+        Returns:
+            times (np.ndarray): Arrival times in ascending order.
+            sources (np.ndarray): Source floor of every arrival.
+            destinations (np.ndarray): Destination floor of every arrival.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        schedule = self.profile.arrival_schedule(duration)
+        times = schedule.generate(rng, limit)
+        sources, destinations = self.get_sampler().sample_many(schedule.tables[schedule.segment(times)],
+                                                               rng if od_rng is None else od_rng)
+        return times, sources, destinations
 
-        # ordered sequential inversion method for discrete random variable simulation
-        while uniform_rv > probability:
-            index += 1
-            probability += prop_data.iloc[index, 2]
+    def generate_source_dest_batch(self, times, rng=None) -> tuple:
+        """
+        Vectorised generate_source_dest() for many timestamps at once.
 
-        return tuple(prop_data.iloc[index, 0:2].astype('int'))
+        Args:
+            times (np.ndarray): Simulation clock timestamps.
+            rng (np.random.Generator): Source of randomness, a new unseeded generator if not given.
+        Returns:
+            sources (np.ndarray): Generated source floors.
+            destinations (np.ndarray): Generated destination floors.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        return self.get_sampler().sample_many(self.profile.table(np.asarray(times)), rng)
+
+    def proportion_table(self, x):
+        """
+        Returns the index of the proportion table (off-peak, morning, afternoon or evening) in use at time x.
+
+        Args:
+            x (float or np.ndarray): Simulation clock timestamp(s).
+        """
+        return self.profile.table(x)
 
     @staticmethod
-    def phase(arrival_time) -> tuple:
+    def phase(arrival_time, profile=None) -> tuple:
         """
         Helper function for the thinning method, to determine which part of the day it is in the simulation.
         Args:
-            arrival_time (float): Proposed arrival time from nextArrivalTime.
+            arrival_time (float or np.ndarray): Proposed arrival time(s) from nextArrivalTime.
+            profile (DayProfile): Day profile to look the time up in, the module's default_profile if not given.
         
         Returns:
-            day_phase (int): Integer to represent the time of the day; morning=0, afternoon=1, evening=2.
-            hr_phase (int): Integer to represent the peak-ness of the period;
-                pre-peak=0, peak=1, post-peak1=2, post-peak2=3, off-peak=4.
-        """
-
-        # morning
-        if arrival_time < LiftRandoms.hours_to_seconds(5.75):
-            day_phase = DayPhase.MORNING
-            if arrival_time < LiftRandoms.hours_to_seconds(1.75):
-                hr_phase = HourPhase.PRE_PEAK
-            elif arrival_time < LiftRandoms.hours_to_seconds(2)+300:
-                hr_phase = HourPhase.PEAK
-            elif arrival_time < LiftRandoms.hours_to_seconds(2)+600:
-                hr_phase = HourPhase.POST_PEAK_I
-            elif arrival_time < LiftRandoms.hours_to_seconds(2.5):
-                hr_phase = HourPhase.POST_PEAK_II
-            elif arrival_time < LiftRandoms.hours_to_seconds(3.75):
-                hr_phase = HourPhase.OFF_PEAK
-            elif arrival_time < LiftRandoms.hours_to_seconds(4)+300:
-                hr_phase = HourPhase.PEAK
-            elif arrival_time < LiftRandoms.hours_to_seconds(4)+600:
-                hr_phase = HourPhase.POST_PEAK_I
-            elif arrival_time < LiftRandoms.hours_to_seconds(4.5):
-                hr_phase = HourPhase.POST_PEAK_II
-            else:
-                hr_phase = HourPhase.OFF_PEAK
-        # afternoon
-        elif arrival_time < LiftRandoms.hours_to_seconds(11.75):
-            day_phase = DayPhase.AFTERNOON
-            arrival_time -= LiftRandoms.hours_to_seconds(5.75)
-            if arrival_time < 1200:
-                hr_phase = HourPhase.PEAK
-            elif arrival_time < 1800:
-                hr_phase = HourPhase.POST_PEAK_I
-            elif arrival_time < 2700:
-                hr_phase = HourPhase.POST_PEAK_II
-            elif arrival_time < LiftRandoms.hours_to_seconds(2):
-                hr_phase = HourPhase.OFF_PEAK
-            elif arrival_time < LiftRandoms.hours_to_seconds(2)+1200:
-                hr_phase = HourPhase.PEAK
-            elif arrival_time < LiftRandoms.hours_to_seconds(2)+1800:
-                hr_phase = HourPhase.POST_PEAK_I
-            elif arrival_time < LiftRandoms.hours_to_seconds(2)+2700:
-                hr_phase = HourPhase.POST_PEAK_II
-            else:
-                hr_phase = HourPhase.OFF_PEAK
-        # evening
-        else:
-            day_phase = DayPhase.EVENING
-            arrival_time -= LiftRandoms.hours_to_seconds(11.75)
-
-        # hr phases
-        if arrival_time < 600:
-            hr_phase = HourPhase.PEAK
-        elif arrival_time < 900:
-            hr_phase = HourPhase.POST_PEAK_I
-        elif arrival_time < 2700:
-            hr_phase = HourPhase.POST_PEAK_II
-        elif arrival_time < LiftRandoms.hours_to_seconds(2):
-            hr_phase = HourPhase.OFF_PEAK
-        else:
-            hr_phase = HourPhase.PRE_PEAK
+            day_phase (DayPhase): Time of the day; morning, afternoon or evening.
+            hr_phase (HourPhase): Peak-ness of the period; pre-peak, peak, post-peak1, post-peak2 or off-peak.
+            For an array of times, arrays of the corresponding enum values are returned instead.
+        """
+        return (default_profile if profile is None else profile).phase(arrival_time)
+
+
+default_profile = build_default_profile()
 
-        return day_phase, hr_phase
+
+def set_default_profile(profile) -> None:
+    """
+    Replaces the day profile used by every LiftRandoms created without an explicit profile,
+    e.g. set_default_profile(DayProfile.from_csv('profile.csv')).
+    """
+    global default_profile
+    default_profile = profile
@@ -0,0 +1,98 @@
+import json
+import logging
+import sys
+
+SILENT = logging.CRITICAL + 10
+LEVELS = {
+    'silent': SILENT,
+    'error': logging.ERROR,
+    'warning': logging.WARNING,
+    'info': logging.INFO,
+    'debug': logging.DEBUG,
+}
+
+# Simulation modules log through this logger with %-style arguments, so messages are never formatted
+# unless the level is enabled. Expensive arguments should additionally be guarded with log.isEnabledFor().
+log = logging.getLogger('liftsim')
+log.setLevel(SILENT)
+log.propagate = False
+
+
+class EventSink(object):
+    """
+    Receives structured simulation events. The base class discards everything and is the default sink,
+    callers should check the enabled flag before building the event fields.
+
+    Attributes:
+        enabled (bool): False if emitted events are discarded.
+    """
+    enabled = False
+
+    def emit(self, kind, time, **fields) -> None:
+        """
+        Records one event.
+
+        Args:
+            kind (str): Type of event, e.g. 'board' or 'alight'.
+            time (float): Simulation time of the event.
+            fields: Additional values describing the event.
+        """
+
+    def close(self) -> None:
+        """Flushes and releases any resource held by the sink."""
+
+
+class JsonlEventSink(EventSink):
+    """Writes every event as one JSON object per line to a file."""
+    enabled = True
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Path of the JSONL trace file, overwritten if it exists.
+        """
+        self.file = open(path, 'w')
+
+    def emit(self, kind, time, **fields) -> None:
+        """Writes the event as a single line of JSON."""
+        fields['kind'] = kind
+        fields['time'] = time
+        self.file.write(json.dumps(fields) + '\n')
+
+    def close(self) -> None:
+        """Closes the trace file."""
+        self.file.close()
+
+
+# current event sink, always access it as Logger.events so that configure() takes effect everywhere
+events = EventSink()
+
+
+def configure(level='silent', trace_path=None) -> None:
+    """
+    Configures simulation logging.
+
+    Args:
+        level (str): One of 'silent', 'error', 'warning', 'info' or 'debug'. 'debug' prints every simulation step.
+        trace_path (str): If given, structured events are written to this file as JSONL.
+    """
+    global events
+    log.setLevel(LEVELS[level])
+    if level != 'silent' and len(log.handlers) == 0:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        log.addHandler(handler)
+    events.close()
+    events = JsonlEventSink(trace_path) if trace_path is not None else EventSink()
+
+
+def level() -> str:
+    """Returns the configured level, e.g. to configure a worker process like this one."""
+    return next((name for name, value in LEVELS.items() if value == log.level), 'silent')
+
+
+def close() -> None:
+    """Closes the current event sink and falls back to discarding events."""
+    global events
+    events.close()
+    events = EventSink()
@@ -1,10 +1,24 @@
-import csv
-import json
+import contextlib
+import logging
+import multiprocessing
+import operator
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor, wait
+from functools import partial
 import simpy
-import statistics
 
-import src.main.python.simulation.Building as Building
-from src.main.python.simulation.PersonList import PersonList
+import src.main.python.simulation.Logger as Logger
+from src.main.python.simulation.Logger import log
+from src.main.python.simulation.PersonList import INPUT_FILE, PersonList
+from src.main.python.simulation.RandomStreams import RandomStreams
+from src.main.python.simulation.SimulationRunner import run_simulation, run_simulation_in_worker, simulate_chunks
+
+# start method of the worker processes. run() is called from threads of the API, where a forked child could inherit
+# a lock held by another thread, e.g. of a logging handler, and deadlock on it
+MP_CONTEXT = multiprocessing.get_context('spawn')
+
+OUTPUT_FOLDER = str(pathlib.Path(__file__).resolve().parents[2] / 'out')
 
 class Main(object):
     """
@@ -14,6 +28,9 @@ class Main(object):
         num_up (int): The number of elevators that move upwards.
         num_down (int): The number of elevators that move downwards.
         num_floors (int): The number of floors in the building.
+        lift_algos (list of str): The algorithms simulated by run().
+        weights (tuple): w1, w2 and w3 of the ModernEGCS cost calculation.
+        results (dict): SimulationResult of every algorithm of the last run.
     """
 
     def __init__(self, num_up, num_down, num_floors):
@@ -30,107 +47,128 @@ class Main(object):
         self.num_up = num_up
         self.num_down = num_down
         self.num_floors = num_floors
-        self.building = None
         self.person_list = None
+        self.results = {}
         self.lift_algos = ['Otis', 'ModernEGCS']
+        self.weights = (1, 1, 1)
 
-    def run(self, duration, mode):
+    def run(self, duration, mode, engine='tick', workers=None, seed=None, output_folder=None,
+            person_formats=('csv', 'json'), elevator_formats=('json',), path_to_data=INPUT_FILE, progress=None) -> dict:
         """
-        Runs the simulation for a specified duration.
+        Runs the simulation for a specified duration. The population is generated once, then every algorithm is
+        simulated over an identical copy of it in its own worker process. Results are returned in memory, output
+        files are only streamed while the simulation progresses if an output folder is given. Logging and the trace
+        of structured events are configured once per process with Logger.configure(), not per run, since runs of
+        several threads share them. Worker processes log at the level of this process.
 
         Args:
             duration (float): The duration of the simulation in seconds.
             mode (string): 'default' or 'manual'
+            engine (string): 'tick' steps the building every second, 'event' only steps it when a person arrives
+                or an elevator completes an action.
+            workers (int): Maximum number of worker processes, defaults to one per algorithm up to the number of
+                CPUs. 1 runs every algorithm in this process, as does a configured trace, so that every algorithm
+                writes to the trace file one after the other.
+            seed (int): Seed of the RandomStreams of the run, runs with the same seed are identical. Every
+                algorithm draws the same dwell and travel times. Fresh entropy if None.
+            output_folder (string): Folder receiving output_persons_<algo> and output_elevator_<algo>, e.g.
+                OUTPUT_FOLDER. Nothing is written if None.
+            person_formats (list of string): Formats of the persons files: 'csv', 'json', 'jsonl' or 'col', see
+                OutputWriter.
+            elevator_formats (list of string): Formats of the elevator files, 'json' is the change-only log read
+                with ElevatorLog.from_dict().
+            path_to_data (string or file-like): Riders of the 'manual' mode, see PersonList.initialise().
+            progress (callable): Called with the algorithm and the simulation time it reached while it runs, see
+                run_simulation().
+        Returns:
+            dict: SimulationResult of every algorithm, also kept in results.
         """
-        self.person_list = PersonList(self.env, duration, limit=5000)  # person generated cannot exceed 300
-        self.person_list.initialise(mode=mode)
-        
-        for lift_algo in self.lift_algos:
-            print(f"Running S16 elevator simulation with {lift_algo} algorithm")
-            self.building = Building.Building(self.env, self.num_up, self.num_down, self.num_floors, self.person_list)
-            self.building.initialise(lift_algo)
-            self.env.process(self.building.simulate())
-            while self.env.peek() < duration:
-                self.env.step()
-            self.output_person_to_csv(lift_algo)
-            self.output_person_to_json(lift_algo)
-            self.output_elevator_log_to_json(lift_algo)
-
-            # Additional information to be printed in terminal
-            print('Number of people spawned in advance:', len(self.building.get_all_persons()))
-            print('Number of people served:', self.get_number_of_people_served())
-            print(f"Average waiting time for {lift_algo}: {self.get_average_waiting_time()}")
-
-            self.env = simpy.Environment()
-            self.person_list.reset(self.env)
-
-    def get_average_waiting_time(self):
-        waiting_time = []
-        people = self.person_list.get_person_list()
-        for person in people:
-            if person.has_completed_trip():
-                waiting_time.append(person.get_wait_time())
-
-        if len(waiting_time) == 0:
-            return -1
+        streams = RandomStreams(seed)
+        population = self.generate_population(duration, mode, streams, path_to_data)
+        args = (population, self.num_up, self.num_down, self.num_floors, duration, engine, self.weights, streams.seed)
+        outputs = {'output_folder': output_folder, 'person_formats': person_formats,
+                   'elevator_formats': elevator_formats}
+
+        if workers is None:
+            workers = min(len(self.lift_algos), os.cpu_count() or 1)
+        self.results = {}
+        if workers <= 1 or len(self.lift_algos) <= 1 or Logger.events.enabled:
+            for lift_algo in self.lift_algos:
+                log.info('Running S16 elevator simulation with %s algorithm', lift_algo)
+                self.results[lift_algo] = run_simulation(lift_algo, *args, **outputs, progress=progress)
         else:
-            return statistics.mean(waiting_time)
-
-    def get_number_of_people_served(self):
-        people = self.person_list.get_person_list()
-        return len(list(filter(lambda x: x.has_completed_trip(), people)))
-
-    def output_person_to_csv(self, lift_algo, path='../../out/'):
-        name = 'output_persons_'+lift_algo+'.csv'
-        header = ['curr', 'dest', 'arrival_time', 'end_time', 'wait_time']
-        data = []
-        for person in self.person_list.get_person_list():
-            if person.has_completed_trip():
-                curr = person.get_curr_floor()
-                dest = person.get_dest_floor()
-                arrival_time = person.get_arrival_time()
-                end_time = person.get_end_time()
-                wait_time = person.get_wait_time()
-                data.append([curr, dest, arrival_time, end_time, wait_time])
-        with open(path + name, 'w', encoding='UTF8', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(header)
-            writer.writerows(data)
-
-    def output_person_to_json(self, lift_algo, path='../../out/'):
-        name = 'output_persons_'+lift_algo+'.json'
-        data = []
-        for person in self.person_list.get_person_list():
-            if person.has_completed_trip():
-                curr = int(person.get_curr_floor())
-                dest = int(person.get_dest_floor())
-                arrival_time = float(person.get_arrival_time())
-                end_time = float(person.get_end_time())
-                wait_time = float(person.get_wait_time())
-                data.append({
-                    'curr': curr,
-                    'dest': dest,
-                    'arrival_time': arrival_time,
-                    'end_time': end_time,
-                    'wait_time': wait_time
-                })
-        json_serializable = json.dumps(data, indent=4)
-        with open(path + name, 'w') as f:
-            f.write(json_serializable)
-
-    def output_elevator_log_to_json(self, lift_algo, path='../../out/'):
-        name = 'output_elevator_'+lift_algo+'.json'
-        json_serializable = json.dumps(self.building.to_dict(), indent=4)
-        with open(path + name, 'w') as f:
-            f.write(json_serializable)
-    
-
-# Example ways of running the simulation
-
-# Step 1
-# set up the environment with number of UP elevators, number of DOWN elevators and number of floors"
-Test = Main(num_up=2, num_down=1, num_floors=9)
-
-# Step 2
-# run the simulation by telling it how long to run, e.g. 6800 (from 6 am to 12 am at the same day)
-Test.run(64800, mode='default')
+            log.info('Running S16 elevator simulation with %s in %s processes', ', '.join(self.lift_algos), workers)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=MP_CONTEXT) as executor, \
+                    (MP_CONTEXT.Manager() if progress is not None else contextlib.nullcontext()) as manager:
+                # workers report the simulation time they reached through a shared dictionary
+                reached = None if manager is None else manager.dict()
+                report = None if manager is None else partial(operator.setitem, reached)
+                futures = {lift_algo: executor.submit(run_simulation_in_worker, Logger.level(), lift_algo, *args,
+                                                      **outputs, progress=report)
+                           for lift_algo in self.lift_algos}
+                pending = set(futures.values())
+                while pending:
+                    _, pending = wait(pending, timeout=1)
+                    if reached is not None:
+                        for lift_algo, time in reached.items():
+                            progress(lift_algo, time)
+                self.results = {lift_algo: future.result() for lift_algo, future in futures.items()}
+
+        # Additional information to be printed in terminal
+        for lift_algo in self.lift_algos:
+            if log.isEnabledFor(logging.INFO):
+                log.info('Number of people spawned in advance: %s', self.results[lift_algo].num_spawned)
+                log.info('Number of people served: %s', self.get_number_of_people_served(lift_algo))
+                log.info('Average waiting time for %s: %s', lift_algo, self.get_average_waiting_time(lift_algo))
+        return self.results
+
+    def stream(self, duration, mode, engine='tick', seed=None, path_to_data=INPUT_FILE, chunk_interval=60):
+        """
+        Runs the simulation like run(), in this process, and yields its output in chunks while it progresses.
+        Every algorithm advances by one chunk in turn, so the output of all of them covers the same period of the
+        day at any time. The results are stored in results once every chunk has been consumed.
+
+        Args:
+            duration, mode, engine, seed, path_to_data: See run().
+            chunk_interval (float): Simulated seconds covered by a chunk.
+        Yields:
+            dict: A chunk of one algorithm, see SimulationRunner.simulate_chunks().
+        """
+        streams = RandomStreams(seed)
+        population = self.generate_population(duration, mode, streams, path_to_data)
+        self.results = {}
+        generators = {lift_algo: simulate_chunks(lift_algo, population, self.num_up, self.num_down, self.num_floors,
+                                                 duration, engine, self.weights, streams.seed, chunk_interval)
+                      for lift_algo in self.lift_algos}
+        while generators:
+            for lift_algo, generator in list(generators.items()):
+                try:
+                    yield next(generator)
+                except StopIteration as stop:
+                    self.results[lift_algo] = stop.value
+                    del generators[lift_algo]
+
+    def generate_population(self, duration, mode, streams, path_to_data) -> dict:
+        """Generates the persons of a run, see PersonStore.get_population()."""
+        # person generated cannot exceed 300
+        self.person_list = PersonList(self.env, duration, limit=5000, streams=streams)
+        self.person_list.initialise(mode=mode, path_to_data=path_to_data)
+        return self.person_list.get_store().get_population()
+
+    def get_average_waiting_time(self, lift_algo):
+        return self.results[lift_algo].average_waiting_time
+
+    def get_number_of_people_served(self, lift_algo):
+        return self.results[lift_algo].num_served
+
+
+# Example ways of running the simulation, e.g. python -m src.main.python.simulation.Main from the back-end folder
+if __name__ == '__main__':
+    # Step 1
+    # set up the environment with number of UP elevators, number of DOWN elevators and number of floors"
+    Test = Main(num_up=2, num_down=1, num_floors=9)
+    Logger.configure('info')
+
+    # Step 2
+    # run the simulation by telling it how long to run, e.g. 6800 (from 6 am to 12 am at the same day)
+    Test.run(64800, mode='default', output_folder=OUTPUT_FOLDER)
@@ -1,6 +1,13 @@
+import heapq
 import src.main.python.simulation.Elevator as Elevator
 import src.main.python.simulation.HallCall as HallCall
 import src.main.python.simulation.Building as Building
+import src.main.python.simulation.Logger as Logger
+from src.main.python.simulation.CostMatrix import CostMatrix
+from src.main.python.simulation.Logger import log
+
+# above this many hall calls, priority arrays are computed together with a CostMatrix
+COST_MATRIX_THRESHOLD = 4
 
 
 class ModernEGCS(object):
@@ -12,8 +19,10 @@ class ModernEGCS(object):
         floors (list of Floor): The collection of floors in the building.
         elevators (list of Elevator): The collection of elevators within the building system.
         unassigned_hall_calls (list of two-element tuples): The queue of unassigned hall calls
+        cost_cache (dict): (floor, direction, elevator index) -> (version, cost terms), see
+            calculate_cost2_minus_cost1_efficient()
     """
-    def __init__(self, env, building, collection_floors, num_elevators, w1, w2, w3):
+    def __init__(self, env, building, collection_floors, num_elevators, w1, w2, w3, streams=None):
         """
         Initializes a ModernEGCS.
 
@@ -25,6 +34,7 @@ class ModernEGCS(object):
             w1: w1 for cost calculation in HCPM
             w2: w2 for cost calculation in HCPM
             w3: w3 for cost calculation in HCPM
+            streams (RandomStreams): Source of the dwell and travel times of the elevators.
             reassigning (bool): True if reassign_hall_calls is running, False otherwise.
             calls_backlog (list): List of HallCall objects with empty priority array \
             due to unavailability of elevators serving the direction they want to go 
@@ -33,7 +43,8 @@ class ModernEGCS(object):
         self.env = env
         self.building = building
         self.floors = collection_floors
-        self.elevators = [Elevator.Elevator(env, i, self.floors, 1, num_elevators) for i in range(1, num_elevators + 1)]
+        self.elevators = [Elevator.Elevator(env, i, self.floors, 1, num_elevators, streams=streams)
+                          for i in range(1, num_elevators + 1)]
         self.unassigned_hall_calls = []
         self.w1 = w1
         self.w2 = w2
@@ -41,6 +52,7 @@ class ModernEGCS(object):
         self.reassigning = False
         self.calls_backlog = []
         self.backlog_time_start = None
+        self.cost_cache = {}
 
     def __str__(self):
         """
@@ -61,12 +73,26 @@ class ModernEGCS(object):
         """Returns type of elevator algorithm implemented"""
         return "ModernEGCS"
 
+    def get_elevators(self) -> list:
+        """Returns all elevators in the system."""
+        return self.elevators
+
+    def has_pending_calls(self) -> bool:
+        """Returns True if there are hall calls waiting to be assigned, including backlogged ones."""
+        return len(self.unassigned_hall_calls) > 0 or len(self.calls_backlog) > 0
+
     def add_hall_call(self, hall_call) -> None:
         """Appends a new HallCall to the list of unassigned hall calls."""
         self.unassigned_hall_calls.append(hall_call)
         priority_array = self.create_call_priority_array(hall_call)
         hall_call.set_priority_array(priority_array)
 
+    def add_hall_calls(self, hall_calls) -> None:
+        """Appends several new HallCalls to the list of unassigned hall calls, see create_call_priority_arrays()."""
+        for hall_call, priority_array in zip(hall_calls, self.create_call_priority_arrays(hall_calls)):
+            hall_call.set_priority_array(priority_array)
+        self.unassigned_hall_calls.extend(hall_calls)
+
     def calculate_cost2_minus_cost1_efficient(self, hall_call, elevator):
         """
         Cost1 = w1*sigma i: waiting passengers(WTi^2+RWTi^2) + w2* sigma i: riding passengers(RTi^2) + w3*PC
@@ -76,6 +102,9 @@ class ModernEGCS(object):
         Waiting Passengers = Passengers currently at the floor where elevator is, who will enter at this floor
         Riding Passengers = Passengers that are already inside the elevator, including those who alight at this floor
 
+        The terms that do not depend on the current time are cached until the elevator's dispatch state or the
+        floor's waiting queue changes, and the waiting passengers cost is computed from the queue's aggregates.
+
         Args:
             hall_call: A HallCall object 
             Elevator: An Elevator object, for which cost2-cost1 is being calculated
@@ -83,22 +112,51 @@ class ModernEGCS(object):
         Returns:
             value: cost2_minus_cost1
         """
+        hall_call_floor = hall_call.get_source_floor()
+        hall_call_direction = hall_call.get_direction()
+        waiting_passengers_hallcall = self.floors[hall_call_floor-1].get_queue(hall_call_direction)
+
+        key = (hall_call_floor, hall_call_direction, elevator.get_index())
+        version = (elevator.get_dispatch_state(), waiting_passengers_hallcall.version)
+        cached = self.cost_cache.get(key)
+        if cached is None or cached[0] != version:
+            cached = (version, self.calculate_cost_terms(hall_call_floor, hall_call_direction, elevator,
+                                                         waiting_passengers_hallcall))
+            self.cost_cache[key] = cached
+        if cached[1] is None:
+            return -1
+        floors_til_arrival, riding_passengers_cost, elevator_moving_distance_cost = cached[1]
+
+        # sum of ((now - arrival time) + floors_til_arrival*6)**2 over every waiting passenger
+        waiting_passengers_cost = \
+            waiting_passengers_hallcall.sum_squared_waiting_time(self.env.now + floors_til_arrival*6)
+        cost2_minus_cost1 = \
+            self.w1 * waiting_passengers_cost \
+            + self.w2 * riding_passengers_cost \
+            + self.w3 * elevator_moving_distance_cost
+        return cost2_minus_cost1
+
+    def calculate_cost_terms(self, hall_call_floor, hall_call_direction, elevator, waiting_passengers_hallcall):
+        """
+        Calculates the terms of calculate_cost2_minus_cost1_efficient() that only change with the elevator's dispatch
+        state and the floor's waiting queue.
+
+        Args:
+            hall_call_floor (int): Source floor of the hall call.
+            hall_call_direction (str): Direction of the hall call.
+            elevator (Elevator): The Elevator for which cost2-cost1 is being calculated.
+            waiting_passengers_hallcall (WaitingQueue): The persons waiting for the hall call.
+
+        Returns:
+            tuple: floors_til_arrival, riding_passengers_cost and elevator_moving_distance_cost, or None if the
+            elevator is moving in the opposite direction to the hall call.
+        """
         elevator_curr_floor = elevator.get_current_floor()
         elevator_direction = elevator.get_direction()
         elevator_path = elevator.get_path().copy()
 
-        hall_call_floor = hall_call.get_source_floor()
-        hall_call_direction = hall_call.get_direction()
-        now = self.env.now
-
-        waiting_passengers_cost = 0
         riding_passengers_cost = 0
         elevator_moving_distance_cost = 0
-
-        if hall_call_direction == "UP":
-            waiting_passengers_hallcall = self.floors[hall_call_floor-1].get_all_persons_going_up()
-        else:
-            waiting_passengers_hallcall = self.floors[hall_call_floor-1].get_all_persons_going_down()
         floors_til_arrival = 0
 
         if len(elevator_path) > 0:
@@ -125,18 +183,15 @@ class ModernEGCS(object):
                 if elevator_direction == "NIL":
                     current_elevator_moving_distance = abs(elevator_curr_floor - hall_call_floor)
                 else:
-                    return -1
+                    return None
             elevator_moving_distance_cost = (current_elevator_moving_distance - initial_elevator_moving_distance)
 
-        for person in waiting_passengers_hallcall:
-            waiting_passengers_cost += ((now-person.get_arrival_time()) + floors_til_arrival*6)**2
-            riding_passengers_cost += person.get_riding_time(elevator)**2
-            # assume we can load everyone registered under this HallCall
-        cost2_minus_cost1 = \
-            self.w1 * waiting_passengers_cost \
-            + self.w2 * riding_passengers_cost \
-            + self.w3 * elevator_moving_distance_cost
-        return cost2_minus_cost1
+        # waiting passengers have not boarded, so their riding time only depends on their destination
+        # assume we can load everyone registered under this HallCall
+        for destination_floor, count in waiting_passengers_hallcall.destinations.items():
+            riding_time = elevator.estimate_remaining_riding_time(hall_call_floor, destination_floor)
+            riding_passengers_cost += count * riding_time**2
+        return floors_til_arrival, riding_passengers_cost, elevator_moving_distance_cost
 
     def create_call_priority_array(self, hall_call) -> list:
         """
@@ -167,6 +222,23 @@ class ModernEGCS(object):
             converted_priority_array.append(tup)
         return converted_priority_array
     
+    def create_call_priority_arrays(self, hall_calls) -> list:
+        """
+        Creates the priority arrays of several hall calls. Above COST_MATRIX_THRESHOLD hall calls, the costs of every
+        hall call for every elevator are computed at once with a CostMatrix, which gives the same priority arrays as
+        create_call_priority_array().
+
+        Args:
+            hall_calls (list of HallCall): The hall calls which priority we are evaluating
+        Returns:
+            list: The priority array of every hall call
+        """
+        if len(hall_calls) <= COST_MATRIX_THRESHOLD:
+            return [self.create_call_priority_array(hall_call) for hall_call in hall_calls]
+        cost_matrix = CostMatrix(self.elevators, len(self.floors))
+        costs = cost_matrix.calculate(hall_calls, self.floors, self.env.now, self.w1, self.w2, self.w3)
+        return cost_matrix.priority_arrays(costs)
+
     def assign_calls(self) -> None:
         """Assigns hall call to the most suitable elevator based on HCPM method."""
         if self.backlog_time_start is not None and self.env.now - self.backlog_time_start >= 15:
@@ -174,11 +246,16 @@ class ModernEGCS(object):
             self.backlog_time_start = None
             self.calls_backlog = []
         if len(self.unassigned_hall_calls) > 0:
-            while len(self.unassigned_hall_calls) > 1:
-                self.unassigned_hall_calls.sort(key=lambda x: x.get_first_priority_value(), reverse=True)
-                prioritised_hall_call = self.unassigned_hall_calls.pop(0)
-                priority_array = prioritised_hall_call.get_priority_array()
-                if len(priority_array) == 0:
+            # Max-heap on the first priority value. Ties go to the call that was queued first, and a call that is
+            # queued again goes behind the others, exactly like a stable sort of the list followed by pop(0).
+            queue = [(-hall_call.get_first_priority_value(), seq, hall_call)
+                     for seq, hall_call in enumerate(self.unassigned_hall_calls)]
+            heapq.heapify(queue)
+            seq = len(queue)
+            self.unassigned_hall_calls = []
+            while len(queue) > 1:
+                prioritised_hall_call = heapq.heappop(queue)[2]
+                if prioritised_hall_call.get_priority_array_length() == 0:
                     new_array = self.create_call_priority_array(prioritised_hall_call)
                     if len(new_array) > 0:
                         prioritised_hall_call.set_priority_array(new_array)
@@ -197,7 +274,9 @@ class ModernEGCS(object):
                     
                     if prioritised_hall_call.get_priority_array_length() > 1 :
                         prioritised_hall_call.remove_frontmost_array_pair()
-                        self.unassigned_hall_calls.append(prioritised_hall_call)
+                        heapq.heappush(queue, (-prioritised_hall_call.get_first_priority_value(), seq,
+                                               prioritised_hall_call))
+                        seq += 1
                         continue
                     else:
                         self.calls_backlog.append(prioritised_hall_call)
@@ -207,11 +286,9 @@ class ModernEGCS(object):
                 else:
                     self.assign_one_call(prioritised_hall_call, current_best_elevator)
                 
-            if len(self.unassigned_hall_calls) == 1:
-                last_hall_call = self.unassigned_hall_calls.pop(0)
-                self.unassigned_hall_calls = [] #reset list
-                priority_array = last_hall_call.get_priority_array()
-                if len(priority_array) > 0:
+            if len(queue) == 1:
+                last_hall_call = queue.pop()[2]
+                if last_hall_call.get_priority_array_length() > 0:
                     best_elevator_index = last_hall_call.get_current_best_elevator()
                     best_elevator = self.elevators[best_elevator_index-1]
                     source_floor = last_hall_call.get_source_floor()
@@ -251,34 +328,47 @@ class ModernEGCS(object):
                 floor.accept_up_call()
             else:
                 floor.accept_down_call()
-            print(f"Hall call from {hall_call_floor} going {hall_call_direction} is assigned to {elevator.index}")
+            log.debug('Hall call from %s going %s is assigned to %s',
+                      hall_call_floor, hall_call_direction, elevator.index)
+            if Logger.events.enabled:
+                Logger.events.emit('assign', self.env.now, floor=hall_call_floor, direction=hall_call_direction,
+                                   elevator=elevator.index)
         else:
             self.calls_backlog.append(hall_call)
             if self.backlog_time_start is None:
                 self.backlog_time_start = self.env.now
-            print(f"Hall call from {hall_call_floor} going {hall_call_direction} COULD NOT be assigned to {elevator.index} so it is reevaluated")
+            log.debug('Hall call from %s going %s COULD NOT be assigned to %s so it is reevaluated',
+                      hall_call_floor, hall_call_direction, elevator.index)
 
 
-    def update_status(self) -> None:
+    def update_status(self, redistribute=True) -> None:
         """Updates the elevators to be idle when they have no path.
-        Reassigns hall calls and moves idle elevators to busier floors at every hour"""
+        Reassigns hall calls and moves idle elevators to busier floors every 300 seconds.
+
+        Args:
+            redistribute (bool): False when the caller schedules redistribute() itself, as in the event-driven engine.
+        """
         for elevator in self.elevators:
             if len(elevator.path) == 0 and elevator.is_busy():
                 elevator.set_idle("ModernEGCS")
 
-        if self.env.now % 300 == 0:
-            self.reassign_hall_calls()
-            for elevator in self.elevators:
-                if elevator.is_busy():
-                    continue
-                busiest_floor_level = self.building.get_busiest_floor()
-                busiest_floor = self.floors[busiest_floor_level-1]
-                idling_elevators_deserved = busiest_floor.get_num_idling_elevators_deserved()
-                idling_elevators_sent = busiest_floor.get_num_idling_elevators_sent()
-                if idling_elevators_deserved >= idling_elevators_sent + 1:
-                    busiest_floor.new_idling_elevator_sent()
-                    elevator.add_path(busiest_floor_level)
-                    elevator.unset_direction()
+        if redistribute and self.env.now % 300 == 0:
+            self.redistribute()
+
+    def redistribute(self) -> None:
+        """Reassigns hall calls and sends idle elevators to the busiest floor."""
+        self.reassign_hall_calls()
+        for elevator in self.elevators:
+            if elevator.is_busy():
+                continue
+            busiest_floor_level = self.building.get_busiest_floor()
+            busiest_floor = self.floors[busiest_floor_level-1]
+            idling_elevators_deserved = busiest_floor.get_num_idling_elevators_deserved()
+            idling_elevators_sent = busiest_floor.get_num_idling_elevators_sent()
+            if idling_elevators_deserved >= idling_elevators_sent + 1:
+                busiest_floor.new_idling_elevator_sent()
+                elevator.add_path(busiest_floor_level)
+                elevator.unset_direction()
                 
     
     def recalculate_priority_array(self)-> None:
@@ -324,8 +414,7 @@ class ModernEGCS(object):
         
         to_recalculate = self.unassigned_hall_calls + unserved_calls
         self.unassigned_hall_calls = []
-        for call in to_recalculate:
-            self.add_hall_call(call)
+        self.add_hall_calls(to_recalculate)
         self.assign_calls()
         self.reassigning = False
         
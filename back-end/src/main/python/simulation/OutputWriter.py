@@ -0,0 +1,252 @@
+import csv
+import json
+import os
+import struct
+import numpy as np
+
+COLUMNAR_MAGIC = b'LIFTCOL1'
+TABLES_MAGIC = b'LIFTTAB1'
+
+
+class OutputWriter(object):
+    """
+    Writes rows to a file as they are produced, so that the memory used does not grow with the number of rows.
+    Subclasses implement one file format.
+
+    Attributes:
+        path (str): Path of the output file, overwritten if it exists.
+        columns (list of tuple): (name, NumPy dtype string) of every column, in the order of the rows.
+    """
+    extension = None
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = columns
+        self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, row) -> None:
+        """
+        Writes one row.
+
+        Args:
+            row (tuple): One Python value per column.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flushes and closes the file."""
+        self.file.close()
+
+
+class CsvWriter(OutputWriter):
+    """Writes a header line, then one comma separated line per row."""
+    extension = 'csv'
+
+    def __init__(self, path, columns):
+        super().__init__(path, columns)
+        self.file = open(path, 'w', encoding='UTF8', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([name for name, _ in columns])
+
+    def write(self, row) -> None:
+        self.writer.writerow(row)
+
+
+class JsonlWriter(OutputWriter):
+    """Writes one JSON object per line and row."""
+    extension = 'jsonl'
+
+    def __init__(self, path, columns):
+        super().__init__(path, columns)
+        self.file = open(path, 'w')
+        self.names = [name for name, _ in columns]
+
+    def write(self, row) -> None:
+        self.file.write(json.dumps(dict(zip(self.names, row))) + '\n')
+
+
+class JsonWriter(OutputWriter):
+    """Writes a single JSON array of objects without indentation, loadable with json.load()."""
+    extension = 'json'
+
+    def __init__(self, path, columns):
+        super().__init__(path, columns)
+        self.file = open(path, 'w')
+        self.names = [name for name, _ in columns]
+        self.file.write('[')
+        self.separator = ''
+
+    def write(self, row) -> None:
+        self.file.write(self.separator + json.dumps(dict(zip(self.names, row))))
+        self.separator = ', '
+
+    def close(self) -> None:
+        self.file.write(']')
+        self.file.close()
+
+
+class ColumnarWriter(OutputWriter):
+    """
+    Writes rows in a compact binary columnar format, read back with read_columnar(). The file starts with
+    COLUMNAR_MAGIC, then the length of a JSON header as a little-endian uint32 followed by the header, which holds
+    the name and dtype of every column. Rows follow in chunks, each made of the number of rows as a uint32 and then
+    every column of the chunk as contiguous little-endian values.
+
+    Attributes:
+        chunk_size (int): Number of rows buffered before a chunk is written.
+    """
+    extension = 'col'
+
+    def __init__(self, path, columns, chunk_size=4096):
+        super().__init__(path, columns)
+        self.chunk_size = chunk_size
+        self.rows = []
+        self.file = open(path, 'wb')
+        header = json.dumps({'columns': [[name, np.dtype(dtype).newbyteorder('<').str] for name, dtype in columns]})
+        self.file.write(COLUMNAR_MAGIC + struct.pack('<I', len(header)) + header.encode())
+
+    def write(self, row) -> None:
+        self.rows.append(row)
+        if len(self.rows) == self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the buffered rows as one chunk."""
+        if len(self.rows) == 0:
+            return
+        self.file.write(struct.pack('<I', len(self.rows)))
+        for values, (_, dtype) in zip(zip(*self.rows), self.columns):
+            self.file.write(np.asarray(values, dtype=np.dtype(dtype).newbyteorder('<')).tobytes())
+        self.rows = []
+
+    def close(self) -> None:
+        self.flush()
+        self.file.close()
+
+
+class BufferWriter(OutputWriter):
+    """Keeps the rows in memory until they are drained, e.g. to stream them while the simulation runs."""
+
+    def __init__(self, columns):
+        super().__init__(None, columns)
+        self.rows = []
+
+    def write(self, row) -> None:
+        self.rows.append(row)
+
+    def drain(self) -> list:
+        """Returns the rows written since the last call and forgets them."""
+        rows, self.rows = self.rows, []
+        return rows
+
+    def close(self) -> None:
+        self.rows = []
+
+
+WRITERS = {writer.extension: writer for writer in [CsvWriter, JsonlWriter, JsonWriter, ColumnarWriter]}
+
+
+def open_writers(folder, name, formats, columns) -> list:
+    """
+    Opens one writer per format, writing to name.<extension> in folder.
+
+    Args:
+        folder (str): Output folder.
+        name (str): File name without extension, e.g. 'output_persons_Otis'.
+        formats (list of str): Extensions of WRITERS, e.g. ['csv', 'json'].
+        columns (list of tuple): (name, NumPy dtype string) of every column.
+    """
+    unknown = set(formats) - set(WRITERS)
+    if unknown:
+        raise ValueError(f"Unknown output formats: {sorted(unknown)}")
+    return [WRITERS[extension](os.path.join(folder, f'{name}.{extension}'), columns) for extension in formats]
+
+
+def read_columnar(path) -> dict:
+    """
+    Reads a file written by ColumnarWriter.
+
+    Args:
+        path (str): Path of the file.
+    Returns:
+        dict: NumPy array of every column.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(COLUMNAR_MAGIC):
+        raise ValueError(f"{path} is not a columnar output file")
+    offset = len(COLUMNAR_MAGIC)
+    (header_length,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    columns = json.loads(data[offset:offset + header_length])['columns']
+    offset += header_length
+    chunks = {name: [] for name, _ in columns}
+    while offset < len(data):
+        (num_rows,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        for name, dtype in columns:
+            values = np.frombuffer(data, dtype=dtype, count=num_rows, offset=offset)
+            chunks[name].append(values)
+            offset += values.nbytes
+    return {name: np.concatenate(values) if values else np.array([], dtype=dtype)
+            for (name, dtype), values in zip(columns, chunks.values())}
+
+
+def pack_tables(tables, meta=None) -> bytes:
+    """
+    Packs named tables of NumPy columns into one buffer, decoded with unpack_tables() or by the front-end without
+    copying. The buffer starts with TABLES_MAGIC, then the length of a JSON header as a little-endian uint32 followed
+    by the header, padded so that the columns start on a multiple of 8 bytes. The header holds meta and, for every
+    table, its number of rows and the name, little-endian dtype and offset from the start of the columns of every
+    column. Every column is aligned on 8 bytes, so it can be viewed as a typed array directly.
+
+    Args:
+        tables (dict): Name -> dict of the NumPy array of every column, all of the same length.
+        meta (dict): JSON serialisable values describing the tables.
+    Returns:
+        bytes: The packed tables.
+    """
+    header = {'meta': meta or {}, 'tables': {}}
+    buffers = []
+    offset = 0
+    for name, columns in tables.items():
+        columns = {column: np.ascontiguousarray(values, dtype=np.asarray(values).dtype.newbyteorder('<'))
+                   for column, values in columns.items()}
+        num_rows = len(next(iter(columns.values()))) if columns else 0
+        header['tables'][name] = {'rows': num_rows, 'columns': []}
+        for column, values in columns.items():
+            header['tables'][name]['columns'].append([column, values.dtype.str, offset])
+            padding = -values.nbytes % 8
+            buffers.append(values.tobytes() + bytes(padding))
+            offset += values.nbytes + padding
+    encoded = json.dumps(header, separators=(',', ':')).encode()
+    encoded += b' ' * (-(len(TABLES_MAGIC) + 4 + len(encoded)) % 8)
+    return b''.join([TABLES_MAGIC, struct.pack('<I', len(encoded)), encoded] + buffers)
+
+
+def unpack_tables(data) -> tuple:
+    """
+    Decodes the output of pack_tables(), the columns are read-only views on data.
+
+    Args:
+        data (bytes): The packed tables.
+    Returns:
+        tuple: Name -> dict of the NumPy array of every column, and the meta dictionary.
+    """
+    if not data.startswith(TABLES_MAGIC):
+        raise ValueError("Not a packed tables buffer")
+    (header_length,) = struct.unpack_from('<I', data, len(TABLES_MAGIC))
+    start = len(TABLES_MAGIC) + 4
+    header = json.loads(data[start:start + header_length])
+    start += header_length
+    tables = {}
+    for name, table in header['tables'].items():
+        tables[name] = {column: np.frombuffer(data, dtype=dtype, count=table['rows'], offset=start + offset)
+                        for column, dtype, offset in table['columns']}
+    return tables, header['meta']
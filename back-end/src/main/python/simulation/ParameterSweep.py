@@ -0,0 +1,275 @@
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import pandas as pd
+
+from src.main.python.simulation.LiftRandoms import get_sampler
+from src.main.python.simulation.Logger import log
+from src.main.python.simulation.ReplicationRunner import ConfidenceInterval, ReplicationRunner, \
+    generate_population, run_replication
+
+CONFIG_COLUMNS = ['lift_algo', 'num_up', 'num_down', 'num_floors', 'w1', 'w2', 'w3']
+WEIGHT_COLUMNS = ['w1', 'w2', 'w3']
+MAXIMISED = ['throughput', 'served']  # every other statistic is better when smaller
+
+
+def run_cell(config, seed, population, duration, engine) -> dict:
+    """
+    Simulates one configuration over the population of one seed and returns a row of the results table.
+
+    Args:
+        config (dict): Value of every column of CONFIG_COLUMNS, the weights are None for Otis.
+        seed (int): Seed of the replication.
+        population (dict): The population of the seed, see ReplicationRunner.generate_population().
+        duration (float): The duration of the simulation in seconds.
+        engine (str): 'tick' or 'event', see Main.run().
+    """
+    weights = (1, 1, 1) if config['w1'] is None else (config['w1'], config['w2'], config['w3'])
+    summary = run_replication(config['lift_algo'], seed, config['num_up'], config['num_down'], config['num_floors'],
+                              duration, engine, weights=weights, population=population)
+    return dict(config, **summary)
+
+
+class ParameterSweep(object):
+    """
+    Evaluates every configuration of a parameter grid over several seeded replications in a process pool. Every
+    configuration is simulated over the same population for a given seed. Finished cells are appended to a JSONL
+    checkpoint so that an interrupted sweep resumes where it stopped, and configurations that are clearly worse than
+    one with no more elevators can be pruned.
+
+    The persons are generated from the proportion tables of LiftRandoms, which describe the trips of one building,
+    so num_floors cannot be swept: it must be the number of floors of the tables.
+
+    Attributes:
+        grid (dict): List of values of every column of CONFIG_COLUMNS, missing columns take the default values.
+        duration (float): The duration of every replication in seconds.
+        seeds (list of int): Seed of every replication, see ReplicationRunner.seeds().
+        engine (str): 'tick' or 'event', see Main.run().
+        limit (int): Maximum number of persons generated per replication.
+        checkpoint_path (str): Optional JSONL file of finished cells.
+        pruned (dict): Key of every pruned configuration -> number of replications when it was pruned.
+    """
+    defaults = {'lift_algo': ['Otis', 'ModernEGCS'], 'num_up': [2], 'num_down': [1], 'num_floors': [9],
+                'w1': [1], 'w2': [1], 'w3': [1]}
+
+    def __init__(self, grid, duration=64800, replications=5, base_seed=0, engine='tick', limit=5000,
+                 checkpoint_path=None):
+        unknown = set(grid) - set(CONFIG_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+        self.grid = dict(self.defaults, **grid)
+        num_floors = get_sampler().num_floors
+        if list(self.grid['num_floors']) != [num_floors]:
+            raise ValueError(f"The persons are generated for the {num_floors} floors of the proportion tables, "
+                             f"num_floors={self.grid['num_floors']} cannot be simulated")
+        self.duration = duration
+        self.seeds = ReplicationRunner.seeds(base_seed, replications)
+        self.engine = engine
+        self.limit = limit
+        self.checkpoint_path = checkpoint_path
+        self.populations = {}
+        self.pruned = {}
+
+    @staticmethod
+    def key(config) -> str:
+        """
+        Returns a string identifying the configuration, used to match checkpointed cells. The weights are compared as
+        floats, so that e.g. 1 and 1.0 give the same key.
+        """
+        return json.dumps([float(config[column]) if column in WEIGHT_COLUMNS and config[column] is not None
+                           else config[column] for column in CONFIG_COLUMNS])
+
+    def configurations(self) -> list:
+        """Returns every distinct configuration of the grid. Otis ignores the weights, so they are set to None."""
+        configurations = {}
+        for values in itertools.product(*(self.grid[column] for column in CONFIG_COLUMNS)):
+            config = dict(zip(CONFIG_COLUMNS, values))
+            if config['lift_algo'] != 'ModernEGCS':
+                config.update(w1=None, w2=None, w3=None)
+            else:
+                config.update({column: float(config[column]) for column in WEIGHT_COLUMNS})
+            configurations.setdefault(self.key(config), config)
+        return list(configurations.values())
+
+    def get_population(self, seed) -> dict:
+        """Returns the population of a seed, generated once and shared by every configuration."""
+        if seed not in self.populations:
+            self.populations[seed] = generate_population(seed, self.duration, self.limit)
+        return self.populations[seed]
+
+    def load_checkpoint(self) -> list:
+        """Returns the rows of the checkpoint, if any."""
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return []
+        with open(self.checkpoint_path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def prune(self, rows, configurations, num_replications, statistic, confidence) -> None:
+        """
+        Prunes every configuration whose confidence interval of the statistic is entirely worse than that of another
+        configuration with the same number of floors and no more elevators, over the first replications.
+
+        Args:
+            rows (dict): (configuration key, seed) -> row of every finished cell.
+            configurations (list of dict): The configurations still being evaluated.
+            num_replications (int): Number of replications, finished for every configuration, to compare.
+            statistic (str): The statistic of ReplicationRunner.STATISTICS to compare.
+            confidence (float): Confidence level of the intervals.
+        """
+        sign = -1 if statistic in MAXIMISED else 1
+        intervals = {}
+        for config in configurations:
+            key = self.key(config)
+            values = [sign * rows[key, seed][statistic] for seed in self.seeds[:num_replications]]
+            intervals[key] = ConfidenceInterval(values, confidence)
+        for config in configurations:
+            key = self.key(config)
+            num_elevators = config['num_up'] + config['num_down']
+            for other in configurations:
+                other_key = self.key(other)
+                if other_key != key and other_key not in self.pruned \
+                        and other['num_floors'] == config['num_floors'] \
+                        and other['num_up'] + other['num_down'] <= num_elevators \
+                        and intervals[other_key].upper() < intervals[key].lower():
+                    log.info('Pruned %s after %s replications, dominated by %s', key, num_replications, other_key)
+                    self.pruned[key] = num_replications
+                    break
+
+    def run(self, workers=None, prune_after=None, statistic='mean_wait', confidence=0.95, callback=None):
+        """
+        Runs every cell of the sweep that is not in the checkpoint yet.
+
+        Args:
+            workers (int): Maximum number of worker processes, defaults to the number of CPUs. 1 runs every cell in
+                this process.
+            prune_after (int): Number of replications after which dominated configurations are pruned, never if
+                None. Pruning only looks at replications finished by every remaining configuration, so it does
+                not depend on the order in which cells finish.
+            statistic (str): The statistic of ReplicationRunner.STATISTICS compared when pruning.
+            confidence (float): Confidence level of the intervals compared when pruning.
+            callback (callable): Called with every new row as soon as its cell finishes.
+        Returns:
+            pd.DataFrame: The results table, one row per configuration and seed.
+        """
+        configurations = self.configurations()
+        self.pruned = {}
+        rows = {(self.key(row), row['seed']): row for row in self.load_checkpoint()}
+        tasks = [(config, seed) for seed in self.seeds for config in configurations]
+        checkpoint = open(self.checkpoint_path, 'a') if self.checkpoint_path is not None else None
+        num_compared = 0
+
+        def compare_finished_replications():
+            """Prunes over every replication that all remaining configurations have finished since the last call."""
+            nonlocal num_compared
+            remaining = [config for config in configurations if self.key(config) not in self.pruned]
+            while num_compared < len(self.seeds) and \
+                    all((self.key(config), self.seeds[num_compared]) in rows for config in remaining):
+                num_compared += 1
+                if num_compared >= max(prune_after, 2):
+                    self.prune(rows, remaining, num_compared, statistic, confidence)
+                    remaining = [config for config in remaining if self.key(config) not in self.pruned]
+
+        def collect(row):
+            """Stores and checkpoints a finished cell, then prunes once a new replication is complete."""
+            rows[self.key(row), row['seed']] = row
+            if checkpoint is not None:
+                checkpoint.write(json.dumps(row) + '\n')
+                checkpoint.flush()
+            if callback is not None:
+                callback(row)
+            if prune_after is not None:
+                compare_finished_replications()
+
+        def pending_tasks():
+            """Yields the cells still to run, skipping the configurations pruned in the meantime."""
+            for config, seed in tasks:
+                if (self.key(config), seed) not in rows and self.key(config) not in self.pruned:
+                    yield config, seed, self.get_population(seed)
+
+        if prune_after is not None:
+            compare_finished_replications()  # replays pruning over the checkpointed cells
+
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        try:
+            if workers <= 1:
+                for config, seed, population in pending_tasks():
+                    collect(run_cell(config, seed, population, self.duration, self.engine))
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    pending = set()
+                    remaining = pending_tasks()
+                    while True:
+                        # keep every worker busy with at most one queued cell each
+                        for config, seed, population in remaining:
+                            pending.add(executor.submit(run_cell, config, seed, population, self.duration,
+                                                        self.engine))
+                            if len(pending) >= 2 * workers:
+                                break
+                        if len(pending) == 0:
+                            break
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            collect(future.result())
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+
+        return pd.DataFrame([rows[self.key(config), seed] for config, seed in tasks
+                             if (self.key(config), seed) in rows])
+
+    def summary(self, table, statistic='mean_wait', confidence=0.95) -> pd.DataFrame:
+        """
+        Aggregates the results table per configuration.
+
+        Args:
+            table (pd.DataFrame): Output of run().
+            statistic (str): The statistic to aggregate.
+            confidence (float): Confidence level of the intervals.
+        Returns:
+            pd.DataFrame: One row per configuration with the mean and confidence interval half width of the
+            statistic, the number of replications and whether the configuration was pruned.
+        """
+        summaries = []
+        for values, group in table.groupby(CONFIG_COLUMNS, dropna=False, sort=False):
+            config = {column: (None if pd.isna(value) else value) for column, value in zip(CONFIG_COLUMNS, values)}
+            interval = ConfidenceInterval(group[statistic].tolist(), confidence)
+            summaries.append(dict(config, mean=interval.mean, half_width=interval.half_width, n=interval.n,
+                                  pruned=self.key(config) in self.pruned))
+        return pd.DataFrame(summaries)
+
+
+def main(argv=None) -> None:
+    """Command line interface of ParameterSweep, see --help."""
+    parser = argparse.ArgumentParser(description='Sweeps elevator configurations over seeded replications.')
+    parser.add_argument('--lift-algo', nargs='+', default=ParameterSweep.defaults['lift_algo'])
+    parser.add_argument('--num-up', nargs='+', type=int, default=ParameterSweep.defaults['num_up'])
+    parser.add_argument('--num-down', nargs='+', type=int, default=ParameterSweep.defaults['num_down'])
+    parser.add_argument('--w1', nargs='+', type=float, default=ParameterSweep.defaults['w1'])
+    parser.add_argument('--w2', nargs='+', type=float, default=ParameterSweep.defaults['w2'])
+    parser.add_argument('--w3', nargs='+', type=float, default=ParameterSweep.defaults['w3'])
+    parser.add_argument('--duration', type=float, default=64800)
+    parser.add_argument('--replications', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0, help='base seed of the replications')
+    parser.add_argument('--engine', choices=['tick', 'event'], default='tick')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--prune-after', type=int, default=None)
+    parser.add_argument('--statistic', default='mean_wait')
+    parser.add_argument('--checkpoint', default=None, help='JSONL file of finished cells, resumed if it exists')
+    parser.add_argument('--output', default=None, help='CSV file receiving the results table')
+    args = parser.parse_args(argv)
+
+    grid = {'lift_algo': args.lift_algo, 'num_up': args.num_up, 'num_down': args.num_down,
+            'w1': args.w1, 'w2': args.w2, 'w3': args.w3}
+    sweep = ParameterSweep(grid, args.duration, args.replications, args.seed, args.engine,
+                           checkpoint_path=args.checkpoint)
+    table = sweep.run(args.workers, args.prune_after, args.statistic)
+    if args.output is not None:
+        table.to_csv(args.output, index=False)
+    print(sweep.summary(table, args.statistic).to_string(index=False))
+
+
+# e.g. python -m src.main.python.simulation.ParameterSweep --num-up 1 2 3 --checkpoint sweep.jsonl from the back-end
+if __name__ == '__main__':
+    main()
@@ -1,52 +1,84 @@
-import src.main.python.simulation.LiftRandoms as LiftRandoms
+import math
 from src.main.python.simulation.Elevator import Elevator
+from src.main.python.simulation.PersonStore import WAITING, RIDING, COMPLETED
 
 
 class Person(object):
-    """A person in the building.
+    """A person in the building, stored as a lightweight view on one row of a PersonStore.
     Attributes:
+        store (PersonStore): The population store holding the person's data.
+        row (int): The index of the person in the store.
         id (int): The unique identifier of the person.
         curr_floor (int): The floor where the person is currently located.
         destination_floor (int): The floor where the person wants to go.
         arrival_time (float): The time when the person arrives in the building.
-        end_time (float): The time when the person completes their trip.
-        has_reached_floor (bool): Whether the person has reached their destination floor.
+        elevator_arrival_time (float): The time when the person entered an elevator, None if they have not.
+        end_time (float): The time when the person completes their trip, None if they have not.
     """
-    def __init__(self, env, index, arrival_time):
+    __slots__ = ('store', 'row')
+
+    def __init__(self, store, row):
         """Initializes a new Person object.
         Args:
-            env (simpy.Environment): The simulation environment.
-            index (int): The unique identifier of the person.
-            arrival_time (float): Time person spawns.
-        """
-        self.id = index
-        self.env = env
-        self.arrival_time = arrival_time
-        self.elevator_arrival_time = None  # time taken for the elevator to reach the person,
-        # i.e. for the person's hall call to be answered
-        self.end_time = None 
-        self.curr_floor, self.destination_floor = LiftRandoms.LiftRandoms().generate_source_dest(self.arrival_time)
-        self.has_reached_floor = False
-        while self.curr_floor == self.destination_floor:
-            self.curr_floor, self.destination_floor = LiftRandoms.LiftRandoms().generate_source_dest(self.arrival_time)
+            store (PersonStore): The population store holding the person's data.
+            row (int): The index of the person in the store.
+        """
+        self.store = store
+        self.row = row
 
     def __str__(self):
         """Returns a string representation of the Person object."""
         return f"Person {self.id}"
-    
+
+    @property
+    def env(self):
+        return self.store.env
+
+    @property
+    def id(self) -> int:
+        return int(self.store.id[self.row])
+
+    @property
+    def arrival_time(self) -> float:
+        return float(self.store.arrival_time[self.row])
+
+    @property
+    def curr_floor(self) -> int:
+        return int(self.store.source[self.row])
+
+    @property
+    def destination_floor(self) -> int:
+        return int(self.store.destination[self.row])
+
+    @property
+    def elevator_arrival_time(self):
+        # time taken for the elevator to reach the person, i.e. for the person's hall call to be answered
+        time = self.store.boarding_time[self.row]
+        return None if math.isnan(time) else float(time)
+
+    @elevator_arrival_time.setter
+    def elevator_arrival_time(self, time):
+        self.store.boarding_time[self.row] = time
+        self.store.status[self.row] = RIDING
+
+    @property
+    def end_time(self):
+        time = self.store.end_time[self.row]
+        return None if math.isnan(time) else float(time)
+
     def reset(self, new_env):
         """Resets attributes so the same Person can be used in simulation using a different algorithm."""
-        self.env = new_env
-        self.elevator_arrival_time = None  # time taken for the elevator to reach the person,
-        # i.e. for the person's hall call to be answered
-        self.end_time = None 
-        self.has_reached_floor = False
+        self.store.env = new_env
+        self.store.boarding_time[self.row] = math.nan
+        self.store.end_time[self.row] = math.nan
+        self.store.status[self.row] = WAITING
+        self.store.pending = min(self.store.pending, self.row)
 
     def overwrite(self, curr_floor, destination_floor):
         """Overwrites automatic config of Person class."""
-        self.curr_floor = curr_floor
-        self.destination_floor = destination_floor
-    
+        self.store.source[self.row] = curr_floor
+        self.store.destination[self.row] = destination_floor
+
     def get_arrival_time(self):
         """Returns the person's arrival_time attribute."""
         return self.arrival_time
@@ -72,12 +104,11 @@ class Person(object):
         """
         Marks the person's trip as complete.
 
-        This method updates the end_time and has_reached_floor attributes to indicate that the person
+        This method updates the end_time and status of the person in the store to indicate that the person
         has completed their trip.
 
         """
-        self.end_time = time
-        self.has_reached_floor = True
+        self.store.complete_trip(self.row, time)
 
     def has_completed_trip(self) -> bool:
         """
@@ -87,7 +118,7 @@ class Person(object):
             bool: True if the person has completed their trip, False otherwise.
 
         """
-        return self.has_reached_floor
+        return bool(self.store.status[self.row] == COMPLETED)
 
     def get_wait_time(self) -> float:
         """
@@ -149,22 +180,8 @@ class Person(object):
             elevator_arrival_to_now = 0
         else:
             elevator_arrival_to_now = self.env.now-self.get_elevator_arrival_time()
-        assigned_elevator = elevator
-        elevator_remaining_car_calls = assigned_elevator.get_car_calls()
-        elevator_current_floor = assigned_elevator.get_current_floor()
-        person_destination_floor = self.get_dest_floor()
-        person_source_floor = self.get_curr_floor()
-        to_wait_for_reaching_dest=0
-        for floor in elevator_remaining_car_calls:
-            if (floor > person_source_floor) and (floor < person_destination_floor):
-                to_wait_for_reaching_dest += 1
-            if floor >= person_destination_floor:
-                break
-        if assigned_elevator.get_direction() == "DOWN":
-            to_wait_for_reaching_dest = len(elevator_remaining_car_calls) - to_wait_for_reaching_dest - 1
-        
-        estimated_remaining_travel_time = abs(person_destination_floor-elevator_current_floor) * 3.5\
-            + 3.5 * to_wait_for_reaching_dest
+        estimated_remaining_travel_time = elevator.estimate_remaining_riding_time(self.get_curr_floor(),
+                                                                                 self.get_dest_floor())
         time_taken_to_ride = elevator_arrival_to_now + estimated_remaining_travel_time
         return time_taken_to_ride
 
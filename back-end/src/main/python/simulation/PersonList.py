@@ -1,23 +1,31 @@
 import pandas as pd
+import pathlib
 from datetime import datetime
 from src.main.python.simulation.LiftRandoms import LiftRandoms
+from src.main.python.simulation.Logger import log
 from src.main.python.simulation.Person import Person
+from src.main.python.simulation.PersonStore import PersonStore
+
+INPUT_FILE = pathlib.Path(__file__).resolve().parents[2] / 'in' / 'input.json'
 
 
 class PersonList:
     """A class representing a custom list of Person objects that have been pre-generated outside the simulation."""
-    def __init__(self, env, duration_of_simulation, limit=300):
+    def __init__(self, env, duration_of_simulation, limit=300, streams=None):
         """
         Initialize the list of Person objects taking into account the intended simulation duration and limit.
         Args:
             env: simpy.Environment on which simulation is running
             duration_of_simulation (int): duration to simulate.
             limit (int): maximum cap on the number of Person objects that can be generated.
+            streams (RandomStreams): Source of the arrival times and floors of the 'default' mode.
         """
         self.env = env
-        self.list = []
+        self.store = PersonStore(env, [], [], [])
+        self.list = []  # Person views on the rows of the store, in order of arrival
         self.limit = limit
         self.duration_of_simulation = duration_of_simulation
+        self.streams = streams
 
     def __str__(self):
         """
@@ -30,57 +38,73 @@ class PersonList:
         """Returns the length of the list."""
         return len(self.list)
 
-    def initialise(self, mode='default', path_to_data="../../in/input.json"):
+    def initialise(self, mode='default', path_to_data=INPUT_FILE, rng=None):
+        """
+        Generates the Person objects.
+
+        Args:
+            mode (str): 'manual' reads the riders from path_to_data, 'default' generates them randomly.
+            path_to_data (str): JSON file with Source, Destination and Time (HH:MM) of every rider.
+            rng (np.random.Generator): Source of randomness for the 'default' mode, instead of the arrivals and od
+                streams given to the constructor. Unseeded if neither is given.
+        """
         if mode == 'manual':
             df = pd.read_json(path_to_data)
-            person_id = 1
-            for index, row in df.iterrows():
-                curr = row['Source']
-                dest = row['Destination']
+            riders = []
+            for person_id, (index, row) in enumerate(df.iterrows(), start=1):
                 time = row['Time']
                 time_converted = datetime.strptime(time, '%H:%M')
                 start_simulation_time = datetime.strptime("06:00", "%H:%M")
                 time = (time_converted - start_simulation_time).total_seconds()
-                print(time)
-                person = Person(self.env, person_id, time)
-                person.overwrite(curr, dest)
-                self.list.append(person)
-                person_id += 1
-            self.list.sort(key=lambda x: x.get_arrival_time())
+                log.debug('Manual input arriving at %s', time)
+                riders.append((time, row['Source'], row['Destination'], person_id))
+            riders.sort(key=lambda x: x[0])
+            times, sources, destinations, ids = zip(*riders) if riders else ([], [], [], [])
+            self.store = PersonStore(self.env, times, sources, destinations, ids)
         else:
-            time = 0
-            person_id = 1
-            next_arrival_time = LiftRandoms().next_arrival_time(time)
-            for i in range(self.duration_of_simulation):
-                if person_id > self.limit:
-                    # we set a cap on the number of people we want to generate
-                    # this takes precedence over the duration_of_simulation
-                    break
-                time += (next_arrival_time - time)  # update the 'clock'
-                person = Person(self.env, person_id, next_arrival_time)
-                self.list.append(person)
-                # update the variables for next iteration
-                person_id += 1
-                next_arrival_time = LiftRandoms().next_arrival_time(time)
+            # the whole day is generated at once, capped by limit
+            if rng is None and self.streams is not None:
+                times, sources, destinations = LiftRandoms().generate_arrivals(
+                    self.duration_of_simulation, self.limit, self.streams.arrivals, self.streams.od)
+            else:
+                times, sources, destinations = LiftRandoms().generate_arrivals(self.duration_of_simulation,
+                                                                               self.limit, rng)
+            self.store = PersonStore(self.env, times, sources, destinations)
+        self.list = [Person(self.store, row) for row in range(len(self.store))]
+
+    def load(self, population):
+        """
+        Rebuilds the Person objects from the arrays of PersonStore.get_population(), e.g. in another process.
+
+        Args:
+            population (dict): Arrays of id, arrival_time, source and destination, in order of arrival.
+        """
+        self.store = PersonStore.from_population(self.env, population)
+        self.list = [Person(self.store, row) for row in range(len(self.store))]
 
     def reset(self, new_env):
         """Resets the initialisation of PersonList, when switching to a different elevator algorithm."""
         self.env = new_env
-        for person in self.list:
-            person.reset(new_env)
+        self.store.reset(new_env)
 
     def get_person_list(self) -> list:
         """Returns the list."""
         return self.list
 
+    def get_store(self) -> PersonStore:
+        """Returns the PersonStore holding the data of every Person in the list."""
+        return self.store
+
     def get_earliest_arrival_time(self) -> float:
-        """Returns the earliest arrival time among the Persons in the PersonList."""
-        for person in self.list:
-            if not person.has_completed_trip():
-                print(f'{person} arriving at floor {person.get_curr_floor()}, '
-                      f'going to floor {person.get_dest_floor()} has not completed trip')
-                return person.get_arrival_time()
-        return 64800  # end simulation time todo: make this an enum
+        """Returns the earliest arrival time among the Persons in the PersonList who have not completed their trip."""
+        row = self.store.next_pending()
+        if row is None:
+            return 64800  # end simulation time todo: make this an enum
+        person = self.list[row]
+        log.debug('%s arriving at floor %s, going to floor %s has not completed trip',
+                  person, person.get_curr_floor(), person.get_dest_floor())
+        return person.get_arrival_time()
+
     def get(self, index) -> Person:
         """Returns the Person at the specified index"""
         return self.list[index]
@@ -0,0 +1,149 @@
+import numpy as np
+
+# values of PersonStore.status
+WAITING = 0
+RIDING = 1
+COMPLETED = 2
+
+# columns of a completed trip, see PersonStore.completed_trip_arrays() and OutputWriter
+TRIP_COLUMNS = [('curr', 'i2'), ('dest', 'i2'), ('arrival_time', 'f8'), ('end_time', 'f8'), ('wait_time', 'f8')]
+
+
+class PersonStore(object):
+    """
+    Structure-of-arrays store of every Person generated for a simulation. Person objects are lightweight views
+    on one row of the store, so statistics can be computed directly from the arrays.
+
+    Attributes:
+        env (simpy.Environment): The simulation environment.
+        id (np.ndarray): Unique identifier of every person.
+        arrival_time (np.ndarray): Time every person arrives at their source floor.
+        source (np.ndarray): Source floor of every person.
+        destination (np.ndarray): Destination floor of every person.
+        boarding_time (np.ndarray): Time every person entered an elevator, NaN if they have not.
+        end_time (np.ndarray): Time every person reached their destination, NaN if they have not.
+        status (np.ndarray): WAITING, RIDING or COMPLETED.
+        pending (int): Every row before this index has completed its trip.
+        writers (list of OutputWriter): Receive every trip as it completes, see TRIP_COLUMNS.
+    """
+    def __init__(self, env, arrival_times, sources, destinations, ids=None):
+        """
+        Args:
+            env (simpy.Environment): The simulation environment.
+            arrival_times (array-like): Arrival time of every person, in ascending order.
+            sources (array-like): Source floor of every person.
+            destinations (array-like): Destination floor of every person.
+            ids (array-like): Unique identifiers, 1 to n if not given.
+        """
+        self.env = env
+        self.arrival_time = np.asarray(arrival_times, dtype=float)
+        self.source = np.asarray(sources, dtype=int)
+        self.destination = np.asarray(destinations, dtype=int)
+        n = len(self.arrival_time)
+        self.id = np.arange(1, n + 1) if ids is None else np.asarray(ids, dtype=int)
+        self.boarding_time = np.full(n, np.nan)
+        self.end_time = np.full(n, np.nan)
+        self.status = np.full(n, WAITING, dtype=np.int8)
+        self.pending = 0
+        self.writers = []
+
+    @classmethod
+    def from_population(cls, env, population):
+        """
+        Rebuilds a store from the output of get_population(), with no trip completed.
+
+        Args:
+            env (simpy.Environment): The simulation environment.
+            population (dict): Arrays of id, arrival_time, source and destination.
+        Returns:
+            PersonStore: The rebuilt store.
+        """
+        return cls(env, population['arrival_time'], population['source'], population['destination'],
+                   population['id'])
+
+    def get_population(self) -> dict:
+        """Returns the generated persons as arrays, small to serialise e.g. when sending them to another process."""
+        return {
+            'id': self.id,
+            'arrival_time': self.arrival_time,
+            'source': self.source,
+            'destination': self.destination,
+        }
+
+    def __len__(self):
+        """Returns the number of persons in the store."""
+        return len(self.arrival_time)
+
+    def reset(self, new_env) -> None:
+        """Clears every trip outcome, so the same population can be simulated with a different algorithm."""
+        self.env = new_env
+        self.boarding_time.fill(np.nan)
+        self.end_time.fill(np.nan)
+        self.status.fill(WAITING)
+        self.pending = 0
+
+    def complete_trip(self, row, time) -> None:
+        """
+        Marks the trip of the person in the given row as completed and passes it to the writers.
+
+        Args:
+            row (int): Row of the person.
+            time (float): Time the person reached their destination.
+        """
+        self.end_time[row] = time
+        self.status[row] = COMPLETED
+        if self.writers:
+            arrival_time, end_time = self.arrival_time[row].item(), float(time)
+            trip = (self.source[row].item(), self.destination[row].item(), arrival_time, end_time,
+                    end_time - arrival_time)
+            for writer in self.writers:
+                writer.write(trip)
+
+    def next_pending(self):
+        """
+        Returns the row of the earliest arriving person who has not completed their trip, or None if everyone has.
+        Trips only ever complete, so the pending cursor never moves back and each row is skipped at most once.
+        """
+        status = self.status
+        n = len(status)
+        while self.pending < n and status[self.pending] == COMPLETED:
+            self.pending += 1
+        return self.pending if self.pending < n else None
+
+    def completed(self) -> np.ndarray:
+        """Returns a boolean mask of the persons who completed their trip."""
+        return self.status == COMPLETED
+
+    def wait_times(self) -> np.ndarray:
+        """Returns the time taken to complete the trip by every person who completed it."""
+        completed = self.completed()
+        return self.end_time[completed] - self.arrival_time[completed]
+
+    def completed_trips(self) -> dict:
+        """
+        Returns the trips completed so far as columns of Python values, in order of arrival.
+
+        Returns:
+            dict: Lists of curr, dest, arrival_time, end_time and wait_time of every completed trip.
+        """
+        return {name: values.tolist() for name, values in self.completed_trip_arrays().items()}
+
+    def completed_trip_arrays(self) -> dict:
+        """
+        Returns the trips completed so far as NumPy columns with the dtypes of TRIP_COLUMNS, in order of arrival.
+        Arrays are pickled as raw buffers, so they are much cheaper than lists to return from a worker process.
+
+        Returns:
+            dict: Arrays of curr, dest, arrival_time, end_time and wait_time of every completed trip.
+        """
+        completed = self.completed()
+        arrival_time = self.arrival_time[completed]
+        end_time = self.end_time[completed]
+        columns = {
+            'curr': self.source[completed],
+            'dest': self.destination[completed],
+            'arrival_time': arrival_time,
+            'end_time': end_time,
+            'wait_time': end_time - arrival_time,
+        }
+        return {name: columns[name].astype(dtype, copy=False) for name, dtype in TRIP_COLUMNS}
@@ -0,0 +1,68 @@
+import numpy as np
+
+DWELL_TIMES = (2, 5)  # seconds the doors stay open while persons board or alight, inclusive bounds
+TRAVEL_TIMES = (3, 4)  # seconds to travel between adjacent floors, inclusive bounds
+
+
+class VariateBatch(object):
+    """
+    Uniform integer variates drawn from a generator in vectorised batches and handed out one at a time.
+
+    Attributes:
+        rng (np.random.Generator): Generator the batches are drawn from.
+        low (int): Smallest variate.
+        high (int): Largest variate.
+        size (int): Number of variates drawn per batch.
+    """
+    def __init__(self, rng, low, high, size=1024):
+        self.rng = rng
+        self.low = low
+        self.high = high
+        self.size = size
+        self.values = []
+        self.position = 0
+
+    def next(self) -> int:
+        """Returns the next variate, drawing a new batch when the current one is used up."""
+        if self.position == len(self.values):
+            self.values = self.rng.integers(self.low, self.high + 1, self.size).tolist()
+            self.position = 0
+        value = self.values[self.position]
+        self.position += 1
+        return value
+
+
+class RandomStreams(object):
+    """
+    Independent NumPy generators for every source of randomness of a simulation run, spawned from one seed. Two runs
+    with the same seed draw identical arrivals, origin-destination pairs, dwell and travel times, and a change to how
+    often one stream is used does not shift the others, so algorithms can be compared with common random numbers.
+
+    Attributes:
+        seed (int): Entropy of the root SeedSequence, a random one if no seed was given.
+        arrivals (np.random.Generator): Arrival times of the persons.
+        od (np.random.Generator): Source and destination floors of the persons.
+        dwell (VariateBatch): Door dwell times, see DWELL_TIMES.
+        travel (VariateBatch): Travel times between adjacent floors, see TRAVEL_TIMES.
+    """
+    def __init__(self, seed=None, batch_size=1024):
+        """
+        Args:
+            seed (int): Seed of the root SeedSequence, fresh entropy if None.
+            batch_size (int): Number of dwell and travel times drawn at once.
+        """
+        seed_sequence = np.random.SeedSequence(seed)
+        self.seed = seed_sequence.entropy
+        arrivals, od, dwell, travel = [np.random.default_rng(child) for child in seed_sequence.spawn(4)]
+        self.arrivals = arrivals
+        self.od = od
+        self.dwell = VariateBatch(dwell, *DWELL_TIMES, size=batch_size)
+        self.travel = VariateBatch(travel, *TRAVEL_TIMES, size=batch_size)
+
+    def next_dwell_time(self) -> int:
+        """Returns the time in seconds the doors stay open at a stop."""
+        return self.dwell.next()
+
+    def next_travel_time(self) -> int:
+        """Returns the time in seconds to travel to an adjacent floor."""
+        return self.travel.next()
@@ -0,0 +1,296 @@
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+import simpy
+
+from src.main.python.simulation.Logger import log
+from src.main.python.simulation.PersonList import PersonList
+from src.main.python.simulation.RandomStreams import RandomStreams
+from src.main.python.simulation.SimulationRunner import run_simulation
+
+STATISTICS = ['mean_wait', 'p50_wait', 'p95_wait', 'max_wait', 'throughput', 'served']
+
+
+def t_cdf(t, df) -> float:
+    """
+    Returns the cumulative distribution function of Student's t distribution, from the finite series for integer
+    degrees of freedom (Abramowitz and Stegun 26.7.3 and 26.7.4).
+
+    Args:
+        t (float): Value of the t statistic.
+        df (int): Degrees of freedom, at least 1.
+    """
+    theta = math.atan(abs(t) / math.sqrt(df))
+    cos_squared = math.cos(theta) ** 2
+    term, series = 1.0, 1.0
+    if df % 2 == 1:
+        for k in range(1, (df - 1) // 2):
+            term *= 2 * k / (2 * k + 1) * cos_squared
+            series += term
+        central = 2 / math.pi * (theta + (math.sin(theta) * math.cos(theta) * series if df > 1 else 0))
+    else:
+        for k in range(1, df // 2):
+            term *= (2 * k - 1) / (2 * k) * cos_squared
+            series += term
+        central = math.sin(theta) * series
+    return 0.5 + math.copysign(central / 2, t)
+
+
+def t_quantile(p, df) -> float:
+    """
+    Returns the p quantile of Student's t distribution, by bisection of t_cdf().
+
+    Args:
+        p (float): Probability, strictly between 0 and 1.
+        df (int): Degrees of freedom, at least 1.
+    """
+    if p < 0.5:
+        return -t_quantile(1 - p, df)
+    low, high = 0.0, 1.0
+    while t_cdf(high, df) < p:
+        low, high = high, 2 * high
+    for _ in range(100):
+        middle = (low + high) / 2
+        if t_cdf(middle, df) < p:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+class ConfidenceInterval(object):
+    """
+    Student t confidence interval of the mean of independent replications.
+
+    Attributes:
+        mean (float): Sample mean.
+        half_width (float): Half width of the interval, inf with fewer than two values.
+        confidence (float): Confidence level, e.g. 0.95.
+        n (int): Number of values.
+    """
+    def __init__(self, values, confidence=0.95):
+        """
+        Args:
+            values (list of float): One value per replication.
+            confidence (float): Confidence level, e.g. 0.95.
+        """
+        self.n = len(values)
+        self.confidence = confidence
+        self.mean = float(np.mean(values)) if self.n > 0 else math.nan
+        if self.n < 2:
+            self.half_width = math.inf
+        else:
+            std_error = float(np.std(values, ddof=1)) / math.sqrt(self.n)
+            self.half_width = t_quantile(0.5 + confidence / 2, self.n - 1) * std_error
+
+    def __str__(self):
+        return f"{self.mean:.3f} ± {self.half_width:.3f}"
+
+    def lower(self) -> float:
+        return self.mean - self.half_width
+
+    def upper(self) -> float:
+        return self.mean + self.half_width
+
+    def is_precise(self, relative_precision) -> bool:
+        """Returns True if the half width is at most relative_precision times the magnitude of the mean."""
+        return self.half_width <= relative_precision * abs(self.mean)
+
+    def to_dict(self) -> dict:
+        return {'mean': self.mean, 'half_width': self.half_width, 'lower': self.lower(), 'upper': self.upper(),
+                'confidence': self.confidence, 'n': self.n}
+
+
+def generate_population(seed, duration, limit=5000) -> dict:
+    """
+    Generates the persons of one replication, see PersonStore.get_population().
+
+    Args:
+        seed (int): Seed of the RandomStreams of the population.
+        duration (float): The duration of the simulation in seconds.
+        limit (int): Maximum number of persons generated.
+    """
+    person_list = PersonList(simpy.Environment(), duration, limit=limit, streams=RandomStreams(seed))
+    person_list.initialise(mode='default')
+    return person_list.get_store().get_population()
+
+
+def summarise(result, seed, duration) -> dict:
+    """
+    Returns the summary statistics of a SimulationResult, the waiting times are NaN if nobody was served.
+
+    Args:
+        result (SimulationResult): The outcome of the run.
+        seed (int): Seed of the replication.
+        duration (float): The duration of the simulation in seconds.
+    """
+    wait_times = np.asarray(result.trips['wait_time'], dtype=float)
+    if len(wait_times) > 0:
+        p50_wait, p95_wait = np.percentile(wait_times, [50, 95]).tolist()
+        mean_wait, max_wait = float(wait_times.mean()), float(wait_times.max())
+    else:
+        mean_wait = p50_wait = p95_wait = max_wait = math.nan
+    return {
+        'lift_algo': result.lift_algo,
+        'seed': seed,
+        'spawned': result.num_spawned,
+        'served': result.num_served,
+        'throughput': result.num_served * 3600 / duration,
+        'mean_wait': mean_wait,
+        'p50_wait': p50_wait,
+        'p95_wait': p95_wait,
+        'max_wait': max_wait,
+    }
+
+
+def run_replication(lift_algo, seed, num_up, num_down, num_floors, duration, engine='tick', limit=5000,
+                    weights=(1, 1, 1), population=None) -> dict:
+    """
+    Simulates one elevator algorithm over a seeded population, with every source of randomness seeded.
+    Replications with the same seed use the same population, dwell and travel times for every algorithm.
+
+    Args:
+        lift_algo (str): 'Otis' or 'ModernEGCS'.
+        seed (int): Seed of the RandomStreams of the population and of the elevators.
+        num_up, num_down, num_floors, duration, engine: See Main.run().
+        limit (int): Maximum number of persons generated.
+        weights (tuple): w1, w2 and w3 of the ModernEGCS cost calculation.
+        population (dict): The output of generate_population() for this seed, generated here if not given.
+    Returns:
+        dict: Summary statistics of the replication, see summarise().
+    """
+    if population is None:
+        population = generate_population(seed, duration, limit)
+    result = run_simulation(lift_algo, population, num_up, num_down, num_floors, duration, engine, weights, seed)
+    return summarise(result, seed, duration)
+
+
+class ReplicationRunner(object):
+    """
+    Runs independent seeded replications of every elevator algorithm across a process pool, and reports confidence
+    intervals of their summary statistics. Replication i uses the i-th seed spawned from the base seed, so results
+    only depend on the base seed, not on the number of workers or on the order in which replications finish.
+
+    Attributes:
+        num_up (int): The number of elevators that move upwards.
+        num_down (int): The number of elevators that move downwards.
+        num_floors (int): The number of floors in the building.
+        duration (float): The duration of every replication in seconds.
+        lift_algos (list of str): The algorithms to compare.
+        engine (str): 'tick' or 'event', see Main.run().
+        limit (int): Maximum number of persons generated per replication.
+    """
+    def __init__(self, num_up, num_down, num_floors, duration, lift_algos=None, engine='tick', limit=5000):
+        self.num_up = num_up
+        self.num_down = num_down
+        self.num_floors = num_floors
+        self.duration = duration
+        self.lift_algos = ['Otis', 'ModernEGCS'] if lift_algos is None else list(lift_algos)
+        self.engine = engine
+        self.limit = limit
+
+    @staticmethod
+    def seeds(base_seed, num_replications) -> list:
+        """Returns the seed of every replication, derived from the base seed with a NumPy SeedSequence."""
+        return np.random.SeedSequence(base_seed).generate_state(num_replications).tolist()
+
+    def intervals(self, summaries, confidence=0.95) -> dict:
+        """Returns the ConfidenceInterval of every statistic of STATISTICS, for every algorithm."""
+        return {lift_algo: {name: ConfidenceInterval([summary[name] for summary in summaries[lift_algo]],
+                                                     confidence)
+                            for name in STATISTICS}
+                for lift_algo in self.lift_algos}
+
+    def is_precise(self, summaries, statistic, relative_precision, confidence) -> bool:
+        """Returns True if the interval of the statistic meets the precision for every algorithm."""
+        return all(ConfidenceInterval([summary[statistic] for summary in summaries[lift_algo]], confidence)
+                   .is_precise(relative_precision) for lift_algo in self.lift_algos)
+
+    def run(self, base_seed=0, min_replications=5, max_replications=50, relative_precision=0.05, confidence=0.95,
+            statistic='mean_wait', workers=None, callback=None) -> dict:
+        """
+        Runs replications until the confidence interval of the statistic is within the relative precision for every
+        algorithm, or max_replications is reached. Replications are only counted once all those with smaller
+        indices have finished, so the stopping point is reproducible.
+
+        Args:
+            base_seed (int): Seed from which the seed of every replication is derived.
+            min_replications (int): Number of replications run before checking the precision, at least 2.
+            max_replications (int): Maximum number of replications.
+            relative_precision (float): Target half width of the interval, relative to the mean.
+            confidence (float): Confidence level of the intervals.
+            statistic (str): The statistic of STATISTICS whose precision stops the replications.
+            workers (int): Maximum number of worker processes, defaults to the number of CPUs. 1 runs every
+                replication in this process.
+            callback (callable): Called with the summary dict of every replication as soon as it finishes.
+        Returns:
+            dict: 'replications', the number of counted replications, 'converged', True if the precision was met,
+            'summaries', the summaries of every algorithm ordered by replication, and 'intervals', see intervals().
+        """
+        seeds = self.seeds(base_seed, max_replications)
+        tasks = [(index, lift_algo) for index in range(max_replications) for lift_algo in self.lift_algos]
+        finished = {}
+        summaries = {lift_algo: [] for lift_algo in self.lift_algos}
+        num_counted = 0
+        converged = False
+
+        def collect(index, summary):
+            """Stores a finished replication, then returns True once the counted replications are precise."""
+            nonlocal num_counted
+            finished[index, summary['lift_algo']] = summary
+            log.info('Replication %s of %s: mean wait %s', index, summary['lift_algo'], summary['mean_wait'])
+            if callback is not None:
+                callback(summary)
+            while num_counted < max_replications and \
+                    all((num_counted, lift_algo) in finished for lift_algo in self.lift_algos):
+                for lift_algo in self.lift_algos:
+                    summaries[lift_algo].append(finished[num_counted, lift_algo])
+                num_counted += 1
+                if num_counted >= max(min_replications, 2) and \
+                        self.is_precise(summaries, statistic, relative_precision, confidence):
+                    return True
+            return False
+
+        args = (self.num_up, self.num_down, self.num_floors, self.duration, self.engine, self.limit)
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        if workers <= 1:
+            for index, lift_algo in tasks:
+                if collect(index, run_replication(lift_algo, seeds[index], *args)):
+                    converged = True
+                    break
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = {}
+                remaining = iter(tasks)
+                while not converged:
+                    # keep every worker busy with at most one queued task each
+                    for index, lift_algo in remaining:
+                        pending[executor.submit(run_replication, lift_algo, seeds[index], *args)] = index
+                        if len(pending) >= 2 * workers:
+                            break
+                    if len(pending) == 0:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if collect(pending.pop(future), future.result()):
+                            converged = True
+                for future in pending:
+                    future.cancel()
+
+        return {
+            'replications': num_counted,
+            'converged': converged,
+            'summaries': summaries,
+            'intervals': self.intervals(summaries, confidence),
+        }
+
+
+# Example, e.g. python -m src.main.python.simulation.ReplicationRunner from the back-end folder
+if __name__ == '__main__':
+    runner = ReplicationRunner(num_up=2, num_down=1, num_floors=9, duration=64800)
+    replications = runner.run(base_seed=0, relative_precision=0.05)
+    print(f"{replications['replications']} replications, converged: {replications['converged']}")
+    for algo, intervals in replications['intervals'].items():
+        for name, interval in intervals.items():
+            print(f"{algo:>10} {name:>10}: {interval}")
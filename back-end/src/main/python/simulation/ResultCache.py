@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import pathlib
+import threading
+from collections import OrderedDict
+from src.main.python.simulation.LiftRandoms import DATA_DIR
+
+SIMULATION_FOLDER = pathlib.Path(__file__).resolve().parent
+
+
+def code_version(folder=SIMULATION_FOLDER, data_folder=DATA_DIR) -> str:
+    """
+    Returns a hash of the source of the simulation modules and of the data files they read, e.g. the proportion
+    tables, so that cached results are invalidated whenever either changes.
+
+    Args:
+        folder (str): Folder of the simulation modules, searched recursively for .py files.
+        data_folder (str): Folder of the data files, hidden entries such as the .cache folder are skipped.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(pathlib.Path(folder).rglob('*.py')):
+        digest.update(path.relative_to(folder).as_posix().encode())
+        digest.update(path.read_bytes())
+    for path in sorted(pathlib.Path(data_folder).iterdir()):
+        if path.is_file() and not path.name.startswith('.'):
+            digest.update(b'data/' + path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+CODE_VERSION = code_version()
+
+
+def cache_key(**parameters) -> str:
+    """
+    Returns the content address of a simulation request, a SHA-256 hash of its parameters and of CODE_VERSION.
+
+    Args:
+        parameters: JSON serialisable values fully determining the result, e.g. the riders or seed, num_up,
+            num_down, num_floors, the algorithms and the weights.
+    """
+    content = json.dumps([parameters, CODE_VERSION], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class ResultCache(object):
+    """
+    Two-tier cache of serialised simulation results, addressed by cache_key(). The memory tier keeps the most
+    recently used results up to a total size, results evicted from it stay available in the disk tier, which
+    evicts the least recently used files once it exceeds its own size. Safe to use from several threads.
+
+    The folder of the disk tier is created readable by its owner only, and a folder owned by another user is refused,
+    since whoever can write to it chooses the results the cache returns.
+
+    Attributes:
+        memory_size (int): Maximum total size in bytes of the results kept in memory.
+        folder (str): Folder of the disk tier, disabled if None.
+        disk_size (int): Maximum total size in bytes of the files of the disk tier.
+        memory_hits (int): Number of get() calls answered from memory.
+        disk_hits (int): Number of get() calls answered from disk.
+        misses (int): Number of get() calls that found nothing.
+        evictions (int): Number of results removed from the disk tier, or from memory if there is no disk tier.
+    """
+    extension = '.result'
+
+    def __init__(self, memory_size=256 * 2 ** 20, folder=None, disk_size=2 * 2 ** 30):
+        self.memory_size = memory_size
+        self.folder = folder
+        self.disk_size = disk_size
+        self.memory = OrderedDict()  # key -> result, least recently used first
+        self.disk = OrderedDict()  # key -> size of the file, least recently used first
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        if folder is not None:
+            os.makedirs(folder, mode=0o700, exist_ok=True)
+            if hasattr(os, 'getuid'):
+                if os.stat(folder).st_uid != os.getuid():
+                    raise PermissionError(f"The result cache folder {folder} is owned by another user")
+                os.chmod(folder, 0o700)
+            # results of previous processes, the least recently used ones being the least recently modified
+            entries = [entry for entry in os.scandir(folder) if entry.name.endswith(self.extension)]
+            for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+                self.disk[entry.name[:-len(self.extension)]] = entry.stat().st_size
+            self.evict_disk()
+
+    def path(self, key) -> str:
+        """Returns the path of the file of a key in the disk tier."""
+        return os.path.join(self.folder, key + self.extension)
+
+    def get(self, key):
+        """
+        Returns the result stored under the key, or None if it is not cached. A result found on disk is promoted
+        to the memory tier.
+
+        Args:
+            key (str): Output of cache_key().
+        Returns:
+            bytes: The cached result.
+        """
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return self.memory[key]
+            if key in self.disk:
+                try:
+                    with open(self.path(key), 'rb') as f:
+                        result = f.read()
+                    os.utime(self.path(key))
+                except OSError:
+                    del self.disk[key]
+                else:
+                    self.disk.move_to_end(key)
+                    self.disk_hits += 1
+                    self.store_in_memory(key, result)
+                    return result
+            self.misses += 1
+            return None
+
+    def put(self, key, result) -> None:
+        """
+        Stores a result in both tiers.
+
+        Args:
+            key (str): Output of cache_key().
+            result (bytes): The serialised result.
+        """
+        with self.lock:
+            self.store_in_memory(key, result)
+            if self.folder is not None and key not in self.disk and len(result) <= self.disk_size:
+                temporary_path = f'{self.path(key)}.{threading.get_ident()}.tmp'
+                with open(temporary_path, 'wb') as f:
+                    f.write(result)
+                os.replace(temporary_path, self.path(key))
+                self.disk[key] = len(result)
+                self.evict_disk()
+
+    def store_in_memory(self, key, result) -> None:
+        """Adds a result to the memory tier and evicts the least recently used ones beyond memory_size."""
+        if len(result) > self.memory_size:
+            return
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        total_size = sum(len(value) for value in self.memory.values())
+        while total_size > self.memory_size:
+            _, evicted = self.memory.popitem(last=False)
+            total_size -= len(evicted)
+            if self.folder is None:
+                self.evictions += 1
+
+    def evict_disk(self) -> None:
+        """Removes the least recently used files of the disk tier beyond disk_size."""
+        total_size = sum(self.disk.values())
+        while total_size > self.disk_size:
+            key, size = self.disk.popitem(last=False)
+            total_size -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        """Returns the counters and the current size of both tiers."""
+        with self.lock:
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'memory_entries': len(self.memory),
+                'memory_bytes': sum(len(value) for value in self.memory.values()),
+                'disk_entries': len(self.disk),
+                'disk_bytes': sum(self.disk.values()),
+            }
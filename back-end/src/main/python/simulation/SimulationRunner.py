@@ -0,0 +1,193 @@
+import json
+import os
+import numpy as np
+import simpy
+
+import src.main.python.simulation.Building as Building
+import src.main.python.simulation.ElevatorLog as ElevatorLog
+import src.main.python.simulation.Logger as Logger
+from src.main.python.simulation.OutputWriter import BufferWriter, open_writers
+from src.main.python.simulation.PersonList import PersonList
+from src.main.python.simulation.PersonStore import TRIP_COLUMNS
+from src.main.python.simulation.RandomStreams import RandomStreams
+
+
+class SimulationResult(object):
+    """
+    Outcome of one simulation run, kept in memory. It only holds NumPy and typed arrays, which are pickled as raw
+    buffers, so it is cheap to return from a worker process.
+
+    Attributes:
+        lift_algo (str): The elevator algorithm that was simulated.
+        trips (dict): NumPy columns of the completed trips, see PersonStore.completed_trip_arrays().
+        elevator_log (ElevatorLog): The change-only elevator log.
+        num_spawned (int): The number of persons generated for the run.
+        num_served (int): The number of persons that completed their trip.
+        average_waiting_time (float): Mean waiting time of the served persons, -1 if nobody was served.
+    """
+    def __init__(self, lift_algo, trips, elevator_log, num_spawned):
+        """
+        Args:
+            lift_algo (str): The elevator algorithm that was simulated.
+            trips (dict): NumPy columns of the completed trips, see PersonStore.completed_trip_arrays().
+            elevator_log (ElevatorLog): The change-only elevator log, without writers.
+            num_spawned (int): The number of persons generated for the run.
+        """
+        self.lift_algo = lift_algo
+        self.trips = trips
+        self.elevator_log = elevator_log
+        self.num_spawned = num_spawned
+        self.num_served = len(trips['wait_time'])
+        if self.num_served == 0:
+            self.average_waiting_time = -1
+        else:
+            self.average_waiting_time = float(np.mean(trips['wait_time']))
+
+    def trip_rows(self) -> list:
+        """Returns one dictionary of Python values per completed trip, the format of output_persons_<algo>.json."""
+        names = list(self.trips)
+        return [dict(zip(names, row)) for row in zip(*(values.tolist() for values in self.trips.values()))]
+
+
+def build_simulation(lift_algo, population, num_up, num_down, num_floors, duration, engine='tick',
+                     weights=(1, 1, 1), seed=None):
+    """
+    Builds the environment, persons and building of one simulation run and starts the building process.
+
+    Args:
+        lift_algo, population, num_up, num_down, num_floors, duration, engine, weights, seed: See run_simulation().
+    Returns:
+        tuple: The simpy.Environment, PersonList and Building of the run.
+    """
+    env = simpy.Environment()
+    person_list = PersonList(env, duration)
+    person_list.load(population)
+    building = Building.Building(env, num_up, num_down, num_floors, person_list, RandomStreams(seed))
+    building.initialise(lift_algo, weights)
+    if engine == 'event':
+        env.process(building.simulate_events())
+    else:
+        env.process(building.simulate())
+    return env, person_list, building
+
+
+def run_simulation(lift_algo, population, num_up, num_down, num_floors, duration, engine='tick', weights=(1, 1, 1),
+                   seed=None, output_folder=None, person_formats=(), elevator_formats=(), progress=None,
+                   progress_interval=60):
+    """
+    Simulates one elevator algorithm over a generated population, in a fresh simulation environment.
+
+    Args:
+        lift_algo (str): 'Otis' or 'ModernEGCS'.
+        population (dict): The persons to simulate, see PersonStore.get_population().
+        num_up (int): The number of elevators that move upwards.
+        num_down (int): The number of elevators that move downwards.
+        num_floors (int): The number of floors in the building.
+        duration (float): The duration of the simulation in seconds.
+        engine (str): 'tick' or 'event', see Main.run().
+        weights (tuple): w1, w2 and w3 of the ModernEGCS cost calculation.
+        seed (int): Seed of the RandomStreams of the dwell and travel times, runs with the same seed draw the same
+            times. Unseeded if None.
+        output_folder (str): Folder of the output files, nothing is written if None.
+        person_formats (list of str): Formats of output_persons_<lift_algo>, see OutputWriter.WRITERS. Trips are
+            written as they complete.
+        elevator_formats (list of str): Formats of output_elevator_<lift_algo>. Entries are written as they are
+            recorded, except for 'json' which holds the columns of ElevatorLog.to_dict() and is written at the end.
+        progress (callable): Called with lift_algo and the simulation time reached, about every progress_interval
+            simulated seconds.
+        progress_interval (float): Simulated seconds between two calls of progress.
+    Returns:
+        SimulationResult: The outcome of the run.
+    """
+    env, person_list, building = build_simulation(lift_algo, population, num_up, num_down, num_floors, duration,
+                                                  engine, weights, seed)
+    person_writers, elevator_writers = [], []
+    if output_folder is not None:
+        person_writers = open_writers(output_folder, 'output_persons_' + lift_algo, person_formats, TRIP_COLUMNS)
+        elevator_writers = open_writers(output_folder, 'output_elevator_' + lift_algo,
+                                        [extension for extension in elevator_formats if extension != 'json'],
+                                        ElevatorLog.COLUMNS)
+    person_list.get_store().writers = person_writers
+    building.get_log().writers = elevator_writers
+    try:
+        if progress is None:
+            while env.peek() < duration:
+                env.step()
+        else:
+            next_report = 0
+            while env.peek() < duration:
+                env.step()
+                if env.now >= next_report:
+                    progress(lift_algo, env.now)
+                    next_report = env.now + progress_interval
+            progress(lift_algo, duration)
+    finally:
+        for writer in person_writers + elevator_writers:
+            writer.close()
+        person_list.get_store().writers = []
+        building.get_log().writers = []
+    if output_folder is not None and 'json' in elevator_formats:
+        with open(os.path.join(output_folder, 'output_elevator_' + lift_algo + '.json'), 'w') as f:
+            json.dump(building.to_dict(), f)
+    return SimulationResult(lift_algo, person_list.get_store().completed_trip_arrays(), building.get_log(),
+                            len(person_list))
+
+
+def simulate_chunks(lift_algo, population, num_up, num_down, num_floors, duration, engine='tick', weights=(1, 1, 1),
+                    seed=None, chunk_interval=60):
+    """
+    Simulates one elevator algorithm like run_simulation(), pausing every chunk_interval simulated seconds to yield
+    what happened since the previous chunk, so that the output can be sent before the simulation ends.
+
+    Args:
+        lift_algo, population, num_up, num_down, num_floors, duration, engine, weights, seed: See run_simulation().
+        chunk_interval (float): Simulated seconds covered by a chunk.
+    Yields:
+        dict: lift_algo, the simulation time reached, the new entries of the elevator log as columns (see
+        ElevatorLog.COLUMNS) and the trips completed since the previous chunk in order of completion, in the format of
+        SimulationResult.trip_rows().
+    Returns:
+        SimulationResult: The outcome of the run, the value of the StopIteration.
+    """
+    env, person_list, building = build_simulation(lift_algo, population, num_up, num_down, num_floors, duration,
+                                                  engine, weights, seed)
+    trips = BufferWriter(TRIP_COLUMNS)
+    entries = BufferWriter(ElevatorLog.COLUMNS)
+    person_list.get_store().writers = [trips]
+    building.get_log().writers = [entries]
+    trip_names = [name for name, _ in TRIP_COLUMNS]
+    entry_names = [name for name, _ in ElevatorLog.COLUMNS]
+    now = 0
+    while now < duration:
+        now = min(now + chunk_interval, duration)
+        while env.peek() < now:
+            env.step()
+        new_entries = entries.drain()
+        yield {
+            'lift_algo': lift_algo,
+            'time': now,
+            'elevators': {name: [entry[column] for entry in new_entries] for column, name in enumerate(entry_names)},
+            'persons': [dict(zip(trip_names, trip)) for trip in trips.drain()],
+        }
+    person_list.get_store().writers = []
+    building.get_log().writers = []
+    return SimulationResult(lift_algo, person_list.get_store().completed_trip_arrays(), building.get_log(),
+                            len(person_list))
+
+
+def run_simulation_in_worker(log_level, *args, **kwargs):
+    """
+    Entry point of a worker process, configures its logging and calls run_simulation().
+
+    Args:
+        log_level (str): Log level of the worker, see Logger.configure(). Structured traces are not supported in
+            worker processes since every worker would overwrite the same file.
+        args, kwargs: Arguments of run_simulation().
+    Returns:
+        SimulationResult: The outcome of the run.
+    """
+    Logger.configure(log_level)
+    try:
+        return run_simulation(*args, **kwargs)
+    finally:
+        Logger.close()
@@ -0,0 +1,154 @@
+import gzip
+import json
+import pathlib
+import queue
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+from src.main.python.simulation.OutputWriter import unpack_tables
+from src.main.python.simulation.ResultCache import ResultCache
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[4] / 'back-end-docker'))
+import API  # noqa: E402
+
+
+class APITest(unittest.TestCase):
+
+    def setUp(self):
+        # short simulations, and a fresh job list and memory-only cache for every test
+        for name, value in [('DURATION', 1800), ('jobs', {}), ('streams', {}), ('cache', ResultCache())]:
+            patcher = mock.patch.object(API, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = API.app.test_client()
+
+    def block_executor(self):
+        """Occupies every slot of the executor until the returned event is set, so that new jobs stay queued."""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        for _ in range(API.MAX_RUNNING_JOBS):
+            API.executor.submit(release.wait)
+        return release
+
+    def wait_for(self, job_id):
+        for _ in range(600):
+            job = self.client.get(f'/jobs/{job_id}').get_json()
+            if job['status'] in ('done', 'failed'):
+                return job
+            time.sleep(0.1)
+        self.fail(f'Job {job_id} did not finish')
+
+    def test_job_is_queued_polled_and_returned(self):
+        release = self.block_executor()
+        response = self.client.post('/jobs', json={'mode': 'default', 'seed': 1})
+        self.assertEqual(response.status_code, 202)
+        job = response.get_json()
+        self.assertEqual(response.headers['Location'], f"/jobs/{job['id']}")
+        self.assertEqual(job['status'], 'queued')
+        self.assertEqual(self.client.get(f"/jobs/{job['id']}/result").status_code, 409)
+        release.set()
+        self.assertEqual(self.wait_for(job['id'])['status'], 'done')
+        result = self.client.get(f"/jobs/{job['id']}/result")
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(set(result.get_json()), {'Otis', 'ModernEGCS'})
+        self.assertEqual(self.client.get('/jobs/unknown').status_code, 404)
+
+    def test_invalid_requests_are_rejected(self):
+        self.assertEqual(self.client.post('/jobs', json={'mode': 'fast'}).status_code, 400)
+        self.assertEqual(self.client.post('/jobs', json={'mode': 'manual'}).status_code, 400)
+        for seed in ['one', -1, 1.5, True, [1]]:
+            with self.subTest(seed=seed):
+                self.assertEqual(self.client.post('/jobs', json={'seed': seed}).status_code, 400)
+        self.assertEqual(self.client.get('/random?seed=1.5').status_code, 400)
+        self.assertEqual(API.parse_seed('7'), 7)
+
+    def test_full_queue_is_rejected(self):
+        release = self.block_executor()
+        with mock.patch.object(API, 'MAX_QUEUED_JOBS', 1):
+            queued = self.client.post('/jobs', json={'seed': 1})
+            self.assertEqual(queued.status_code, 202)
+            # an identical request joins the queued job instead of being rejected
+            joined = self.client.post('/jobs', json={'seed': 1})
+            self.assertEqual(joined.get_json()['id'], queued.get_json()['id'])
+            self.assertEqual(self.client.post('/jobs', json={'seed': 2}).status_code, 429)
+            self.assertEqual(self.client.get('/stream?seed=2').status_code, 429)
+        release.set()
+        self.wait_for(queued.get_json()['id'])
+
+    def test_seeded_result_is_cached(self):
+        first = self.client.post('/jobs', json={'seed': 3}).get_json()
+        self.wait_for(first['id'])
+        second = self.client.post('/jobs', json={'seed': 3}).get_json()
+        self.assertTrue(second['cached'])
+        self.assertEqual(second['status'], 'done')
+        self.assertEqual(self.client.get(f"/jobs/{second['id']}/result").data,
+                         self.client.get(f"/jobs/{first['id']}/result").data)
+
+    def test_unreadable_cached_result_is_simulated_again(self):
+        first = self.client.post('/jobs', json={'seed': 5}).get_json()
+        self.wait_for(first['id'])
+        job = API.jobs[first['id']]
+        API.cache.put(job.cache_name(API.TABLES_MIMETYPE, 'identity'), b'not packed tables')
+        second = self.client.post('/jobs', json={'seed': 5}).get_json()
+        self.assertFalse(second['cached'])
+        self.assertEqual(self.wait_for(second['id'])['status'], 'done')
+
+    def test_result_representation_is_negotiated(self):
+        job = self.client.post('/jobs', json={'seed': 4}).get_json()
+        self.wait_for(job['id'])
+        url = f"/jobs/{job['id']}/result"
+        plain = self.client.get(url)
+        self.assertEqual(plain.mimetype, 'application/json')
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertEqual(set(plain.vary), {'Accept', 'Accept-Encoding'})
+
+        compressed = self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(compressed.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(compressed.data)), plain.get_json())
+
+        packed = self.client.get(url, headers={'Accept': API.TABLES_MIMETYPE, 'Accept-Encoding': 'gzip'})
+        self.assertEqual(packed.mimetype, API.TABLES_MIMETYPE)
+        tables, meta = unpack_tables(gzip.decompress(packed.data))
+        self.assertEqual(meta['lift_algos'], ['Otis', 'ModernEGCS'])
+        for lift_algo in meta['lift_algos']:
+            persons = plain.get_json()[lift_algo]['Persons']
+            self.assertEqual(len(tables[lift_algo + '/persons']['wait_time']), len(persons))
+            self.assertEqual(tables[lift_algo + '/persons']['wait_time'].tolist(),
+                             [person['wait_time'] for person in persons])
+
+    def test_stream_runs_in_a_spawned_process(self):
+        # the worker imports API afresh, so it only sees the short duration if it is passed along
+        lines = [json.loads(line) for line in self.client.get('/stream?seed=1').data.decode().splitlines()]
+        self.assertEqual(lines[0]['type'], 'start')
+        self.assertEqual(lines[0]['duration'], 1800)
+        self.assertEqual({line['type'] for line in lines[1:-1]}, {'chunk'})
+        self.assertEqual(lines[-1]['type'], 'end')
+        self.assertEqual(set(lines[-1]['summary']), {'Otis', 'ModernEGCS'})
+
+    def test_stream_reads_lines_put_after_a_poll_timeout(self):
+        stream = API.Stream('default', seed=1)
+
+        class LateQueue(queue.Queue):
+            """Times out once, while the worker puts its last lines and exits."""
+            timed_out = False
+
+            def get(self, block=True, timeout=None):
+                if not self.timed_out:
+                    self.timed_out = True
+                    self.put('{"type": "end"}\n')
+                    self.put(None)
+                    stream.finished.set()
+                    raise queue.Empty
+                return super().get(block, timeout)
+
+        stream.chunks = LateQueue()
+        self.assertEqual(list(stream.lines()), ['{"type": "end"}\n'])
+
+        stream.chunks = queue.Queue()
+        self.assertEqual(json.loads(next(stream.lines()))['type'], 'error')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import json
+import pathlib
+import shutil
+import subprocess
+import unittest
+import numpy as np
+from src.main.python.simulation.OutputWriter import pack_tables
+
+TABLES_JS = pathlib.Path(__file__).resolve().parents[5] / 'front-end' / 'LiftSim' / 'static' / 'tables.js'
+
+# decodes the packed tables read from stdin with tables.js, as the page does, and prints them as JSON
+DECODE = """
+const {decodeTables, tableRows} = require(process.argv[1]);
+const chunks = [];
+process.stdin.on('data', chunk => chunks.push(chunk));
+process.stdin.on('end', () => {
+  const data = Buffer.concat(chunks);
+  const buffer = data.buffer.slice(data.byteOffset, data.byteOffset + data.byteLength);
+  const {meta, tables} = decodeTables(buffer);
+  const rows = {};
+  Object.entries(tables).forEach(([name, table]) => { rows[name] = tableRows(table); });
+  console.log(JSON.stringify({meta: meta, rows: rows}));
+});
+"""
+
+
+@unittest.skipIf(shutil.which('node') is None, 'node is needed to run the front-end decoder')
+class TablesDecoderTest(unittest.TestCase):
+
+    def decode(self, data) -> dict:
+        output = subprocess.run(['node', '-e', DECODE, str(TABLES_JS)], input=data, capture_output=True,
+                                check=True)
+        return json.loads(output.stdout)
+
+    def test_front_end_decodes_packed_tables(self):
+        trips = {'curr': np.array([1, 9], dtype='i2'), 'dest': np.array([5, 2], dtype='i2'),
+                 'wait_time': np.array([12.5, 0.25])}
+        elevators = {'time': np.array([0.0, 3.5, 7.0]), 'elevator': np.array([1, 2, 1], dtype='i2'),
+                     'direction': np.array([0, -1, 1], dtype='i1'), 'passengers': np.array([0, 13, 2], dtype='i2')}
+        meta = {'lift_algos': ['Otis'], 'num_floors': 9}
+        decoded = self.decode(pack_tables({'Otis/persons': trips, 'Otis/elevators': elevators}, meta))
+        self.assertEqual(decoded['meta'], meta)
+        self.assertEqual(decoded['rows']['Otis/persons'],
+                         [{'curr': 1, 'dest': 5, 'wait_time': 12.5}, {'curr': 9, 'dest': 2, 'wait_time': 0.25}])
+        self.assertEqual([row['direction'] for row in decoded['rows']['Otis/elevators']], [0, -1, 1])
+        self.assertEqual([row['time'] for row in decoded['rows']['Otis/elevators']], [0.0, 3.5, 7.0])
+
+    def test_front_end_rejects_other_buffers(self):
+        with self.assertRaises(subprocess.CalledProcessError):
+            self.decode(b'NOTTABLES' + bytes(16))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+"""
+Micro-benchmark of ModernEGCS.assign_calls() on synthetic peak-hour bursts of hall calls.
+
+The current heap-based implementation is compared with the previous implementation, which re-sorted the list of
+unassigned hall calls on every iteration and sliced priority arrays. Both are run on identical bursts and must
+produce identical assignments.
+
+Run from the back-end folder with: python -m src.test.python.benchmark.AssignCallsBenchmark
+"""
+import random
+import time
+import simpy
+from src.main.python.simulation.Building import Building
+from src.main.python.simulation.HallCall import HallCall
+from src.main.python.simulation.PersonList import PersonList
+
+NUM_FLOORS = 60
+NUM_ELEVATORS = 8
+BURST_SIZES = [100, 500, 2000]
+
+
+class LegacyHallCall(HallCall):
+    """HallCall that removes the front-most priority array pair by copying the array, as before."""
+    def remove_frontmost_array_pair(self) -> None:
+        self.priority_array = self.priority_array[self.priority_index + 1:]
+        self.priority_index = 0
+
+
+def legacy_assign_calls(self) -> None:
+    """ModernEGCS.assign_calls() before the heap, which sorts the whole list for every call it assigns."""
+    if self.backlog_time_start is not None and self.env.now - self.backlog_time_start >= 15:
+        self.unassigned_hall_calls.extend(self.calls_backlog)
+        self.backlog_time_start = None
+        self.calls_backlog = []
+    if len(self.unassigned_hall_calls) > 0:
+        while len(self.unassigned_hall_calls) > 1:
+            self.unassigned_hall_calls.sort(key=lambda x: x.get_first_priority_value(), reverse=True)
+            prioritised_hall_call = self.unassigned_hall_calls.pop(0)
+            priority_array = prioritised_hall_call.get_priority_array()
+            if len(priority_array) == 0:
+                new_array = self.create_call_priority_array(prioritised_hall_call)
+                if len(new_array) > 0:
+                    prioritised_hall_call.set_priority_array(new_array)
+                else:
+                    self.calls_backlog.append(prioritised_hall_call)
+                    if self.backlog_time_start is None:
+                        self.backlog_time_start = self.env.now
+                    continue
+            current_best_elevator_index = prioritised_hall_call.get_current_best_elevator()
+            current_best_elevator = self.elevators[current_best_elevator_index-1]
+            source_floor = prioritised_hall_call.get_source_floor()
+
+            #if (current_best_elevator.is_busy()) and prioritised_hall_call.get_priority_array_length() > 0:
+            if (current_best_elevator.has_more_than_optimum_calls() and self.is_there_idle()) \
+            or not current_best_elevator.floor_fits_path(source_floor):
+                
+                if prioritised_hall_call.get_priority_array_length() > 1 :
+                    prioritised_hall_call.remove_frontmost_array_pair()
+                    self.unassigned_hall_calls.append(prioritised_hall_call)
+                    continue
+                else:
+                    self.calls_backlog.append(prioritised_hall_call)
+                    if self.backlog_time_start is None:
+                        self.backlog_time_start = self.env.now
+                    continue
+            else:
+                self.assign_one_call(prioritised_hall_call, current_best_elevator)
+            
+        if len(self.unassigned_hall_calls) == 1:
+            last_hall_call = self.unassigned_hall_calls.pop(0)
+            self.unassigned_hall_calls = [] #reset list
+            priority_array = last_hall_call.get_priority_array()
+            if len(priority_array) > 0:
+                best_elevator_index = last_hall_call.get_current_best_elevator()
+                best_elevator = self.elevators[best_elevator_index-1]
+                source_floor = last_hall_call.get_source_floor()
+                while (self.is_there_idle() and best_elevator.has_more_than_optimum_calls()) \
+                or not best_elevator.floor_fits_path(source_floor):
+                    if last_hall_call.get_priority_array_length() > 1:
+                        last_hall_call.remove_frontmost_array_pair()
+                        best_elevator_index = last_hall_call.get_current_best_elevator()
+                        best_elevator = self.elevators[best_elevator_index-1]
+                    else:
+                        self.calls_backlog.append(last_hall_call)
+                        if self.backlog_time_start is None:
+                            self.backlog_time_start = self.env.now 
+                        break
+                if best_elevator.floor_fits_path(source_floor):
+                    self.assign_one_call(last_hall_call, best_elevator)
+            else:
+                new_array = self.create_call_priority_array(last_hall_call)
+                last_hall_call.set_priority_array(new_array)
+                self.unassigned_hall_calls.append(last_hall_call)
+
+
+def make_burst(num_calls, seed, hall_call_class):
+    """
+    Builds a ModernEGCS system with busy elevators and a burst of hall calls with random priority arrays.
+
+    Args:
+        num_calls (int): Number of hall calls in the burst.
+        seed (int): Seed of the burst, equal seeds give identical systems.
+        hall_call_class (type): HallCall or LegacyHallCall.
+    Returns:
+        ModernEGCS: The elevator system with num_calls unassigned hall calls.
+    """
+    rd = random.Random(seed)
+    env = simpy.Environment()
+    building = Building(env, NUM_ELEVATORS, 0, NUM_FLOORS, PersonList(env, 0))
+    building.initialise("ModernEGCS")
+    egcs = building.get_elevator_system()
+    for elevator in egcs.get_elevators():
+        elevator.curr_floor = rd.randint(1, NUM_FLOORS)
+        if rd.random() < 0.5:
+            elevator.direction = rd.choice(["UP", "DOWN"])
+            elevator.set_busy()
+            elevator.add_path(elevator.curr_floor)
+    for _ in range(num_calls):
+        hall_call = hall_call_class(env, rd.randint(2, NUM_FLOORS - 1), rd.choice([1, -1]))
+        order = rd.sample(range(1, NUM_ELEVATORS + 1), NUM_ELEVATORS)
+        # small integer costs so that ties between hall calls are frequent
+        priority_array = [(index, rd.randint(0, 20)) for index in order[:-1]] + [(order[-1], -1)]
+        hall_call.set_priority_array(priority_array)
+        egcs.unassigned_hall_calls.append(hall_call)
+    return egcs
+
+
+def outcome(egcs) -> list:
+    """Returns the hall calls and paths of every elevator and the backlog, to compare implementations."""
+    return [(elevator.hall_calls, elevator.path, elevator.direction) for elevator in egcs.get_elevators()] + \
+        [[(hall_call.get_source_floor(), hall_call.get_direction()) for hall_call in egcs.calls_backlog]]
+
+
+def run(assign, num_calls, hall_call_class, repeats=3):
+    """Returns the best time of assign() over the given number of repeats, and the outcome of the last one."""
+    best = float('inf')
+    for repeat in range(repeats):
+        egcs = make_burst(num_calls, repeat, hall_call_class)
+        start = time.perf_counter()
+        assign(egcs)
+        best = min(best, time.perf_counter() - start)
+    return best, outcome(egcs)
+
+
+if __name__ == '__main__':
+    print(f"{'calls':>6} {'legacy (s)':>11} {'heap (s)':>9} {'speedup':>8}")
+    for num_calls in BURST_SIZES:
+        legacy_time, legacy_outcome = run(legacy_assign_calls, num_calls, LegacyHallCall)
+        heap_time, heap_outcome = run(lambda egcs: egcs.assign_calls(), num_calls, HallCall)
+        assert legacy_outcome == heap_outcome, "assignments differ"
+        print(f"{num_calls:>6} {legacy_time:>11.4f} {heap_time:>9.4f} {legacy_time / heap_time:>7.1f}x")
@@ -0,0 +1,101 @@
+"""
+Micro-benchmark of ModernEGCS priority arrays computed one hall call and one elevator at a time, against the
+batched CostMatrix, for a tall building with many cars and busy waiting queues.
+
+Both must produce identical priority arrays.
+
+Run from the back-end folder with: python -m src.test.python.benchmark.CostMatrixBenchmark
+"""
+import random
+import time
+import simpy
+from src.main.python.simulation.Building import Building
+from src.main.python.simulation.CostMatrix import CostMatrix
+from src.main.python.simulation.HallCall import HallCall
+from src.main.python.simulation.Person import Person
+from src.main.python.simulation.PersonList import PersonList
+from src.main.python.simulation.PersonStore import PersonStore
+
+NUM_FLOORS = 40
+NUM_ELEVATORS = 16
+NUM_WAITING = 600
+CALL_COUNTS = [8, 16, 32, 64]
+
+
+def make_system(seed):
+    """
+    Builds a ModernEGCS system with random elevator states and persons waiting on every floor.
+
+    Args:
+        seed (int): Seed of the system, equal seeds give identical systems.
+    Returns:
+        ModernEGCS: The elevator system.
+    """
+    rd = random.Random(seed)
+    env = simpy.Environment()
+    env.run(until=3600)
+    building = Building(env, NUM_ELEVATORS, 0, NUM_FLOORS, PersonList(env, 0))
+    building.initialise("ModernEGCS")
+    egcs = building.get_elevator_system()
+    for elevator in egcs.get_elevators():
+        elevator.curr_floor = rd.randint(1, NUM_FLOORS)
+        elevator.direction = rd.choice(["UP", "DOWN", "NIL"])
+        if elevator.direction != "NIL":
+            elevator.path = sorted(rd.sample(range(1, NUM_FLOORS + 1), rd.randint(1, 8)))
+            elevator.car_calls = sorted(rd.sample(range(1, NUM_FLOORS + 1), rd.randint(0, 6)))
+
+    trips = [rd.sample(range(1, NUM_FLOORS + 1), 2) for _ in range(NUM_WAITING)]
+    arrival_times = sorted(rd.uniform(3000, 3600) for _ in range(NUM_WAITING))
+    store = PersonStore(env, arrival_times, [trip[0] for trip in trips], [trip[1] for trip in trips])
+    for row in range(len(store)):
+        person = Person(store, row)
+        building.floors[person.get_curr_floor() - 1].add_person(person)
+    return egcs
+
+
+def make_hall_calls(egcs, num_calls, seed):
+    """Returns hall calls from random floors in directions that have waiting persons."""
+    rd = random.Random(seed)
+    hall_calls = []
+    while len(hall_calls) < num_calls:
+        floor = rd.randint(1, NUM_FLOORS)
+        direction = rd.choice([1, -1])
+        if len(egcs.floors[floor - 1].get_queue("UP" if direction == 1 else "DOWN")) > 0:
+            hall_calls.append(HallCall(egcs.env, floor, direction))
+    return hall_calls
+
+
+def best_time(function, repeats=5):
+    """Returns the best time of function() over the given number of repeats, and its last result."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def scalar(egcs, hall_calls):
+    """Priority arrays computed one hall call at a time, without the cost cache."""
+    egcs.cost_cache.clear()
+    return [egcs.create_call_priority_array(hall_call) for hall_call in hall_calls]
+
+
+def batched(egcs, hall_calls):
+    """Priority arrays computed with one CostMatrix."""
+    cost_matrix = CostMatrix(egcs.elevators, len(egcs.floors))
+    costs = cost_matrix.calculate(hall_calls, egcs.floors, egcs.env.now, egcs.w1, egcs.w2, egcs.w3)
+    return cost_matrix.priority_arrays(costs)
+
+
+if __name__ == '__main__':
+    print(f"{NUM_ELEVATORS} elevators, {NUM_FLOORS} floors, {NUM_WAITING} persons waiting")
+    print(f"{'calls':>6} {'scalar (ms)':>12} {'matrix (ms)':>12} {'speedup':>8}")
+    for seed, num_calls in enumerate(CALL_COUNTS):
+        egcs = make_system(seed)
+        hall_calls = make_hall_calls(egcs, num_calls, seed)
+        scalar_time, scalar_arrays = best_time(lambda: scalar(egcs, hall_calls))
+        matrix_time, matrix_arrays = best_time(lambda: batched(egcs, hall_calls))
+        assert scalar_arrays == matrix_arrays, "priority arrays differ"
+        print(f"{num_calls:>6} {scalar_time * 1000:>12.3f} {matrix_time * 1000:>12.3f} "
+              f"{scalar_time / matrix_time:>7.1f}x")
@@ -0,0 +1,37 @@
+import unittest
+import simpy
+from src.main.python.simulation.Building import Building
+from src.main.python.simulation.CostMatrix import CostMatrix
+from src.main.python.simulation.HallCall import HallCall
+from src.main.python.simulation.Person import Person
+from src.main.python.simulation.PersonList import PersonList
+from src.main.python.simulation.PersonStore import PersonStore
+
+
+class CostMatrixTest(unittest.TestCase):
+
+    def setUp(self):
+        self.env = simpy.Environment()
+        self.env.run(until=100)
+        building = Building(self.env, 4, 0, 10, PersonList(self.env, 0))
+        building.initialise("ModernEGCS")
+        self.egcs = building.get_elevator_system()
+        states = [(3, "UP", [4, 7], [7]), (8, "DOWN", [2, 5], [2, 5]), (5, "NIL", [], []), (1, "UP", [9], [6, 9])]
+        for elevator, (floor, direction, path, car_calls) in zip(self.egcs.get_elevators(), states):
+            elevator.curr_floor, elevator.direction, elevator.path, elevator.car_calls = \
+                floor, direction, path, car_calls
+        store = PersonStore(self.env, [10, 20, 30, 40], [5, 5, 6, 9], [8, 10, 1, 2])
+        for row in range(len(store)):
+            building.floors[store.source[row] - 1].add_person(Person(store, row))
+        self.hall_calls = [HallCall(self.env, 5, 1), HallCall(self.env, 6, -1), HallCall(self.env, 9, -1),
+                           HallCall(self.env, 2, 1)]
+
+    def test_matches_scalar_priority_arrays(self):
+        cost_matrix = CostMatrix(self.egcs.get_elevators(), len(self.egcs.floors))
+        costs = cost_matrix.calculate(self.hall_calls, self.egcs.floors, self.env.now, 1, 1, 1)
+        expected = [self.egcs.create_call_priority_array(hall_call) for hall_call in self.hall_calls]
+        self.assertEqual(cost_matrix.priority_arrays(costs), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
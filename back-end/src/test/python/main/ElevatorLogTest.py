@@ -0,0 +1,37 @@
+import unittest
+import simpy
+from src.main.python.simulation.Elevator import Elevator
+from src.main.python.simulation.ElevatorLog import ElevatorLog
+from src.main.python.simulation.Floor import GroundFloor, SandwichFloor, TopFloor
+
+
+class ElevatorLogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.env = simpy.Environment()
+        floors = [GroundFloor(self.env, 1), SandwichFloor(self.env, 2), TopFloor(self.env, 3)]
+        self.elevators = [Elevator(self.env, 1, floors, 1, 2, direction="UP"),
+                          Elevator(self.env, 1, floors, 1, 2, direction="DOWN")]
+        self.log = ElevatorLog(3)
+
+    def test_records_only_changes(self):
+        self.log.record(0, self.elevators)
+        self.log.record(1, self.elevators)
+        self.assertEqual(len(self.log), 2)
+        self.elevators[0].curr_floor = 2
+        self.log.record(2, self.elevators)
+        self.assertEqual(len(self.log), 3)
+        self.assertEqual(list(self.log.elevator), [1, 2, 1])
+
+    def test_expand_matches_elevator_to_dict(self):
+        self.log.record(0, self.elevators)
+        self.elevators[0].curr_floor = 3
+        self.log.record(2.5, self.elevators)
+        expanded = ElevatorLog.from_dict(self.log.to_dict()).expand(end_time=3)
+        self.assertEqual(list(expanded), [0, 1, 2, 3])
+        self.assertEqual(expanded[2][0][1]['floor'], {1: 1, 2: 0, 3: 0})
+        self.assertEqual(expanded[3], [{1: self.elevators[0].to_dict()}, {2: self.elevators[1].to_dict()}])
+
+
+if __name__ == '__main__':
+    unittest.main()
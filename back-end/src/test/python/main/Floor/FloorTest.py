@@ -1,9 +1,58 @@
 import unittest
+import simpy
+from src.main.python.simulation.CallRegistry import CallRegistry
+from src.main.python.simulation.Floor import SandwichFloor
+from src.main.python.simulation.Person import Person
+from src.main.python.simulation.PersonStore import PersonStore
 
 
 class FloorTest(unittest.TestCase):
-    # todo
-    pass
+
+    def setUp(self):
+        self.env = simpy.Environment()
+        store = PersonStore(self.env, [1, 2, 3, 4], [5, 5, 5, 5], [9, 9, 1, 9])
+        self.persons = [Person(store, row) for row in range(len(store))]
+        self.floor = SandwichFloor(self.env, 5)
+        for person in self.persons:
+            self.floor.add_person(person)
+
+    def test_remove_only_arrived_persons(self):
+        self.env.run(until=2)
+        self.floor.set_call_up()
+        self.assertEqual(self.floor.remove_all_persons_going_up(), self.persons[:2])
+        self.assertEqual(list(self.floor.get_all_persons_going_up()), [self.persons[3]])
+        self.assertEqual(list(self.floor.get_all_persons_going_down()), [self.persons[2]])
+
+    def test_returned_persons_keep_arrival_order(self):
+        self.env.run(until=2)
+        self.floor.set_call_up()
+        boarding = self.floor.remove_all_persons_going_up()
+        self.floor.return_persons(boarding[1:], "UP")
+        self.assertEqual(list(self.floor.get_all_persons_going_up()), [self.persons[1], self.persons[3]])
+
+    def test_queue_aggregates_follow_changes(self):
+        self.env.run(until=2)
+        self.floor.set_call_up()
+        queue = self.floor.get_queue("UP")
+        version = queue.version
+        self.floor.return_persons(self.floor.remove_all_persons_going_up()[1:], "UP")
+        self.assertGreater(queue.version, version)
+        expected = sum((10 - person.get_arrival_time()) ** 2 for person in queue)
+        self.assertAlmostEqual(queue.sum_squared_waiting_time(10), expected)
+        self.assertEqual(queue.destinations, {9: 2})
+
+    def test_call_flags_are_stored_in_registry(self):
+        calls = CallRegistry(6)
+        floors = [SandwichFloor(self.env, level, calls) for level in range(2, 6)]
+        floors[1].set_call_up()
+        floors[3].set_call_up()
+        floors[3].accept_up_call()
+        floors[2].set_call_down()
+        self.assertTrue(floors[1].has_call_up())
+        self.assertEqual(calls.get_unaccepted_up_floors(), [3])
+        self.assertEqual(calls.get_unaccepted_down_floors(), [4])
+        floors[2].uncall_down()
+        self.assertFalse(calls.has_unaccepted_down_calls())
 
 
 if __name__ == '__main__':
@@ -1,5 +1,7 @@
 import unittest
-from src.main.python.simulation.LiftRandoms import LiftRandoms, DayPhase
+import numpy as np
+from src.main.python.simulation.LiftRandoms import LiftRandoms, DayPhase, DayProfile, HourPhase, \
+    SourceDestinationSampler
 
 
 class LiftRandomsTest(unittest.TestCase):
@@ -8,11 +10,49 @@ class LiftRandomsTest(unittest.TestCase):
         self.assertEqual(type(LiftRandoms().generate_source_dest(99)), tuple)
         self.assertEqual(len(LiftRandoms().generate_source_dest(99)), 2)
 
+    def test_generate_source_dest_never_same_floor(self):
+        for time in range(0, 64800, 60):
+            source, destination = LiftRandoms().generate_source_dest(time)
+            self.assertNotEqual(source, destination)
+
+    def test_generate_source_dest_batch(self):
+        times = np.linspace(0, 64800, 1000)
+        sources, destinations = LiftRandoms().generate_source_dest_batch(times, np.random.default_rng(0))
+        self.assertEqual(len(sources), 1000)
+        self.assertFalse(np.any(sources == destinations))
+        self.assertTrue(np.all((sources >= 1) & (sources <= 9)))
+
     def test_generate_phase_returns_correct_phase(self):
         day_phases = {14399: DayPhase.MORNING, 35999: DayPhase.AFTERNOON, 36000: DayPhase.EVENING}
         for time, phase in day_phases.items():
             self.assertEqual(LiftRandoms.phase(time)[0], phase)
 
+    def test_injected_proportion_tables(self):
+        table = np.array([[2, 2, 0.5], [3, 7, 0.5]])
+        lift_randoms = LiftRandoms(sampler=SourceDestinationSampler([table] * 4))
+        self.assertEqual(lift_randoms.generate_source_dest(99), (3, 7))
+
+    def test_phase_accepts_arrays(self):
+        times = np.array([0, 650, 14399, 20700, 35999, 50000])
+        day_phases, hour_phases = LiftRandoms.phase(times)
+        for time, day_phase, hour_phase in zip(times, day_phases, hour_phases):
+            self.assertEqual(LiftRandoms.phase(time), (DayPhase(day_phase), HourPhase(hour_phase)))
+        rates = LiftRandoms().thinning_fn(times)
+        self.assertEqual(rates.tolist(), [LiftRandoms().thinning_fn(time) for time in times])
+
+    def test_custom_profile(self):
+        profile = DayProfile([0, 3600], [DayPhase.MORNING, DayPhase.EVENING],
+                             [HourPhase.PEAK, HourPhase.OFF_PEAK], rates=[0.5, 0.1])
+        lift_randoms = LiftRandoms(profile)
+        self.assertEqual(lift_randoms.thinning_fn(10), 0.5)
+        self.assertEqual(lift_randoms.thinning_fn(4000), 0.1)
+        self.assertEqual(LiftRandoms.phase(4000, profile), (DayPhase.EVENING, HourPhase.OFF_PEAK))
+        self.assertEqual(lift_randoms.proportion_table(10), 1)
+        self.assertEqual(lift_randoms.proportion_table(4000), 0)
+        times, sources, destinations = lift_randoms.generate_arrivals(7200, rng=np.random.default_rng(0))
+        self.assertTrue(np.all(np.diff(times) >= 0))
+        self.assertGreater(np.sum(times < 3600), np.sum(times >= 3600))
+
 
 if __name__ == '__main__':
     unittest.main()
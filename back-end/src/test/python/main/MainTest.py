@@ -0,0 +1,27 @@
+import json
+import os
+import tempfile
+import unittest
+import src.main.python.simulation.Logger as Logger
+from src.main.python.simulation.Main import Main
+
+
+class MainTest(unittest.TestCase):
+
+    def test_run_keeps_the_logging_of_the_process(self):
+        trace_path = os.path.join(tempfile.mkdtemp(), 'trace.jsonl')
+        Logger.configure('warning', trace_path)
+        self.addCleanup(Logger.configure)
+        # runs of other threads share the logger, so a run must neither close the trace nor reset the level
+        for seed in (1, 2):
+            Main(num_up=2, num_down=1, num_floors=9).run(1800, 'default', seed=seed, workers=2)
+            self.assertTrue(Logger.events.enabled)
+            self.assertEqual(Logger.level(), 'warning')
+        Logger.close()
+        with open(trace_path) as trace:
+            kinds = {json.loads(line)['kind'] for line in trace}
+        self.assertIn('board', kinds)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.main.python.simulation.OutputWriter import BufferWriter, ColumnarWriter, JsonWriter, pack_tables, \
+    read_columnar, unpack_tables
+
+COLUMNS = [('floor', 'i2'), ('time', 'f8')]
+ROWS = [(1, 0.5), (9, 10.25), (3, 64799.75)]
+
+
+class OutputWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'output')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_columnar_round_trip_across_chunks(self):
+        with ColumnarWriter(self.path, COLUMNS, chunk_size=2) as writer:
+            for row in ROWS:
+                writer.write(row)
+        columns = read_columnar(self.path)
+        self.assertEqual(columns['floor'].tolist(), [1, 9, 3])
+        self.assertEqual(columns['time'].tolist(), [0.5, 10.25, 64799.75])
+        self.assertEqual(columns['floor'].dtype.str, '<i2')
+
+    def test_json_is_an_array_of_objects(self):
+        with JsonWriter(self.path, COLUMNS) as writer:
+            for row in ROWS:
+                writer.write(row)
+        with open(self.path) as f:
+            self.assertEqual(json.load(f)[1], {'floor': 9, 'time': 10.25})
+
+    def test_buffer_drains_rows_written_since_last_drain(self):
+        writer = BufferWriter(COLUMNS)
+        writer.write(ROWS[0])
+        writer.write(ROWS[1])
+        self.assertEqual(writer.drain(), ROWS[:2])
+        writer.write(ROWS[2])
+        self.assertEqual(writer.drain(), ROWS[2:])
+        self.assertEqual(writer.drain(), [])
+
+    def test_packed_tables_are_aligned_typed_columns(self):
+        tables = {'a': {'floor': np.array([1, 9, 3], dtype='i2'), 'time': np.array([0.5, 10.25, 64799.75])},
+                  'b': {'direction': np.array([-1, 1], dtype='i1')}}
+        data = pack_tables(tables, {'num_floors': 9})
+        unpacked, meta = unpack_tables(data)
+        self.assertEqual(meta, {'num_floors': 9})
+        self.assertEqual(unpacked['a']['time'].tolist(), [0.5, 10.25, 64799.75])
+        self.assertEqual(unpacked['b']['direction'].tolist(), [-1, 1])
+        start = np.frombuffer(data, 'u1').ctypes.data
+        for columns in unpacked.values():
+            for values in columns.values():
+                self.assertEqual((values.ctypes.data - start) % 8, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
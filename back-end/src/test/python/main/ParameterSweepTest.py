@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+from src.main.python.simulation.ParameterSweep import ParameterSweep
+
+
+class ParameterSweepTest(unittest.TestCase):
+
+    def test_otis_ignores_weights(self):
+        sweep = ParameterSweep({'num_up': [1, 2], 'w1': [1, 2]})
+        algos = [config['lift_algo'] for config in sweep.configurations()]
+        self.assertEqual(algos.count('Otis'), 2)
+        self.assertEqual(algos.count('ModernEGCS'), 4)
+
+    def test_weights_of_any_numeric_type_give_the_same_key(self):
+        config = {'lift_algo': 'ModernEGCS', 'num_up': 2, 'num_down': 1, 'num_floors': 9, 'w1': 1, 'w2': 2, 'w3': 1}
+        self.assertEqual(ParameterSweep.key(config), ParameterSweep.key(dict(config, w1=1.0, w2=2.0, w3=1.0)))
+        keys = [ParameterSweep.key(config) for config in ParameterSweep({'w1': [1.0]}).configurations()]
+        self.assertEqual(keys, [ParameterSweep.key(config) for config in ParameterSweep({}).configurations()])
+
+    def test_num_floors_must_match_the_proportion_tables(self):
+        self.assertEqual(ParameterSweep({'num_floors': [9]}).grid['num_floors'], [9])
+        with self.assertRaises(ValueError):
+            ParameterSweep({'num_floors': [9, 12]})
+
+    def test_resumes_from_checkpoint(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'sweep.jsonl')
+            grid = {'lift_algo': ['ModernEGCS'], 'num_up': [1, 2]}
+            first = ParameterSweep(grid, duration=600, replications=2, checkpoint_path=path).run(workers=1)
+            rows = []
+            second = ParameterSweep(grid, duration=600, replications=3, checkpoint_path=path) \
+                .run(workers=1, callback=rows.append)
+            self.assertEqual(len(rows), 2)
+            self.assertEqual(len(second), 6)
+            self.assertTrue(second.head(4).equals(first))
+
+
+if __name__ == '__main__':
+    unittest.main()
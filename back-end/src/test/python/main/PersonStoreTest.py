@@ -0,0 +1,56 @@
+import pickle
+import unittest
+import simpy
+from src.main.python.simulation.Person import Person
+from src.main.python.simulation.PersonStore import PersonStore, TRIP_COLUMNS
+
+
+class PersonStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.env = simpy.Environment()
+        self.store = PersonStore(self.env, [10.0, 20.0, 30.0], [1, 5, 9], [9, 1, 2])
+        self.persons = [Person(self.store, row) for row in range(len(self.store))]
+
+    def test_person_views_write_to_store(self):
+        person = self.persons[1]
+        self.assertEqual((person.id, person.get_curr_floor(), person.get_dest_floor()), (2, 5, 1))
+        self.assertIsNone(person.get_elevator_arrival_time())
+        person.elevator_arrival_time = 25
+        person.complete_trip(60)
+        self.assertTrue(person.has_completed_trip())
+        self.assertEqual(person.get_wait_time(), 40.0)
+        self.assertEqual(self.store.completed_trips(),
+                         {'curr': [5], 'dest': [1], 'arrival_time': [20.0], 'end_time': [60.0], 'wait_time': [40.0]})
+
+    def test_completed_trip_arrays_have_trip_dtypes(self):
+        self.persons[2].complete_trip(45)
+        self.persons[0].complete_trip(40)
+        trips = pickle.loads(pickle.dumps(self.store.completed_trip_arrays()))
+        self.assertEqual([(name, values.dtype.str[1:]) for name, values in trips.items()], TRIP_COLUMNS)
+        self.assertEqual(trips['dest'].tolist(), [9, 2])
+        self.assertEqual(trips['wait_time'].tolist(), [30.0, 15.0])
+
+    def test_reset_clears_trips(self):
+        for person in self.persons:
+            person.complete_trip(100)
+        new_env = simpy.Environment()
+        self.store.reset(new_env)
+        self.assertEqual(self.store.completed().sum(), 0)
+        self.assertIs(self.persons[0].env, new_env)
+        self.assertIsNone(self.persons[0].get_end_time())
+
+    def test_next_pending_skips_completed_prefix(self):
+        self.assertEqual(self.store.next_pending(), 0)
+        self.persons[1].complete_trip(50)
+        self.assertEqual(self.store.next_pending(), 0)
+        self.persons[0].complete_trip(60)
+        self.assertEqual(self.store.next_pending(), 2)
+        self.persons[2].complete_trip(70)
+        self.assertIsNone(self.store.next_pending())
+        self.persons[1].reset(self.env)
+        self.assertEqual(self.store.next_pending(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
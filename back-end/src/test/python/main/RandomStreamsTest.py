@@ -0,0 +1,21 @@
+import unittest
+from src.main.python.simulation.RandomStreams import RandomStreams
+
+
+class RandomStreamsTest(unittest.TestCase):
+
+    def test_same_seed_draws_same_times(self):
+        first, second = RandomStreams(7, batch_size=16), RandomStreams(7, batch_size=16)
+        second.arrivals.random(100)  # other streams are not shifted by the arrivals drawn
+        dwell_times = [first.next_dwell_time() for _ in range(40)]
+        self.assertEqual(dwell_times, [second.next_dwell_time() for _ in range(40)])
+        self.assertEqual(set(dwell_times), {2, 3, 4, 5})
+        self.assertTrue({first.next_travel_time() for _ in range(40)} <= {3, 4})
+
+    def test_unseeded_streams_differ(self):
+        first, second = RandomStreams(), RandomStreams()
+        self.assertNotEqual(first.seed, second.seed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+from src.main.python.simulation.ReplicationRunner import ConfidenceInterval, ReplicationRunner, t_quantile
+
+
+class ReplicationRunnerTest(unittest.TestCase):
+
+    def test_t_quantile_matches_tables(self):
+        for df, expected in [(1, 12.7062), (2, 4.3027), (3, 3.1824), (10, 2.2281), (30, 2.0423)]:
+            self.assertAlmostEqual(t_quantile(0.975, df), expected, places=4)
+        self.assertAlmostEqual(t_quantile(0.05, 4), -2.1318, places=4)
+
+    def test_confidence_interval(self):
+        interval = ConfidenceInterval([1.0, 2.0, 3.0, 4.0], 0.95)
+        self.assertEqual(interval.mean, 2.5)
+        self.assertAlmostEqual(interval.half_width, 3.1824 * 1.2910 / 2, places=3)
+        self.assertTrue(interval.is_precise(1.0))
+        self.assertFalse(interval.is_precise(0.5))
+
+    def test_replications_are_reproducible_and_stop_early(self):
+        runner = ReplicationRunner(2, 1, 9, duration=900)
+        first = runner.run(base_seed=1, min_replications=2, max_replications=5, relative_precision=100, workers=1)
+        second = runner.run(base_seed=1, min_replications=2, max_replications=5, relative_precision=100, workers=1)
+        self.assertTrue(first['converged'])
+        self.assertEqual(first['replications'], 2)
+        self.assertEqual(first['summaries'], second['summaries'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import pathlib
+import stat
+import tempfile
+import unittest
+from unittest import mock
+from src.main.python.simulation.ResultCache import ResultCache, cache_key, code_version
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def test_key_depends_on_every_parameter(self):
+        key = cache_key(seed=1, num_up=2, weights=[1, 1, 1])
+        self.assertEqual(key, cache_key(weights=[1, 1, 1], num_up=2, seed=1))
+        self.assertNotEqual(key, cache_key(seed=2, num_up=2, weights=[1, 1, 1]))
+        self.assertNotEqual(key, cache_key(seed=1, num_up=2, weights=[1, 2, 1]))
+
+    def test_code_version_depends_on_code_and_data_files(self):
+        with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as data_folder:
+            (pathlib.Path(folder) / 'Building.py').write_text('floors = 9')
+            (pathlib.Path(data_folder) / 'prop1.csv').write_text('start,end')
+            version = code_version(folder, data_folder)
+            (pathlib.Path(data_folder) / '.cache').mkdir()
+            (pathlib.Path(data_folder) / '.cache' / 'prop1.npy').write_bytes(b'table')
+            self.assertEqual(code_version(folder, data_folder), version)
+            (pathlib.Path(data_folder) / 'prop1.csv').write_text('start,end,weight')
+            self.assertNotEqual(code_version(folder, data_folder), version)
+            data_version = code_version(folder, data_folder)
+            (pathlib.Path(folder) / 'Building.py').write_text('floors = 10')
+            self.assertNotEqual(code_version(folder, data_folder), data_version)
+
+    def test_memory_tier_evicts_least_recently_used(self):
+        cache = ResultCache(memory_size=10)
+        cache.put('a', b'aaaa')
+        cache.put('b', b'bbbb')
+        self.assertEqual(cache.get('a'), b'aaaa')
+        cache.put('c', b'cccc')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), b'cccc')
+        stats = cache.stats()
+        self.assertEqual((stats['memory_hits'], stats['misses'], stats['evictions']), (2, 1, 1))
+
+    def test_disk_tier_outlives_memory_and_evicts_by_size(self):
+        with tempfile.TemporaryDirectory() as folder:
+            cache = ResultCache(memory_size=4, folder=folder, disk_size=8)
+            cache.put('a', b'aaaa')
+            cache.put('b', b'bbbb')
+            self.assertEqual(cache.get('a'), b'aaaa')
+            cache.put('c', b'cccc')
+            reopened = ResultCache(memory_size=4, folder=folder, disk_size=8)
+            self.assertIsNone(reopened.get('b'))
+            self.assertEqual(reopened.get('a'), b'aaaa')
+            self.assertEqual(reopened.get('c'), b'cccc')
+            self.assertEqual(reopened.stats()['disk_hits'], 2)
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), 'file ownership is POSIX only')
+    def test_disk_tier_folder_is_private_to_its_owner(self):
+        with tempfile.TemporaryDirectory() as parent:
+            folder = os.path.join(parent, 'results')
+            ResultCache(folder=folder)
+            self.assertEqual(stat.S_IMODE(os.stat(folder).st_mode), 0o700)
+            with mock.patch('os.getuid', return_value=os.getuid() + 1):
+                with self.assertRaises(PermissionError):
+                    ResultCache(folder=folder)
+
+
+if __name__ == '__main__':
+    unittest.main()
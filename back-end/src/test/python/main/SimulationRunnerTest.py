@@ -0,0 +1,25 @@
+import unittest
+import numpy as np
+from src.main.python.simulation.ReplicationRunner import generate_population
+from src.main.python.simulation.SimulationRunner import run_simulation
+
+
+class SimulationRunnerTest(unittest.TestCase):
+
+    def test_tick_and_event_engines_agree(self):
+        duration = 3 * 3600
+        for seed in (1, 2):
+            population = generate_population(seed, duration)
+            for lift_algo in ('Otis', 'ModernEGCS'):
+                with self.subTest(seed=seed, lift_algo=lift_algo):
+                    tick, event = [np.asarray(run_simulation(lift_algo, population, 2, 1, 9, duration, engine,
+                                                             seed=seed).trips['wait_time'])
+                                   for engine in ('tick', 'event')]
+                    self.assertAlmostEqual(len(event), len(tick), delta=0.02 * len(tick))
+                    # the tick engine only reacts on whole seconds, so its waits are slightly longer
+                    self.assertAlmostEqual(event.mean(), tick.mean(), delta=0.1 * tick.mean())
+                    self.assertLess(event.max(), 1.5 * tick.max())
+
+
+if __name__ == '__main__':
+    unittest.main()
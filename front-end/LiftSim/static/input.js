@@ -84,38 +84,9 @@ submitBtn.addEventListener("click", (event) => {
     });
   }
 
-  // Convert the inputs received to a json.file
-  const inputJson = JSON.stringify(inputs);
-
-
-  // Send JSON to backend using fetch API
-  fetch('http://127.0.0.1:9001/manual', {
-    method: 'POST',
-    body: inputJson,
-    headers: {
-    'Content-Type': 'application/json',
-    'Access-Control-Allow-Origin': '*'
-    }
-  })
-      .then(response => response.json())
-      .then(data => {
-        console.log('Success:', data);
-        const manualData1 = data['Otis']['Elevators'];
-        const manualData2 = data['ModernEGCS']['Elevators'];
-        localStorage.removeItem("data1Person");
-        localStorage.removeItem("data2Person");
-        localStorage.setItem("data1Person",JSON.stringify(data['Otis']['Persons']));
-        localStorage.setItem("data2Person", JSON.stringify(data['ModernEGCS']['Persons']));
-        const manualKeys1 = Object.keys(manualData1).sort((a, b) => parseInt(a) - parseInt(b)); //sort the json we received
-        const manualKeys2 = Object.keys(manualData2).sort((a, b) => parseInt(a) - parseInt(b)); //sort the json we received
-        stopSimulationFlag = false;
-        pauseSimulationFlag = false;
-        updateFloors(1,manualKeys1,manualData1,refreshTime);
-        updateFloors(2,manualKeys2,manualData2,refreshTime);
-      })
-      .catch((error) => {
-        console.error('Error:', error);
-      });
+  // Send JSON to backend using fetch API. The same riders always give the same result, so it is cached by the
+  // back-end and shown at once when they are submitted again
+  runJob('http://127.0.0.1:9001', {"mode": "manual", "riders": inputs});
 });
 
 
@@ -123,29 +94,178 @@ submitBtn.addEventListener("click", (event) => {
 // Add event listener to start button
 const startBtn = document.getElementById("start-btn");
 startBtn.addEventListener("click", () => {
-    fetch('http://localhost:9001/random')
-    .then(response => response.json())
-    .then(data => {
-      // 处理从服务器获取的数据
-      console.log(data['Otis']['Persons']);
-      const data1 = data['Otis']['Elevators'];
-      const data2 = data['ModernEGCS']['Elevators'];
-      localStorage.setItem("1","2");
-      localStorage.removeItem("data1Person");
-      localStorage.removeItem("data2Person");
-      localStorage.setItem("data1Person",JSON.stringify(data['Otis']['Persons']));
-      localStorage.setItem("data2Person", JSON.stringify(data['ModernEGCS']['Persons']));
-      const keys1 = Object.keys(data1).sort((a, b) => parseInt(a) - parseInt(b)); //sort the json we received
-      const keys2 = Object.keys(data2).sort((a, b) => parseInt(a) - parseInt(b)); //sort the json we received
-      stopSimulationFlag = false;
-      pauseSimulationFlag = false;
-      updateFloors(1,keys1,data1);
-      updateFloors(2,keys2,data2);
+  streamSimulation('http://localhost:9001/stream');
+});
+
+// Models of the page showing each algorithm
+const streamedModels = {"Otis": 1, "ModernEGCS": 2};
+
+// Reads a newline-delimited JSON response and calls onLine with every line as soon as it is received
+async function readNdjson(response, onLine) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) {
+      break;
+    }
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split("\n");
+    buffer = lines.pop(); // the last line may be incomplete
+    lines.filter(line => line.trim() !== "").forEach(line => onLine(JSON.parse(line)));
+  }
+  if (buffer.trim() !== "") {
+    onLine(JSON.parse(buffer));
+  }
+}
+
+// Appends the per-second snapshots of the change-only elevator entries of a chunk to a timeline, in the format of
+// ElevatorLog.expand() on the back-end. Snapshots are added up to the end of the chunk, excluded.
+function expandEntries(timeline, columns, endTime, numFloors, numElevators) {
+  function addSnapshots(until) {
+    while (timeline.next < until) {
+      if (Object.keys(timeline.states).length === numElevators) {
+        const snapshot = [];
+        for (let lift = 1; lift <= numElevators; lift++) {
+          snapshot.push({[lift]: timeline.states[lift]});
+        }
+        timeline.data[timeline.next] = snapshot;
+        timeline.keys.push(String(timeline.next));
+      }
+      timeline.next++;
+    }
+  }
+  for (let entry = 0; entry < columns.time.length; entry++) {
+    if (timeline.next === null) {
+      timeline.next = Math.floor(columns.time[entry]);
+    }
+    addSnapshots(columns.time[entry]);
+    const floor = {};
+    for (let i = 1; i <= numFloors; i++) {
+      floor[i] = 0;
+    }
+    floor[columns.floor[entry]] = 1;
+    timeline.states[columns.elevator[entry]] = {
+      "elevator_type": columns.direction[entry],
+      "floor": floor,
+      "num_passengers": columns.passengers[entry]
+    };
+  }
+  if (timeline.next !== null) {
+    addSnapshots(endTime);
+  }
+}
+
+// Fetches a finished result from /jobs/<id>/result as packed tables, see decodeTables() in tables.js, and returns
+// the timeline and persons of every algorithm in the format used by updateFloors() and the summary page
+function fetchTables(url) {
+  return fetch(url, {headers: {'Accept': 'application/vnd.liftsim.tables'}})
+    .then(response => {
+      if (!response.ok) {
+        throw new Error(`The result could not be fetched, status ${response.status}`);
+      }
+      return response.arrayBuffer();
     })
+    .then(buffer => {
+      const {meta, tables} = decodeTables(buffer);
+      const simulation = {};
+      meta.lift_algos.forEach(algo => {
+        const elevators = tables[algo + '/elevators'];
+        const timeline = {keys: [], data: {}, states: {}, next: null};
+        const lastTime = elevators.time.length > 0 ? elevators.time[elevators.time.length - 1] : 0;
+        expandEntries(timeline, elevators, Math.floor(lastTime) + 1, meta.num_floors, meta.num_elevators);
+        simulation[algo] = {keys: timeline.keys, data: timeline.data, persons: tableRows(tables[algo + '/persons'])};
+      });
+      return simulation;
+    });
+}
+
+// Animates every algorithm of a finished simulation and stores the persons for the summary page
+function playSimulation(simulation) {
+  stopSimulationFlag = false;
+  pauseSimulationFlag = false;
+  Object.entries(simulation).forEach(([algo, result]) => {
+    const model = streamedModels[algo];
+    streaming[model] = false;
+    updateFloors(model, result.keys, result.data, refreshTime);
+  });
+  localStorage.setItem("data1Person", JSON.stringify(simulation['Otis'].persons));
+  localStorage.setItem("data2Person", JSON.stringify(simulation['ModernEGCS'].persons));
+}
+
+// Submits a simulation to the /jobs route of the back-end at baseUrl, polls it until it is done, unless its result
+// was cached, then shows its result
+function runJob(baseUrl, body) {
+  function poll(job) {
+    if (job.status === "done") {
+      return fetchTables(`${baseUrl}/jobs/${job.id}/result`).then(playSimulation);
+    }
+    if (job.status === "failed") {
+      throw new Error(job.error);
+    }
+    return new Promise(resolve => setTimeout(resolve, 1000))
+      .then(() => fetch(`${baseUrl}/jobs/${job.id}`))
+      .then(response => response.json())
+      .then(poll);
+  }
+  return fetch(`${baseUrl}/jobs`, {
+    method: 'POST',
+    body: JSON.stringify(body),
+    headers: {'Content-Type': 'application/json'}
+  })
+    .then(response => response.json().then(job => {
+      if (!response.ok) {
+        throw new Error(job.error);
+      }
+      return poll(job);
+    }))
     .catch((error) => {
       console.error('Error:', error);
     });
-});
+}
+
+// Requests a simulation from the /stream route and animates every algorithm as soon as its first chunks arrive,
+// the persons are stored for the summary page once the simulation is over
+function streamSimulation(url, options) {
+  const timelines = {};
+  const persons = {};
+  let building = null;
+  stopSimulationFlag = false;
+  pauseSimulationFlag = false;
+  return fetch(url, options)
+    .then(response => readNdjson(response, line => {
+      if (line.type === "start") {
+        building = line;
+        line.lift_algos.forEach(algo => {
+          const model = streamedModels[algo];
+          timelines[algo] = {keys: [], data: {}, states: {}, next: null};
+          persons[algo] = [];
+          streaming[model] = true;
+          updateFloors(model, timelines[algo].keys, timelines[algo].data, refreshTime);
+        });
+      } else if (line.type === "chunk") {
+        expandEntries(timelines[line.lift_algo], line.elevators, line.time, building.num_floors,
+                      building.num_elevators);
+        persons[line.lift_algo].push(...line.persons);
+      } else if (line.type === "end") {
+        console.log('Success:', line.summary);
+        localStorage.removeItem("data1Person");
+        localStorage.removeItem("data2Person");
+        localStorage.setItem("data1Person", JSON.stringify(persons['Otis']));
+        localStorage.setItem("data2Person", JSON.stringify(persons['ModernEGCS']));
+      } else if (line.type === "error") {
+        console.error('Error:', line.error);
+      }
+    }))
+    .catch((error) => {
+      console.error('Error:', error);
+    })
+    .finally(() => {
+      streaming[1] = false;
+      streaming[2] = false;
+    });
+}
 
 
 // Add event listener to end button
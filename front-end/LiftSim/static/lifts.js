@@ -5,6 +5,7 @@
 
 let stopSimulationFlag = false;
 let pauseSimulationFlag = false;
+let streaming = {1: false, 2: false}; // true while the timeline of a model is still being received
 
 //use closure to solve the issue of setTimeout function => use setInterval to solve the problem caused by setTimeout
 function updateFloors(model,key,data,time) {
@@ -20,6 +21,12 @@ function updateFloors(model,key,data,time) {
       return;
     }
     const value = data[key[i]];
+    if (value === undefined) { // wait for the next streamed chunk, or stop once everything was shown
+      if (!streaming[model]) {
+        clearInterval(interval);
+      }
+      return;
+    }
     const lift1info = value[0]["1"];
     const lift2info = value[1]["2"];
     const lift3info = value[2]["3"];
@@ -41,7 +48,7 @@ function updateFloors(model,key,data,time) {
     time = refreshTime;
     clearInterval(interval);
     interval = setInterval(fn, time);
-    if (i >= key.length) {
+    if (i >= key.length && !streaming[model]) {
       clearInterval(interval);
     }
     console.log(time);
@@ -0,0 +1,49 @@
+// Decoder of the application/vnd.liftsim.tables representation of a result, see OutputWriter.pack_tables() on the
+// back-end: the magic bytes LIFTTAB1, the little-endian uint32 length of a JSON header, then the columns of every
+// table, each one aligned to 8 bytes.
+
+// Typed arrays of the little-endian dtypes of OutputWriter.pack_tables()
+const TABLE_ARRAYS = {
+  "|i1": Int8Array, "|u1": Uint8Array, "<i2": Int16Array, "<u2": Uint16Array, "<i4": Int32Array,
+  "<u4": Uint32Array, "<f4": Float32Array, "<f8": Float64Array
+};
+
+// Decodes an ArrayBuffer of packed tables, every column is a typed array viewing the buffer without copying it
+function decodeTables(buffer) {
+  const view = new DataView(buffer);
+  const magic = new TextDecoder().decode(new Uint8Array(buffer, 0, 8));
+  if (magic !== "LIFTTAB1") {
+    throw new Error("Not a packed tables buffer");
+  }
+  const headerLength = view.getUint32(8, true);
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 12, headerLength)));
+  const start = 12 + headerLength;
+  const tables = {};
+  Object.entries(header.tables).forEach(([name, table]) => {
+    if (!(table.columns.every(([column, dtype]) => dtype in TABLE_ARRAYS))) {
+      throw new Error(`Unsupported column type in table ${name}`);
+    }
+    tables[name] = {};
+    table.columns.forEach(([column, dtype, offset]) => {
+      tables[name][column] = new TABLE_ARRAYS[dtype](buffer, start + offset, table.rows);
+    });
+  });
+  return {meta: header.meta, tables: tables};
+}
+
+// Returns the rows of a decoded table as objects of numbers, e.g. the persons in the format of the summary page
+function tableRows(table) {
+  const columns = Object.keys(table);
+  const numRows = columns.length > 0 ? table[columns[0]].length : 0;
+  const rows = [];
+  for (let i = 0; i < numRows; i++) {
+    const row = {};
+    columns.forEach(column => { row[column] = table[column][i]; });
+    rows.push(row);
+  }
+  return rows;
+}
+
+if (typeof module !== "undefined") {
+  module.exports = {decodeTables, tableRows};
+}